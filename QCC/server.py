@@ -5,13 +5,15 @@ Provides HTTP API endpoints for interacting with the QCC assembler.
 """
 
 import os
+import json
+import uuid
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 
 import uvicorn
 from fastapi import FastAPI, Request, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -41,12 +43,59 @@ app.add_middleware(
 # Store global components accessible to API routes
 components: Dict[str, Any] = {}
 
+# Seconds a finished assembly job keeps its event history for late subscribers
+JOB_RETENTION_SECONDS = 300
+
+class AssemblyJob:
+    """
+    A solution being assembled in the background.
+    
+    Progress events are kept so that clients subscribing late see the full
+    history, and are pushed to every live subscriber as they happen.
+    """
+    
+    TERMINAL_EVENTS = ("solution_ready", "solution_failed")
+    
+    def __init__(self, solution_id: str):
+        self.solution_id = solution_id
+        self.status = "assembling"
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self.subscribers: List[asyncio.Queue] = []
+        self.task: Optional[asyncio.Task] = None
+    
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Record an event and deliver it to live subscribers."""
+        event = {"solution_id": self.solution_id, **event}
+        self.events.append(event)
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+    
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield past and future events until the job finishes."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        self.subscribers.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["event"] in self.TERMINAL_EVENTS:
+                    return
+        finally:
+            self.subscribers.remove(queue)
+
+# Background assembly jobs by solution ID
+assembly_jobs: Dict[str, AssemblyJob] = {}
+
 # Define request and response models
 class IntentRequest(BaseModel):
     user_request: str
     context: Dict[str, Any] = Field(default_factory=dict)
     timeout_ms: Optional[int] = 30000
     priority: Optional[int] = 5
+    async_mode: bool = False
 
 class IntentResponse(BaseModel):
     solution_id: str
@@ -54,6 +103,9 @@ class IntentResponse(BaseModel):
     estimated_completion_ms: int
     capabilities: list
 
+class BatchIntentRequest(BaseModel):
+    requests: List[IntentRequest]
+
 # API routes
 @app.get("/")
 async def root():
@@ -70,9 +122,23 @@ async def create_intent(
     background_tasks: BackgroundTasks,
     user_id: str = Depends(get_user_id)
 ):
-    """Submit a user intent to the QCC assembler."""
+    """
+    Submit a user intent to the QCC assembler.
+    
+    With ``async_mode`` the solution ID is returned at once and assembly
+    progress is streamed from ``/api/v1/solutions/{solution_id}/events``.
+    """
     assembler: CellAssembler = components["assembler"]
     
+    if request.async_mode:
+        job = start_assembly_job(assembler, request)
+        return {
+            "solution_id": job.solution_id,
+            "status": job.status,
+            "estimated_completion_ms": assembler.estimate_assembly_time_ms(),
+            "capabilities": []
+        }
+    
     try:
         # Create a solution
         solution = await assembler.assemble_solution(
@@ -84,29 +150,133 @@ async def create_intent(
         return {
             "solution_id": solution.id,
             "status": solution.status,
-            "estimated_completion_ms": 5000,  # Example value
+            "estimated_completion_ms": 0,
             "capabilities": [cell.capability for cell in solution.cells.values()]
         }
     except Exception as e:
         logger.error(f"Error creating solution: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def start_assembly_job(assembler: CellAssembler, request: IntentRequest) -> AssemblyJob:
+    """Start assembling a solution in the background and track its progress."""
+    job = AssemblyJob(str(uuid.uuid4()))
+    assembly_jobs[job.solution_id] = job
+    
+    async def run():
+        try:
+            await assembler.assemble_solution(
+                user_request=request.user_request,
+                context=request.context,
+                progress=job.publish,
+                solution_id=job.solution_id
+            )
+            job.status = "active"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            job.publish({"event": "solution_failed", "error": "Assembly cancelled"})
+            raise
+        except Exception as e:
+            logger.error(f"Error creating solution {job.solution_id}: {e}")
+            job.status = "failed"
+            job.error = str(e)
+            job.publish({"event": "solution_failed", "error": job.error})
+        finally:
+            asyncio.get_event_loop().call_later(
+                JOB_RETENTION_SECONDS,
+                assembly_jobs.pop,
+                job.solution_id,
+                None
+            )
+    
+    job.task = asyncio.ensure_future(run())
+    return job
+
+@app.post("/api/v1/intents/batch")
+async def create_intents_batch(
+    request: BatchIntentRequest,
+    user_id: str = Depends(get_user_id)
+):
+    """
+    Submit several user intents at once.
+    
+    Results are streamed back as newline-delimited JSON, one line per
+    solution in completion order, each tagged with the index of its request.
+    """
+    assembler: CellAssembler = components["assembler"]
+    
+    async def stream_results():
+        async for result in assembler.assemble_solutions_batch([
+            {"user_request": item.user_request, "context": item.context}
+            for item in request.requests
+        ]):
+            if result["status"] == "success":
+                solution = result["solution"]
+                line = {
+                    "index": result["index"],
+                    "solution_id": solution.id,
+                    "status": solution.status,
+                    "capabilities": [cell.capability for cell in solution.cells.values()]
+                }
+            else:
+                line = {
+                    "index": result["index"],
+                    "status": "error",
+                    "error": result["error"]
+                }
+            yield json.dumps(line) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.get("/api/v1/solutions/{solution_id}")
 async def get_solution(solution_id: str, user_id: str = Depends(get_user_id)):
     """Get details about a specific solution."""
     assembler: CellAssembler = components["assembler"]
     
     if solution_id not in assembler.active_solutions:
-        raise HTTPException(status_code=404, detail="Solution not found")
+        # Solutions still being planned or that failed only exist as jobs
+        job = assembly_jobs.get(solution_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Solution not found")
+        return {"id": solution_id, "status": job.status, "error": job.error}
     
     solution = assembler.active_solutions[solution_id]
     return solution.to_dict()
 
+@app.get("/api/v1/solutions/{solution_id}/events")
+async def stream_solution_events(solution_id: str, user_id: str = Depends(get_user_id)):
+    """
+    Stream assembly progress for a solution as server-sent events.
+    
+    Events already emitted are replayed first; the stream ends with a
+    ``solution_ready`` or ``solution_failed`` event.
+    """
+    job = assembly_jobs.get(solution_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No assembly job for solution")
+    
+    async def stream_events():
+        async for event in job.subscribe():
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 @app.delete("/api/v1/solutions/{solution_id}")
 async def release_solution(solution_id: str, user_id: str = Depends(get_user_id)):
     """Release a solution and its resources."""
     assembler: CellAssembler = components["assembler"]
     
+    job = assembly_jobs.pop(solution_id, None)
+    if job is not None and job.task is not None and not job.task.done():
+        # Stop an assembly that is still in progress; it releases its own cells
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+        if solution_id not in assembler.active_solutions:
+            return {"status": "success", "message": "Solution assembly cancelled"}
+    
     try:
         result = await assembler.release_solution(solution_id)
         if result:
@@ -149,6 +319,18 @@ async def execute_capability(
         logger.error(f"Error executing capability: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/intent/patterns/reload")
+async def reload_intent_patterns(user_id: str = Depends(get_user_id)):
+    """Reload the intent pattern tables and swap in the new snapshot."""
+    assembler: CellAssembler = components["assembler"]
+    
+    try:
+        snapshot = await assembler.intent_interpreter.registry.reload_async()
+        return snapshot.to_dict()
+    except Exception as e:
+        logger.error(f"Error reloading intent patterns: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/v1/status")
 async def get_status():
     """Get the current status of the QCC system."""
@@ -179,6 +361,11 @@ async def start_server(system_components: Dict[str, Any]):
     
     logger.info(f"Starting QCC API server on {host}:{port}")
     
+    # Pick up edits to intent pattern files without a restart
+    watch_seconds = config.get("assembler", {}).get("intent_pattern_watch_seconds")
+    if watch_seconds:
+        components["assembler"].intent_interpreter.registry.start_watching(watch_seconds)
+    
     # Run the server
     config = uvicorn.Config(
         app="server:app",
@@ -8,12 +8,20 @@ responsible for orchestrating the assembly of cells into solutions.
 from .assembler import CellAssembler
 from .solution import Solution
 from .cell_configuration import CellConfiguration
+from .provider_scoreboard import ProviderScoreboard
+from .cell_pool import WarmCellPool
+from .speculation import CapabilityPatternTracker
+from .template_cache import SolutionTemplateCache
 from .exceptions import AssemblerError, InvalidIntentError
 
 __all__ = [
     'CellAssembler',
     'Solution',
     'CellConfiguration',
+    'ProviderScoreboard',
+    'WarmCellPool',
+    'CapabilityPatternTracker',
+    'SolutionTemplateCache',
     'AssemblerError',
     'InvalidIntentError'
 ]
@@ -6,22 +6,33 @@ permanent component in the QCC architecture responsible for interpreting
 user intent and orchestrating cells into cohesive solutions.
 """
 
+import copy
 import uuid
 import asyncio
 import logging
 import time
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple, Awaitable, Callable, Hashable, AsyncIterator
+from collections import deque
 from datetime import datetime
 
-from qcc.assembler.intent import IntentInterpreter
+from qcc.assembler.intent import IntentInterpreter, PatternRegistry
 from qcc.assembler.security import SecurityManager
 from qcc.assembler.runtime import CellRuntime
 from qcc.quantum_trail import QuantumTrailManager
-from qcc.common.exceptions import CellRequestError, SecurityVerificationError
+from qcc.common.exceptions import AssemblerError, CellRequestError, SecurityVerificationError
 from qcc.common.models import Solution, Cell, CellConfiguration
+from qcc.common.telemetry import telemetry
+
+from .cell_pool import WarmCellPool
+from .provider_scoreboard import ProviderScoreboard
+from .speculation import CapabilityPatternTracker
+from .template_cache import SolutionTemplateCache
 
 logger = logging.getLogger(__name__)
 
+# Receives assembly progress events as dictionaries with an ``event`` name
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
 class CellAssembler:
     """
     The primary orchestrator for the QCC system.
@@ -42,43 +53,154 @@ class CellAssembler:
         security_manager (SecurityManager): Component for security verification
         cell_runtime (CellRuntime): Component for cell execution
         quantum_trail (QuantumTrailManager): Component for quantum trail management
-        cell_cache (Dict[str, Dict]): Cache of frequently used cells
+        cell_cache (WarmCellPool): Warm cells kept from released solutions
+        assembly_timeout_ms (int): Deadline for acquiring all cells of a solution
+        max_requests_per_provider (int): Concurrent request cap for each provider
+        provider_scoreboard (ProviderScoreboard): Observed provider latency and errors
+        capability_patterns (CapabilityPatternTracker): Co-occurring capability sets
+            used for speculative assembly
+        solution_templates (SolutionTemplateCache): Resolved plans of repeated requests
     """
     
-    def __init__(self, user_id: str = "anonymous", provider_urls: List[str] = None):
+    def __init__(
+        self,
+        user_id: str = "anonymous",
+        provider_urls: List[str] = None,
+        config: Dict[str, Any] = None
+    ):
         """
         Initialize the Cell Assembler.
         
         Args:
             user_id: Anonymous identifier for the user
             provider_urls: List of cell provider endpoints
+            config: Optional assembler configuration (the ``assembler`` section
+                of the main configuration file)
         """
         self.assembler_id = str(uuid.uuid4())
         self.user_id = user_id
         self.provider_urls = provider_urls or ["https://default-provider.cellcomputing.ai"]
+        self.config = config or {}
         self.active_solutions = {}
-        self.cell_cache = {}
+        
+        # Serializes reconfiguration and release of each solution
+        self._solution_locks: Dict[str, asyncio.Lock] = {}
+        
+        # Warm pool of cells kept from released solutions
+        self.cell_cache = WarmCellPool(
+            max_memory_mb=self.config.get("max_cell_cache_size_mb", 512),
+            max_cells=self.config.get("max_cached_cells", 100),
+            max_cells_per_bucket=self.config.get("max_cached_cells_per_capability", 4),
+            eviction_policy=self.config.get("cell_cache_eviction_policy", "lru")
+        )
+        self.cache_release_batch_size = self.config.get("cache_release_batch_size", 8)
+        self._pending_releases = []
+        self._release_task = None
+        
+        # Speculative acquisition of cells while intent analysis runs
+        self.capability_patterns = CapabilityPatternTracker()
+        self.speculative_assembly = self.config.get("speculative_assembly", False)
+        self.speculation_top_k = self.config.get("speculation_top_k", 2)
+        self.speculation_max_cells = self.config.get("speculation_max_cells", 6)
+        
+        # Batch assembly
+        self.max_batch_concurrency = self.config.get("max_batch_concurrency", 8)
+        
+        # Resolved plans keyed by normalized request and context fingerprint
+        self.solution_templates = SolutionTemplateCache(
+            max_size=self.config.get("max_solution_templates", 500),
+            ttl_seconds=self.config.get("solution_template_ttl_seconds", 300)
+        )
+        
+        # Cell acquisition settings
+        self.assembly_timeout_ms = self.config.get("default_request_timeout_ms", 30000)
+        self.max_requests_per_provider = self.config.get("max_requests_per_provider", 4)
+        self.provider_semaphores = {}
+        
+        # Latency-aware provider selection and request hedging
+        self.provider_scoreboard = ProviderScoreboard()
+        self.hedge_requests = self.config.get("hedge_requests", True)
+        self.default_hedge_delay_ms = self.config.get("default_hedge_delay_ms", 1000)
         
         # Initialize core components
-        self.intent_interpreter = IntentInterpreter()
+        self.intent_interpreter = IntentInterpreter(
+            cache_size=self.config.get("intent_cache_size", 1024),
+            registry=PatternRegistry(self.config.get("intent_pattern_source"))
+        )
         self.security_manager = SecurityManager()
         self.cell_runtime = CellRuntime()
         self.quantum_trail = QuantumTrailManager()
         
+        # Per-phase latency histograms are always on; span tracing is opt-in
+        self.telemetry = telemetry
+        self.telemetry.configure(
+            tracing_enabled=self.config.get("tracing_enabled"),
+            max_spans=self.config.get("max_trace_spans")
+        )
+        
         # Track system metrics
         self.start_time = datetime.now()
         self.total_assemblies = 0
         self.total_cells_requested = 0
+        self.average_assembly_time_ms = None
         
         logger.info(f"Cell Assembler initialized with ID {self.assembler_id}")
     
-    async def assemble_solution(self, user_request: str, context: Dict[str, Any] = None) -> Solution:
+    async def initialize(self) -> None:
+        """
+        Seed speculative assembly from the quantum trail.
+        
+        Configurations the trail remembers for the capabilities the intent
+        patterns can produce become the initial capability patterns, so
+        speculation can predict cells from the first assembly on.
+        """
+        if not self.speculative_assembly:
+            return
+        
+        capabilities = sorted({
+            capability_info["name"]
+            for capability_infos in self.intent_interpreter.capability_mapping.values()
+            for capability_info in capability_infos
+        })
+        if not capabilities:
+            return
+        
+        try:
+            configurations = await self.quantum_trail.find_similar_configurations(
+                capabilities=capabilities,
+                context_similarity={},
+                max_results=self.config.get("speculation_seed_configurations", 50)
+            )
+        except Exception as e:
+            logger.warning(f"Could not seed capability patterns from the quantum trail: {e}")
+            return
+        
+        self.capability_patterns.load_configurations(configurations or [])
+        logger.debug(f"Seeded capability patterns from {len(configurations or [])} trail configurations")
+    
+    async def assemble_solution(
+        self,
+        user_request: str,
+        context: Dict[str, Any] = None,
+        progress: Optional[ProgressCallback] = None,
+        solution_id: Optional[str] = None
+    ) -> Solution:
         """
         Interpret user intent and assemble cells into a solution.
         
+        The solution is registered in ``active_solutions`` with status
+        "assembling" once its cells are verified, so cells can be used as
+        soon as they are active; its status becomes "active" when every
+        cell is connected and active.
+        
         Args:
             user_request: Natural language description of user need
             context: Additional context information (device, environment, etc.)
+            progress: Called with an event dictionary after each assembly step
+                ("intent_analyzed", "cell_acquired", "cells_verified",
+                "cell_connected", "cell_activated", "solution_ready")
+            solution_id: ID to give the solution, for callers that hand it
+                out before assembly finishes
             
         Returns:
             Solution object representing the assembled cells
@@ -87,6 +209,96 @@ class CellAssembler:
             CellRequestError: If required cells cannot be obtained
             SecurityVerificationError: If cell verification fails
         """
+        with self.telemetry.span("assembler.assemble_solution", user_id=self.user_id):
+            return await self._assemble_solution(
+                user_request,
+                context,
+                progress=progress,
+                solution_id=solution_id
+            )
+    
+    def estimate_assembly_time_ms(self) -> int:
+        """
+        Estimate how long the next assembly will take.
+        
+        Returns:
+            Smoothed duration of recent assemblies, or the acquisition
+            deadline before any assembly has completed
+        """
+        if self.average_assembly_time_ms is None:
+            return self.assembly_timeout_ms
+        return int(self.average_assembly_time_ms)
+    
+    async def assemble_solutions_batch(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Assemble solutions for many intents, yielding each as it completes.
+        
+        Intents are assembled concurrently (bounded by ``max_batch_concurrency``)
+        so intent analysis for later intents overlaps cell acquisition for
+        earlier ones. Identical intent analyses and quantum trail lookups are
+        performed once and shared across the batch; every solution still gets
+        its own quantum signature.
+        
+        Args:
+            requests: Dictionaries with ``user_request`` and optional ``context``
+            
+        Yields:
+            Dictionaries with the request ``index`` and either ``status``
+            "success" and the ``solution``, or ``status`` "error" and ``error``
+        """
+        logger.info(f"Assembling batch of {len(requests)} solutions")
+        
+        shared = {}
+        semaphore = asyncio.Semaphore(self.max_batch_concurrency)
+        
+        async def assemble_one(index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    with self.telemetry.span("assembler.assemble_solution", user_id=self.user_id, batch_index=index):
+                        solution = await self._assemble_solution(
+                            request["user_request"],
+                            dict(request.get("context") or {}),
+                            shared
+                        )
+                    return {"index": index, "status": "success", "solution": solution}
+                except Exception as e:
+                    logger.error(f"Batch assembly failed for request {index}: {e}")
+                    return {"index": index, "status": "error", "error": str(e)}
+        
+        tasks = [asyncio.ensure_future(assemble_one(index, request)) for index, request in enumerate(requests)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Stop remaining assemblies if the consumer goes away
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _assemble_solution(
+        self,
+        user_request: str,
+        context: Optional[Dict[str, Any]],
+        shared: Optional[Dict[Hashable, "asyncio.Future[Any]"]] = None,
+        progress: Optional[ProgressCallback] = None,
+        solution_id: Optional[str] = None
+    ) -> Solution:
+        """
+        Assemble a solution, optionally sharing lookups with other assemblies.
+        
+        Args:
+            user_request: Natural language description of user need
+            context: Additional context information
+            shared: Lookups shared across a batch, or None
+            progress: Receives assembly progress events, or None
+            solution_id: ID to give the solution, or None to generate one
+            
+        Returns:
+            Solution object representing the assembled cells
+        """
         start_time = time.time()
         logger.info(f"Assembling solution for request: {user_request}")
         self.total_assemblies += 1
@@ -99,187 +311,765 @@ class CellAssembler:
             "assembler_id": self.assembler_id
         })
         
-        # Interpret user intent
-        intent_analysis = await self.intent_interpreter.analyze(user_request, context)
-        logger.debug(f"Intent analysis: {intent_analysis}")
+        # Start acquiring likely cells while the intent is analyzed
+        speculation = self._start_speculation(context)
         
-        # Determine required capabilities
-        required_capabilities = intent_analysis["required_capabilities"]
-        if not required_capabilities:
-            logger.warning("No capabilities identified from user request")
-            required_capabilities = ["text_generation"]  # Fallback capability
+        try:
+            with self.telemetry.span("assembler.plan"):
+                plan = await self._plan_assembly(user_request, context, shared)
+            self._emit_progress(
+                progress,
+                "intent_analyzed",
+                capabilities=list(plan["required_capabilities"])
+            )
             
-        # Generate quantum trail for this request
-        quantum_signature = await self.quantum_trail.generate_signature(
-            user_id=self.user_id,
-            intent=intent_analysis,
-            context=context
-        )
-        logger.debug(f"Generated quantum signature: {quantum_signature[:16]}...")
-        
-        # Try to find similar configurations in quantum trail
-        similar_configs = await self.quantum_trail.find_similar_configurations(
-            capabilities=required_capabilities,
-            context_similarity=context,
-            max_results=3
-        )
-        
-        # If similar configurations found, use the highest performing one
-        cell_configuration = None
-        if similar_configs and intent_analysis.get("use_previous_configurations", True):
-            cell_configuration = self._select_best_configuration(similar_configs)
-            logger.info(f"Using similar configuration from quantum trail: {cell_configuration.id}")
+            # Request cells from providers
+            try:
+                with self.telemetry.span("assembler.acquire_cells"):
+                    if plan["cell_configuration"]:
+                        # Use existing configuration as guide
+                        cells = await self._request_cells_by_configuration(
+                            plan["cell_configuration"], 
+                            plan["quantum_signature"],
+                            progress=progress
+                        )
+                    else:
+                        # Request based on capabilities
+                        cells = await self._request_cells_by_capabilities(
+                            plan["required_capabilities"], 
+                            plan["quantum_signature"], 
+                            context,
+                            speculation,
+                            progress=progress
+                        )
+            except CellRequestError as e:
+                logger.error(f"Failed to request cells: {e}")
+                raise
+        finally:
+            # Speculative cells that were not committed are discarded
+            self._discard_speculation(speculation)
         
-        # Request cells from providers
-        try:
-            if cell_configuration:
-                # Use existing configuration as guide
-                cells = await self._request_cells_by_configuration(
-                    cell_configuration, 
-                    quantum_signature
-                )
-            else:
-                # Request based on capabilities
-                cells = await self._request_cells_by_capabilities(
-                    required_capabilities, 
-                    quantum_signature, 
-                    context
-                )
-        except CellRequestError as e:
-            logger.error(f"Failed to request cells: {e}")
-            raise
+        intent_analysis = plan["intent_analysis"]
+        quantum_signature = plan["quantum_signature"]
+        cell_configuration = plan["cell_configuration"]
         
         # Verify cell security
         try:
-            await self.security_manager.verify_cells(cells, quantum_signature)
+            with self.telemetry.span("assembler.verify_cells", cell_count=len(cells)):
+                await self.security_manager.verify_cells(cells, quantum_signature)
         except SecurityVerificationError as e:
             logger.error(f"Security verification failed: {e}")
             # Release any cells already acquired
             for cell_id, cell in cells.items():
                 await self.cell_runtime.release_cell(cell)
             raise
+        self._emit_progress(progress, "cells_verified", cell_ids=list(cells.keys()))
         
         # Establish cell connections based on intent or configuration
         if cell_configuration:
             connection_map = cell_configuration.connection_map
         else:
             connection_map = intent_analysis.get("suggested_connections", {})
-            
-        for source, targets in connection_map.items():
-            if source in cells:
-                for target in targets:
-                    if target in cells:
-                        await self.cell_runtime.connect_cells(cells[source], cells[target])
-                    else:
-                        logger.warning(f"Cannot connect to missing cell: {target}")
-            else:
-                logger.warning(f"Cannot connect from missing cell: {source}")
         
-        # Activate cells
-        for cell_id, cell in cells.items():
-            await self.cell_runtime.activate_cell(cell)
-        
-        # Create solution object
-        solution_id = str(uuid.uuid4())
+        # Register the solution now so cells are usable as soon as they are active
+        solution_id = solution_id or str(uuid.uuid4())
         solution = Solution(
             id=solution_id,
             cells=cells,
             quantum_signature=quantum_signature,
             created_at=datetime.now().isoformat(),
             intent=intent_analysis,
-            status="active",
-            context=context
+            status="assembling",
+            context=context,
+            connection_map=connection_map
         )
-        
-        # Store active solution
         self.active_solutions[solution_id] = solution
         
+        # Connect and activate cells, in dependency order only where required
+        try:
+            with self.telemetry.span("assembler.connect_and_activate", cell_count=len(cells)):
+                await self._connect_and_activate_cells(cells, connection_map, progress=progress)
+        except BaseException:
+            self.active_solutions.pop(solution_id, None)
+            for cell in cells.values():
+                try:
+                    await self.cell_runtime.release_cell(cell)
+                except Exception as e:
+                    logger.error(f"Error releasing cell {cell.id} after failed activation: {e}")
+            raise
+        
+        solution.update_status("active")
+        self.capability_patterns.observe(plan["required_capabilities"])
+        
         # Record assembly time
         assembly_time_ms = int((time.time() - start_time) * 1000)
+        if self.average_assembly_time_ms is None:
+            self.average_assembly_time_ms = assembly_time_ms
+        else:
+            self.average_assembly_time_ms = 0.2 * assembly_time_ms + 0.8 * self.average_assembly_time_ms
+        self._emit_progress(progress, "solution_ready", assembly_time_ms=assembly_time_ms)
         
         # Record successful assembly in quantum trail
-        await self.quantum_trail.record_assembly(
-            quantum_signature=quantum_signature,
-            solution_id=solution_id,
-            cell_ids=list(cells.keys()),
-            connection_map=connection_map,
-            performance_metrics={"assembly_time_ms": assembly_time_ms}
-        )
+        with self.telemetry.span("quantum_trail.record_assembly"):
+            await self.quantum_trail.record_assembly(
+                quantum_signature=quantum_signature,
+                solution_id=solution_id,
+                cell_ids=list(cells.keys()),
+                connection_map=connection_map,
+                performance_metrics={"assembly_time_ms": assembly_time_ms}
+            )
+        # The recorded configuration is this plan's own, so only other
+        # templates' trail lookups are out of date
+        self.invalidate_solution_templates(plan["required_capabilities"], keep=plan["template_key"])
         
         logger.info(f"Solution assembled: {solution_id} with {len(cells)} cells in {assembly_time_ms}ms")
         return solution
     
+    async def _plan_assembly(
+        self,
+        user_request: str,
+        context: Dict[str, Any],
+        shared: Optional[Dict[Hashable, "asyncio.Future[Any]"]] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze intent and look up the signature and any prior configuration.
+        
+        A cached template for the same normalized request and context
+        fingerprint replaces intent analysis and the trail lookup; only the
+        quantum signature is generated per request.
+        
+        Args:
+            user_request: Natural language description of user need
+            context: Prepared request context
+            shared: Lookups shared across a batch, or None
+            
+        Returns:
+            Dictionary with ``intent_analysis``, ``required_capabilities``,
+            ``quantum_signature``, ``cell_configuration`` and ``template_key``
+        """
+        compatibility_key = self._compatibility_key(context)
+        with self.telemetry.span("assembler.template_lookup") as span:
+            template_key = self._template_key(user_request, context)
+            template = self.solution_templates.get(template_key)
+            span.set_attribute("hit", template is not None)
+        
+        if template:
+            logger.debug(f"Using solution template for request: {user_request}")
+            intent_analysis = copy.deepcopy(template["intent_analysis"])
+            with self.telemetry.span("quantum_trail.generate_signature"):
+                quantum_signature = await self.quantum_trail.generate_signature(
+                    user_id=self.user_id,
+                    intent=intent_analysis,
+                    context=context
+                )
+            return {
+                "intent_analysis": intent_analysis,
+                "required_capabilities": list(template["required_capabilities"]),
+                "quantum_signature": quantum_signature,
+                "cell_configuration": template["cell_configuration"],
+                "template_key": template_key
+            }
+        
+        # Interpret user intent
+        with self.telemetry.span("assembler.intent_analysis"):
+            intent_analysis = await self._shared_lookup(
+                shared,
+                ("intent", user_request, template_key),
+                lambda: self.intent_interpreter.analyze(user_request, context)
+            )
+        if shared is not None:
+            # Each solution owns its copy of the analysis
+            intent_analysis = copy.deepcopy(intent_analysis)
+        logger.debug(f"Intent analysis: {intent_analysis}")
+        
+        # Determine required capabilities
+        required_capabilities = intent_analysis["required_capabilities"]
+        if not required_capabilities:
+            logger.warning("No capabilities identified from user request")
+            required_capabilities = ["text_generation"]  # Fallback capability
+            
+        # Generate quantum trail for this request; each solution gets its own
+        with self.telemetry.span("quantum_trail.generate_signature"):
+            quantum_signature = await self.quantum_trail.generate_signature(
+                user_id=self.user_id,
+                intent=intent_analysis,
+                context=context
+            )
+        logger.debug(f"Generated quantum signature: {quantum_signature[:16]}...")
+        
+        # Try to find similar configurations in quantum trail
+        with self.telemetry.span("quantum_trail.find_similar_configurations"):
+            similar_configs = await self._shared_lookup(
+                shared,
+                ("trail", tuple(sorted(required_capabilities)), compatibility_key),
+                lambda: self.quantum_trail.find_similar_configurations(
+                    capabilities=required_capabilities,
+                    context_similarity=context,
+                    max_results=3
+                )
+            )
+        
+        # If similar configurations found, use the highest performing one
+        cell_configuration = None
+        if similar_configs and intent_analysis.get("use_previous_configurations", True):
+            cell_configuration = self._select_best_configuration(similar_configs)
+            logger.info(f"Using similar configuration from quantum trail: {cell_configuration.id}")
+        
+        # Key the template on the pattern version the analysis actually used
+        if intent_analysis.get("pattern_version", template_key[1]) != template_key[1]:
+            template_key = self._template_key(user_request, context, intent_analysis["pattern_version"])
+        
+        self.solution_templates.put(template_key, {
+            "intent_analysis": copy.deepcopy(intent_analysis),
+            "required_capabilities": list(required_capabilities),
+            "connection_map": (
+                cell_configuration.connection_map if cell_configuration
+                else intent_analysis.get("suggested_connections", {})
+            ),
+            "cell_configuration": cell_configuration
+        })
+        
+        return {
+            "intent_analysis": intent_analysis,
+            "required_capabilities": required_capabilities,
+            "quantum_signature": quantum_signature,
+            "cell_configuration": cell_configuration,
+            "template_key": template_key
+        }
+    
+    def _template_key(
+        self,
+        user_request: str,
+        context: Dict[str, Any],
+        pattern_version: Optional[int] = None
+    ) -> Hashable:
+        """
+        Build the solution template key for a request.
+        
+        The key combines the interpreter's normalized request and pattern
+        version with a context fingerprint of the device class and
+        environment, which are the context inputs that change intent analysis.
+        
+        Args:
+            user_request: Natural language description of user need
+            context: Prepared request context
+            pattern_version: Pattern snapshot version of the analysis;
+                defaults to the interpreter's current version
+            
+        Returns:
+            Hashable template key
+        """
+        device_info = context.get("device_info") or {}
+        memory_gb = device_info.get("memory_gb", 4)
+        memory_class = "low" if memory_gb < 2 else "medium" if memory_gb < 8 else "high"
+        
+        return (
+            self.intent_interpreter.normalize_request(user_request),
+            self.intent_interpreter.pattern_version if pattern_version is None else pattern_version,
+            device_info.get("platform"),
+            memory_class,
+            bool(device_info.get("gpu_available", False)),
+            context.get("environment")
+        )
+    
+    def invalidate_solution_templates(
+        self,
+        capabilities: Optional[List[str]] = None,
+        keep: Optional[Hashable] = None
+    ) -> int:
+        """
+        Drop cached solution templates after the quantum trail changes.
+        
+        Called whenever an assembly is recorded or updated in the trail,
+        since templates hold the outcome of earlier trail lookups.
+        
+        Args:
+            capabilities: Only drop templates using these capabilities;
+                all templates are dropped if omitted
+            keep: Key of a template that is still valid
+            
+        Returns:
+            Number of templates dropped
+        """
+        if capabilities is None:
+            count = len(self.solution_templates.cache)
+            self.solution_templates.clear()
+            return count
+        return self.solution_templates.invalidate_capabilities(capabilities, keep=keep)
+    
+    async def _shared_lookup(
+        self,
+        shared: Optional[Dict[Hashable, "asyncio.Future[Any]"]],
+        key: Hashable,
+        lookup: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run a lookup once per key when assemblies share lookups.
+        
+        Args:
+            shared: Shared lookups keyed by ``key``, or None to always run
+            key: Identity of the lookup
+            lookup: Factory producing the lookup
+            
+        Returns:
+            Result of the lookup
+        """
+        if shared is None:
+            return await lookup()
+        
+        if key not in shared:
+            shared[key] = asyncio.ensure_future(lookup())
+        
+        # Cancelling one waiter must not cancel the lookup for the others
+        return await asyncio.shield(shared[key])
+    
+    async def _connect_and_activate_cells(
+        self,
+        cells: Dict[str, Cell],
+        connection_map: Dict[str, List[str]],
+        active_cells: Optional[Set[str]] = None,
+        existing_connections: Optional[Set[Tuple[str, str]]] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> None:
+        """
+        Connect and activate cells, treating the connection map as a DAG.
+        
+        A source cell depends on the targets it connects to, so each cell is
+        wired to its targets and activated only after those targets are
+        active. Cells with no dependency between them are handled
+        concurrently. Edges that would close a cycle are still connected but
+        do not constrain ordering.
+        
+        Args:
+            cells: Cells of the solution keyed by cell ID
+            connection_map: Source to target mapping (cell IDs or capabilities)
+            active_cells: IDs of cells that are already active and must not
+                be activated again
+            existing_connections: (source, target) cell ID pairs that are
+                already connected
+            progress: Receives "cell_connected" and "cell_activated" events
+            
+        Raises:
+            Exception: The first connection or activation failure; remaining
+                work is cancelled
+        """
+        active_cells = active_cells or set()
+        existing_connections = existing_connections or set()
+        dependencies = self._build_dependency_graph(cells, connection_map)
+        order = self._topological_order(dependencies)
+        
+        tasks = {}
+        
+        async def connect_and_activate(cell_id: str, ordered_targets: List[str], cyclic_targets: List[str]) -> None:
+            # Targets must be active before their consumers are wired and activated
+            if ordered_targets:
+                await asyncio.gather(*(tasks[target_id] for target_id in ordered_targets))
+            
+            targets = [
+                target_id for target_id in ordered_targets + cyclic_targets
+                if (cell_id, target_id) not in existing_connections
+            ]
+            if targets:
+                with self.telemetry.span("assembler.connect_cell", cell_id=cell_id, targets=len(targets)):
+                    await asyncio.gather(*(
+                        self.cell_runtime.connect_cells(cells[cell_id], cells[target_id])
+                        for target_id in targets
+                    ))
+                for target_id in targets:
+                    self._emit_progress(progress, "cell_connected", source=cell_id, target=target_id)
+            
+            if cell_id not in active_cells:
+                with self.telemetry.span("assembler.activate_cell", cell_id=cell_id):
+                    await self.cell_runtime.activate_cell(cells[cell_id])
+                self._emit_progress(
+                    progress,
+                    "cell_activated",
+                    cell_id=cell_id,
+                    capability=cells[cell_id].capability
+                )
+        
+        # Create tasks in topological order so dependencies always exist first
+        for cell_id in order:
+            ordered_targets = [t for t in dependencies[cell_id] if t in tasks]
+            cyclic_targets = [t for t in dependencies[cell_id] if t not in tasks]
+            if cyclic_targets:
+                logger.warning(f"Connection cycle at cell {cell_id}; not ordering activation after {cyclic_targets}")
+            tasks[cell_id] = asyncio.ensure_future(
+                connect_and_activate(cell_id, ordered_targets, cyclic_targets)
+            )
+        
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+    
+    def _build_dependency_graph(
+        self,
+        cells: Dict[str, Cell],
+        connection_map: Dict[str, List[str]]
+    ) -> Dict[str, List[str]]:
+        """
+        Resolve a connection map into cell-level dependencies.
+        
+        Connection map entries may name cells by ID or by capability (as
+        produced by intent analysis).
+        
+        Args:
+            cells: Cells of the solution keyed by cell ID
+            connection_map: Source to target mapping
+            
+        Returns:
+            Mapping from each cell ID to the cell IDs it connects to
+        """
+        by_capability = {}
+        for cell_id, cell in cells.items():
+            capability = getattr(cell, "capability", None)
+            if capability:
+                by_capability.setdefault(capability, []).append(cell_id)
+        
+        def resolve(name: str) -> List[str]:
+            if name in cells:
+                return [name]
+            return by_capability.get(name, [])
+        
+        dependencies = {cell_id: [] for cell_id in cells}
+        for source, targets in connection_map.items():
+            source_ids = resolve(source)
+            if not source_ids:
+                logger.warning(f"Cannot connect from missing cell: {source}")
+                continue
+            for target in targets:
+                target_ids = resolve(target)
+                if not target_ids:
+                    logger.warning(f"Cannot connect to missing cell: {target}")
+                    continue
+                for source_id in source_ids:
+                    for target_id in target_ids:
+                        if target_id != source_id and target_id not in dependencies[source_id]:
+                            dependencies[source_id].append(target_id)
+        
+        return dependencies
+    
+    def _topological_order(self, dependencies: Dict[str, List[str]]) -> List[str]:
+        """
+        Order cells so that every cell comes after the cells it depends on.
+        
+        Cells caught in a cycle are appended in their original order.
+        
+        Args:
+            dependencies: Mapping from cell ID to the cell IDs it depends on
+            
+        Returns:
+            Cell IDs in dependency order
+        """
+        remaining = {cell_id: len(deps) for cell_id, deps in dependencies.items()}
+        dependents = {cell_id: [] for cell_id in dependencies}
+        for cell_id, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(cell_id)
+        
+        ready = deque(cell_id for cell_id, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            cell_id = ready.popleft()
+            order.append(cell_id)
+            for dependent in dependents[cell_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        
+        if len(order) < len(dependencies):
+            placed = set(order)
+            order.extend(cell_id for cell_id in dependencies if cell_id not in placed)
+        
+        return order
+    
     async def release_solution(self, solution_id: str) -> bool:
         """
         Release all cells associated with a solution.
         
+        Waits for a reconfiguration of the solution in progress to finish.
+        
         Args:
             solution_id: Identifier of the solution to release
             
         Returns:
             Success indicator
         """
+        async with self._solution_lock(solution_id):
+            released = await self._release_solution(solution_id)
+            if released:
+                self._solution_locks.pop(solution_id, None)
+            return released
+    
+    def _solution_lock(self, solution_id: str) -> asyncio.Lock:
+        """Get the lock serializing changes to a solution."""
+        return self._solution_locks.setdefault(solution_id, asyncio.Lock())
+    
+    async def _release_solution(self, solution_id: str) -> bool:
+        """Release a solution's cells; the caller holds its lock."""
         logger.info(f"Releasing solution: {solution_id}")
         
-        if solution_id not in self.active_solutions:
-            logger.warning(f"Attempted to release unknown solution: {solution_id}")
-            return False
+        if solution_id not in self.active_solutions:
+            logger.warning(f"Attempted to release unknown solution: {solution_id}")
+            return False
+        
+        solution = self.active_solutions[solution_id]
+        usage_time_ms = 0
+        
+        # Calculate usage time
+        if solution.created_at:
+            created_at = datetime.fromisoformat(solution.created_at)
+            usage_time_ms = int((datetime.now() - created_at).total_seconds() * 1000)
+        
+        # Deactivate and release all cells
+        for cell_id, cell in solution.cells.items():
+            await self._retire_cell(cell, solution)
+        
+        # Update quantum trail with usage information
+        await self.quantum_trail.update_assembly_record(
+            quantum_signature=solution.quantum_signature,
+            solution_id=solution_id,
+            status="released",
+            performance_metrics={
+                "total_usage_time_ms": usage_time_ms,
+                "memory_peak_mb": solution.performance_metrics.get("memory_peak_mb", 0),
+                "cpu_usage_avg": solution.performance_metrics.get("cpu_usage_avg", 0)
+            }
+        )
+        
+        # Scores of the configurations this solution's capabilities use have changed
+        self.invalidate_solution_templates([cell.capability for cell in solution.cells.values()])
+        
+        # Remove from active solutions
+        del self.active_solutions[solution_id]
+        
+        return True
+    
+    async def _retire_cell(self, cell: Cell, solution: Solution) -> None:
+        """
+        Deactivate a cell that is leaving a solution and cache or release it.
+        
+        Args:
+            cell: The cell to retire
+            solution: The solution the cell was part of
+        """
+        try:
+            await self.cell_runtime.deactivate_cell(cell)
+            
+            # Decide whether to cache this cell
+            if self._should_cache_cell(cell, solution):
+                self._add_to_cache(cell)
+            else:
+                await self.cell_runtime.release_cell(cell)
+                
+        except Exception as e:
+            logger.error(f"Error releasing cell {cell.id}: {e}")
+    
+    async def reconfigure_solution(
+        self,
+        solution_id: str,
+        new_request: str,
+        context: Dict[str, Any] = None
+    ) -> Solution:
+        """
+        Change what an active solution does without rebuilding it.
+        
+        The new request is analyzed and its capabilities and connections
+        are diffed against the solution. Cells whose capability is still
+        needed are kept running with their state; only missing cells are
+        acquired and activated, only changed connections are made or
+        removed, and cells that are no longer needed are released.
+        Reconfigurations and the release of one solution run one at a time.
+        
+        Args:
+            solution_id: Identifier of the solution to reconfigure
+            new_request: Natural language description of the new need
+            context: Context changes to apply on top of the solution's context
+            
+        Returns:
+            The updated solution
+            
+        Raises:
+            AssemblerError: If the solution does not exist
+            CellRequestError: If missing cells cannot be acquired; the
+                solution is left unchanged
+            SecurityVerificationError: If acquired cells fail verification;
+                the solution is left unchanged
+        """
+        async with self._solution_lock(solution_id):
+            return await self._reconfigure_solution(solution_id, new_request, context)
+    
+    async def _reconfigure_solution(
+        self,
+        solution_id: str,
+        new_request: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Solution:
+        """Reconfigure a solution; the caller holds its lock."""
+        start_time = time.time()
+        logger.info(f"Reconfiguring solution {solution_id} for request: {new_request}")
+        
+        solution = self.active_solutions.get(solution_id)
+        if solution is None:
+            raise AssemblerError(f"Cannot reconfigure unknown solution: {solution_id}")
+        
+        context = {**solution.context, **(context or {})}
+        context["timestamp"] = datetime.now().isoformat()
+        
+        plan = await self._plan_assembly(new_request, context)
+        intent_analysis = plan["intent_analysis"]
+        quantum_signature = plan["quantum_signature"]
+        if plan["cell_configuration"]:
+            connection_map = plan["cell_configuration"].connection_map
+        else:
+            connection_map = intent_analysis.get("suggested_connections", {})
+        
+        # Keep one running cell per required capability
+        available = {}
+        for cell_id, cell in solution.cells.items():
+            available.setdefault(cell.capability, []).append(cell_id)
+        
+        kept = {}
+        missing = []
+        for capability in plan["required_capabilities"]:
+            if available.get(capability):
+                cell_id = available[capability].pop(0)
+                kept[cell_id] = solution.cells[cell_id]
+            else:
+                missing.append(capability)
+        removed = {
+            cell_id: cell for cell_id, cell in solution.cells.items()
+            if cell_id not in kept
+        }
+        
+        # Acquire and verify only the missing cells
+        added = {}
+        if missing:
+            added = await self._request_cells_by_capabilities(missing, quantum_signature, context)
+            try:
+                await self.security_manager.verify_cells(added, quantum_signature)
+            except SecurityVerificationError as e:
+                logger.error(f"Security verification failed: {e}")
+                for cell in added.values():
+                    await self.cell_runtime.release_cell(cell)
+                raise
+        
+        old_connections = self._connection_pairs(solution.cells, solution.connection_map)
+        cells = {**kept, **added}
+        new_connections = self._connection_pairs(cells, connection_map)
+        
+        # Wire and activate new cells; kept cells only gain new connections
+        try:
+            await self._connect_and_activate_cells(
+                cells,
+                connection_map,
+                active_cells=set(kept),
+                existing_connections=old_connections
+            )
+        except Exception:
+            for cell in added.values():
+                await self.cell_runtime.release_cell(cell)
+            raise
+        
+        # Drop connections that are gone, then the cells that are gone
+        stale_connections = old_connections - new_connections
+        await asyncio.gather(*(
+            self.cell_runtime.disconnect_cells(solution.cells[source_id], solution.cells[target_id])
+            for source_id, target_id in stale_connections
+        ), return_exceptions=True)
         
-        solution = self.active_solutions[solution_id]
-        usage_time_ms = 0
+        for cell in removed.values():
+            await self._retire_cell(cell, solution)
         
-        # Calculate usage time
-        if "created_at" in solution:
-            created_at = datetime.fromisoformat(solution["created_at"])
-            usage_time_ms = int((datetime.now() - created_at).total_seconds() * 1000)
+        solution.cells = cells
+        solution.connection_map = connection_map
+        solution.intent = intent_analysis
+        solution.quantum_signature = quantum_signature
+        solution.context = context
         
-        # Deactivate and release all cells
-        for cell_id, cell in solution.cells.items():
-            try:
-                await self.cell_runtime.deactivate_cell(cell)
-                
-                # Decide whether to cache this cell
-                if self._should_cache_cell(cell, solution):
-                    self._add_to_cache(cell)
-                else:
-                    await self.cell_runtime.release_cell(cell)
-                    
-            except Exception as e:
-                logger.error(f"Error releasing cell {cell_id}: {e}")
+        self.capability_patterns.observe(plan["required_capabilities"])
         
-        # Update quantum trail with usage information
-        await self.quantum_trail.update_assembly_record(
-            quantum_signature=solution.quantum_signature,
+        reconfiguration_time_ms = int((time.time() - start_time) * 1000)
+        
+        await self.quantum_trail.record_assembly(
+            quantum_signature=quantum_signature,
             solution_id=solution_id,
-            status="released",
+            cell_ids=list(cells.keys()),
+            connection_map=connection_map,
             performance_metrics={
-                "total_usage_time_ms": usage_time_ms,
-                "memory_peak_mb": solution.get("memory_peak_mb", 0),
-                "cpu_usage_avg": solution.get("cpu_usage_avg", 0)
+                "assembly_time_ms": reconfiguration_time_ms,
+                "cells_kept": len(kept),
+                "cells_added": len(added),
+                "cells_removed": len(removed)
             }
         )
+        self.invalidate_solution_templates(
+            list({*plan["required_capabilities"], *(cell.capability for cell in removed.values())}),
+            keep=plan["template_key"]
+        )
         
-        # Remove from active solutions
-        del self.active_solutions[solution_id]
+        logger.info(
+            f"Solution reconfigured: {solution_id} kept {len(kept)}, added {len(added)}, "
+            f"removed {len(removed)} cells in {reconfiguration_time_ms}ms"
+        )
+        return solution
+    
+    def _connection_pairs(
+        self,
+        cells: Dict[str, Cell],
+        connection_map: Dict[str, List[str]]
+    ) -> Set[Tuple[str, str]]:
+        """
+        Resolve a connection map into (source, target) cell ID pairs.
         
-        return True
+        Args:
+            cells: Cells keyed by cell ID
+            connection_map: Source to target mapping
+            
+        Returns:
+            Set of connected cell ID pairs
+        """
+        dependencies = self._build_dependency_graph(cells, connection_map or {})
+        return {
+            (source_id, target_id)
+            for source_id, target_ids in dependencies.items()
+            for target_id in target_ids
+        }
     
     async def _request_cells_by_capabilities(
         self, 
         capabilities: List[str], 
         quantum_signature: str, 
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        speculation: Optional[Dict[str, "asyncio.Future[Cell]"]] = None,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Cell]:
         """
         Request cells from providers based on required capabilities.
         
+        Cache hits are served immediately and speculative requests already
+        in flight are committed; all remaining capabilities are requested
+        concurrently. Every capability is required, so a capability that
+        fails on all providers cancels the requests still in flight.
+        
         Args:
             capabilities: List of required cell capabilities
             quantum_signature: Quantum signature for security
             context: Additional context information
+            speculation: Speculative requests keyed by capability; committed
+                entries are removed from it
+            progress: Receives a "cell_acquired" event per cell
             
         Returns:
             Dictionary of cell objects keyed by cell ID
+            
+        Raises:
+            CellRequestError: If a capability cannot be obtained or the
+                acquisition deadline is exceeded
         """
         logger.info(f"Requesting cells with capabilities: {capabilities}")
         
@@ -287,61 +1077,182 @@ class CellAssembler:
         self.total_cells_requested += len(capabilities)
         
         # Check cache first for each capability
+        requests = []
         for capability in capabilities:
             cached_cell = self._get_from_cache(capability, context)
             if cached_cell:
                 cells[cached_cell.id] = cached_cell
                 logger.info(f"Using cached cell {cached_cell.id} for capability {capability}")
+                self._emit_cell_acquired(progress, cached_cell, cached=True)
                 continue
             
-            # Determine best provider for this capability
-            provider_url = self._select_provider_for_capability(capability)
+            speculative_request = speculation.pop(capability, None) if speculation else None
+            if speculative_request is not None:
+                requests.append((
+                    capability,
+                    self._claim_speculative_cell(speculative_request, capability, quantum_signature, context),
+                    True
+                ))
+                continue
             
-            # Request cell from provider
-            try:
-                cell = await self._request_cell_from_provider(
-                    provider_url, 
-                    capability, 
-                    quantum_signature,
-                    context
-                )
-                cells[cell.id] = cell
-                logger.info(f"Received cell {cell.id} for capability {capability} from {provider_url}")
-            except CellRequestError as e:
-                logger.error(f"Failed to request cell for capability {capability}: {e}")
-                # Try backup provider if available
-                if len(self.provider_urls) > 1:
-                    backup_provider = [p for p in self.provider_urls if p != provider_url][0]
-                    try:
-                        logger.info(f"Trying backup provider {backup_provider} for capability {capability}")
-                        cell = await self._request_cell_from_provider(
-                            backup_provider, 
-                            capability, 
-                            quantum_signature,
-                            context
-                        )
-                        cells[cell.id] = cell
-                        logger.info(f"Received cell {cell.id} from backup provider {backup_provider}")
-                    except CellRequestError as e2:
-                        logger.error(f"Backup provider also failed: {e2}")
-                        raise CellRequestError(f"Failed to request cell for {capability} from all providers")
+            requests.append((
+                capability,
+                self._acquire_cell_for_capability(capability, quantum_signature, context),
+                True
+            ))
+        
+        # Fan out all provider requests at once
+        try:
+            acquired = await self._run_acquisition(requests, progress)
+        except BaseException:
+            # The assembly failed; the warm cells it took go back to the pool
+            for cached_cell in cells.values():
+                self._add_to_cache(cached_cell)
+            raise
+        
+        for cell in acquired:
+            cells[cell.id] = cell
         
         if not cells:
             raise CellRequestError("Failed to obtain any required cells")
             
         return cells
     
+    def _start_speculation(self, context: Dict[str, Any]) -> Dict[str, "asyncio.Future[Cell]"]:
+        """
+        Start acquiring cells for capabilities the request is likely to need.
+        
+        Predictions come from the most frequent capability sets of past
+        assemblies. Capabilities with a compatible warm cell are skipped.
+        The assembly's quantum signature is not known yet, so the cells are
+        requested under a provisional signature and re-signed on commit.
+        
+        Args:
+            context: Prepared request context
+            
+        Returns:
+            Speculative requests keyed by capability
+        """
+        if not self.speculative_assembly:
+            return {}
+        
+        compatibility_key = self._compatibility_key(context)
+        capabilities = [
+            capability
+            for capability in self.capability_patterns.predict(self.speculation_top_k, self.speculation_max_cells)
+            if not self.cell_cache.available(capability, compatibility_key)
+        ]
+        if not capabilities:
+            return {}
+        
+        provisional_signature = asyncio.ensure_future(self.quantum_trail.generate_signature(
+            user_id=self.user_id,
+            intent={"speculative": True, "required_capabilities": capabilities},
+            context=context
+        ))
+        speculation = {
+            capability: asyncio.ensure_future(
+                self._speculate_cell(capability, provisional_signature, context)
+            )
+            for capability in capabilities
+        }
+        
+        logger.debug(f"Speculatively requesting cells for: {capabilities}")
+        self.capability_patterns.record_speculation(len(speculation))
+        return speculation
+    
+    async def _speculate_cell(
+        self,
+        capability: str,
+        provisional_signature: "asyncio.Future[str]",
+        context: Dict[str, Any]
+    ) -> Cell:
+        """
+        Acquire a cell for a predicted capability under the provisional signature.
+        
+        Args:
+            capability: Predicted capability
+            provisional_signature: Signature shared by the speculative requests
+            context: Additional context information
+            
+        Returns:
+            Cell object
+        """
+        # Shielded, since the other speculative requests share the signature
+        quantum_signature = await asyncio.shield(provisional_signature)
+        return await self._acquire_cell_for_capability(capability, quantum_signature, context)
+    
+    async def _claim_speculative_cell(
+        self,
+        request: "asyncio.Future[Cell]",
+        capability: str,
+        quantum_signature: str,
+        context: Dict[str, Any]
+    ) -> Cell:
+        """
+        Commit a speculative request to the current assembly.
+        
+        The cell is re-registered under the assembly's quantum signature.
+        
+        Args:
+            request: Speculative request for the capability
+            capability: Capability being committed
+            quantum_signature: Quantum signature of the assembly
+            context: Additional context information
+            
+        Returns:
+            Cell object
+        """
+        try:
+            cell = await request
+        except Exception as e:
+            # Also covers a failed provisional signature
+            logger.warning(f"Speculative request for {capability} failed, requesting again: {e}")
+            return await self._acquire_cell_for_capability(capability, quantum_signature, context)
+        
+        await self._register_cell_signature(cell, quantum_signature)
+        self.capability_patterns.record_hit()
+        return cell
+    
+    def _discard_speculation(self, speculation: Dict[str, "asyncio.Future[Cell]"]) -> None:
+        """
+        Discard speculative requests that were not committed.
+        
+        Cells that already arrived are kept warm in the cell cache; requests
+        still in flight are cancelled.
+        
+        Args:
+            speculation: Remaining speculative requests keyed by capability
+        """
+        if not speculation:
+            return
+        
+        for capability, request in speculation.items():
+            if not request.done():
+                request.cancel()
+            elif not request.cancelled() and request.exception() is None:
+                self._add_to_cache(request.result())
+        
+        self.capability_patterns.record_waste(len(speculation))
+        speculation.clear()
+    
     async def _request_cells_by_configuration(
         self, 
         configuration: CellConfiguration, 
-        quantum_signature: str
+        quantum_signature: str,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Cell]:
         """
         Request cells based on a previous successful configuration.
         
+        All cell specs are requested concurrently. Specs are optional unless
+        they set ``required``; an optional spec that fails on every fallback
+        is skipped.
+        
         Args:
             configuration: Previous cell configuration to replicate
             quantum_signature: Quantum signature for security
+            progress: Receives a "cell_acquired" event per cell
             
         Returns:
             Dictionary of cell objects keyed by cell ID
@@ -351,51 +1262,371 @@ class CellAssembler:
         cells = {}
         self.total_cells_requested += len(configuration.cell_specs)
         
-        for cell_spec in configuration.cell_specs:
-            provider_url = cell_spec.get("provider_url") or self.provider_urls[0]
+        requests = [
+            (
+                cell_spec.get("cell_type", "unknown"),
+                self._acquire_cell_for_spec(cell_spec, quantum_signature),
+                bool(cell_spec.get("required", False))
+            )
+            for cell_spec in configuration.cell_specs
+        ]
+        
+        for cell in await self._run_acquisition(requests, progress):
+            cells[cell.id] = cell
+        
+        if not cells:
+            raise CellRequestError("Failed to obtain any cells from configuration")
+            
+        return cells
+    
+    async def _acquire_cell_for_capability(
+        self,
+        capability: str,
+        quantum_signature: str,
+        context: Dict[str, Any]
+    ) -> Cell:
+        """
+        Acquire a cell for a capability, hedging slow requests.
+        
+        The request goes to the best-ranked provider. If it has not answered
+        within that provider's p95 latency, the same request is sent to the
+        next-ranked provider; the first successful response wins and the
+        other request is cancelled, or its cell released if it also arrived.
+        If the primary fails outright, the next provider is tried as a backup.
+        
+        Args:
+            capability: Required capability
+            quantum_signature: Quantum signature for security
+            context: Additional context information
+            
+        Returns:
+            Cell object
+            
+        Raises:
+            CellRequestError: If no provider could supply the cell
+        """
+        # Determine best provider for this capability
+        provider_url = self._select_provider_for_capability(capability)
+        backup_provider = self._select_backup_provider(provider_url, capability)
+        
+        def request_from(url: str) -> Awaitable[Cell]:
+            return self._with_provider_slot(
+                url,
+                lambda: self._request_cell_from_provider(
+                    url, 
+                    capability, 
+                    quantum_signature,
+                    context
+                ),
+                capability
+            )
+        
+        primary = asyncio.ensure_future(request_from(provider_url))
+        in_flight = {primary: provider_url}
+        winner = None
+        
+        try:
+            if backup_provider and self.hedge_requests:
+                hedge_delay_ms = self.provider_scoreboard.hedge_delay_ms(provider_url, capability)
+                if hedge_delay_ms is None:
+                    hedge_delay_ms = self.default_hedge_delay_ms
+                
+                done, _ = await asyncio.wait({primary}, timeout=hedge_delay_ms / 1000)
+                if not done:
+                    logger.info(
+                        f"Provider {provider_url} slower than {hedge_delay_ms:.0f}ms for {capability}, "
+                        f"hedging with {backup_provider}"
+                    )
+                    hedge = asyncio.ensure_future(request_from(backup_provider))
+                    in_flight[hedge] = backup_provider
+            
+            # Wait for the first successful response
+            pending = set(in_flight)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        cell = task.result()
+                    except CellRequestError as e:
+                        logger.error(f"Failed to request cell for capability {capability} from {in_flight[task]}: {e}")
+                        continue
+                    logger.info(f"Received cell {cell.id} for capability {capability} from {in_flight[task]}")
+                    winner = task
+                    return cell
+        finally:
+            for task in in_flight:
+                if not task.done():
+                    task.cancel()
+            results = await asyncio.gather(*in_flight, return_exceptions=True)
             
+            # Both hedged requests may succeed; only the winner's cell is used
+            for task, result in zip(in_flight, results):
+                if task is winner or not isinstance(result, Cell):
+                    continue
+                logger.info(f"Releasing surplus hedged cell {result.id} from {in_flight[task]}")
+                try:
+                    await self.cell_runtime.release_cell(result)
+                except Exception as e:
+                    logger.error(f"Error releasing surplus hedged cell {result.id}: {e}")
+        
+        # Try backup provider if it was not already raced
+        if backup_provider and backup_provider not in in_flight.values():
             try:
-                cell = await self._request_specific_cell(
+                logger.info(f"Trying backup provider {backup_provider} for capability {capability}")
+                cell = await request_from(backup_provider)
+                logger.info(f"Received cell {cell.id} from backup provider {backup_provider}")
+                return cell
+            except CellRequestError as e2:
+                logger.error(f"Backup provider also failed: {e2}")
+        
+        raise CellRequestError(f"Failed to request cell for {capability} from all providers")
+    
+    async def _acquire_cell_for_spec(
+        self,
+        cell_spec: Dict[str, Any],
+        quantum_signature: str
+    ) -> Cell:
+        """
+        Acquire the cell described by a configuration spec.
+        
+        Tries the spec's provider, then the same cell type from a backup
+        provider, then any cell with the spec's capability from the backup.
+        
+        Args:
+            cell_spec: Cell specification from a stored configuration
+            quantum_signature: Quantum signature for security
+            
+        Returns:
+            Cell object
+            
+        Raises:
+            CellRequestError: If all fallback options failed
+        """
+        provider_url = cell_spec.get("provider_url") or self.provider_urls[0]
+        
+        try:
+            cell = await self._with_provider_slot(
+                provider_url,
+                lambda: self._request_specific_cell(
                     provider_url,
                     cell_spec["cell_type"],
                     cell_spec.get("version"),
                     quantum_signature,
                     cell_spec.get("parameters", {})
+                ),
+                cell_spec.get("capability")
+            )
+            logger.info(f"Received cell {cell.id} of type {cell_spec['cell_type']} from {provider_url}")
+            return cell
+        except CellRequestError as e:
+            logger.error(f"Failed to request cell: {e}")
+        
+        # Try alternative provider
+        backup_provider = self._select_backup_provider(provider_url, cell_spec.get("capability"))
+        if not backup_provider:
+            raise CellRequestError(f"Failed to request cell of type {cell_spec.get('cell_type')}")
+        
+        try:
+            return await self._with_provider_slot(
+                backup_provider,
+                lambda: self._request_specific_cell(
+                    backup_provider,
+                    cell_spec["cell_type"],
+                    cell_spec.get("version"),
+                    quantum_signature,
+                    cell_spec.get("parameters", {})
+                ),
+                cell_spec.get("capability")
+            )
+        except CellRequestError:
+            pass
+        
+        # Fall back to capability-based request
+        try:
+            return await self._with_provider_slot(
+                backup_provider,
+                lambda: self._request_cell_from_provider(
+                    backup_provider,
+                    cell_spec["capability"],
+                    quantum_signature,
+                    cell_spec.get("parameters", {})
+                ),
+                cell_spec.get("capability")
+            )
+        except CellRequestError as e3:
+            logger.error(f"All fallback options failed for cell: {e3}")
+            raise
+    
+    async def _run_acquisition(
+        self,
+        requests: List[Tuple[str, Awaitable[Cell], bool]],
+        progress: Optional[ProgressCallback] = None
+    ) -> List[Cell]:
+        """
+        Run cell requests concurrently under the assembly deadline.
+        
+        A failed optional request is logged and skipped. A failed required
+        request, the deadline expiring, or cancellation of the caller cancels
+        every request still in flight and releases the cells already acquired.
+        
+        Args:
+            requests: Tuples of (label, pending request, required flag)
+            progress: Receives a "cell_acquired" event per cell as it arrives
+            
+        Returns:
+            List of acquired cells
+            
+        Raises:
+            CellRequestError: If a required request fails or the deadline passes
+        """
+        if not requests:
+            return []
+        
+        labels = {}
+        required = {}
+        for label, request, is_required in requests:
+            task = asyncio.ensure_future(request)
+            labels[task] = label
+            required[task] = is_required
+        
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        deadline = started + self.assembly_timeout_ms / 1000
+        pending = set(labels)
+        cells = []
+        
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise CellRequestError(
+                        f"Cell acquisition exceeded deadline of {self.assembly_timeout_ms}ms "
+                        f"({len(pending)} requests outstanding)"
+                    )
+                
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
                 )
-                cells[cell.id] = cell
-                logger.info(f"Received cell {cell.id} of type {cell_spec['cell_type']} from {provider_url}")
-            except CellRequestError as e:
-                logger.error(f"Failed to request cell: {e}")
-                # Try alternative provider
-                if len(self.provider_urls) > 1:
-                    backup_provider = [p for p in self.provider_urls if p != provider_url][0]
+                
+                # Collect every finished request before acting on a failure
+                failure = None
+                for task in done:
+                    self.telemetry.record("assembler.acquire_cell", (loop.time() - started) * 1000)
                     try:
-                        cell = await self._request_specific_cell(
-                            backup_provider,
-                            cell_spec["cell_type"],
-                            cell_spec.get("version"),
-                            quantum_signature,
-                            cell_spec.get("parameters", {})
-                        )
-                        cells[cell.id] = cell
-                    except CellRequestError:
-                        # Fall back to capability-based request
-                        try:
-                            cell = await self._request_cell_from_provider(
-                                backup_provider,
-                                cell_spec["capability"],
-                                quantum_signature,
-                                cell_spec.get("parameters", {})
-                            )
-                            cells[cell.id] = cell
-                        except CellRequestError as e3:
-                            logger.error(f"All fallback options failed for cell: {e3}")
-        
-        if not cells:
-            raise CellRequestError("Failed to obtain any cells from configuration")
+                        cell = task.result()
+                        cells.append(cell)
+                        self._emit_cell_acquired(progress, cell)
+                    except CellRequestError as e:
+                        if required[task]:
+                            failure = failure or e
+                        else:
+                            logger.warning(f"Skipping optional cell {labels[task]}: {e}")
+                
+                if failure:
+                    raise failure
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
             
+            for cell in cells:
+                try:
+                    await self.cell_runtime.release_cell(cell)
+                except Exception as e:
+                    logger.error(f"Error releasing cell {cell.id} after failed acquisition: {e}")
+            raise
+        
         return cells
     
+    def _emit_cell_acquired(self, progress: Optional[ProgressCallback], cell: Cell, cached: bool = False) -> None:
+        """Report an acquired cell to a progress callback."""
+        self._emit_progress(
+            progress,
+            "cell_acquired",
+            cell_id=cell.id,
+            capability=cell.capability,
+            provider=cell.provider,
+            cached=cached
+        )
+    
+    def _emit_progress(self, progress: Optional[ProgressCallback], event: str, **details: Any) -> None:
+        """
+        Send an assembly progress event to a callback.
+        
+        Callback errors are logged and never interrupt assembly.
+        
+        Args:
+            progress: Progress callback, or None
+            event: Event name
+            **details: Event-specific fields
+        """
+        if progress is None:
+            return
+        
+        try:
+            progress({"event": event, "timestamp": datetime.now().isoformat(), **details})
+        except Exception as e:
+            logger.warning(f"Progress callback failed for {event} event: {e}")
+    
+    async def _with_provider_slot(
+        self,
+        provider_url: str,
+        request: Callable[[], Awaitable[Cell]],
+        capability: Optional[str] = None
+    ) -> Cell:
+        """
+        Run a provider request while holding one of the provider's slots.
+        
+        The request's latency and outcome are recorded on the provider
+        scoreboard. Time spent waiting for a slot is not counted. A request
+        cancelled by a faster hedge is not recorded, since its latency is
+        unknown.
+        
+        Args:
+            provider_url: URL of the cell provider
+            request: Factory producing the provider request
+            capability: Capability being requested, for per-capability stats
+            
+        Returns:
+            Result of the request
+        """
+        semaphore = self.provider_semaphores.get(provider_url)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_requests_per_provider)
+            self.provider_semaphores[provider_url] = semaphore
+        
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                with self.telemetry.span("provider.request_cell", provider=provider_url, capability=capability):
+                    result = await request()
+            except CellRequestError:
+                elapsed_ms = (time.monotonic() - started) * 1000
+                self.provider_scoreboard.record_result(provider_url, capability, elapsed_ms, error=True)
+                raise
+            
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self.provider_scoreboard.record_result(provider_url, capability, elapsed_ms)
+            return result
+    
+    def _select_backup_provider(self, provider_url: str, capability: Optional[str] = None) -> Optional[str]:
+        """
+        Select a provider to fall back to or hedge with.
+        
+        Args:
+            provider_url: Provider already in use
+            capability: Capability being requested
+            
+        Returns:
+            URL of the best-ranked other provider, or None if there is none
+        """
+        candidates = [p for p in self.provider_urls if p != provider_url]
+        if not candidates:
+            return None
+        return self.provider_scoreboard.rank(candidates, capability)[0]
+    
     async def _request_cell_from_provider(
         self, 
         provider_url: str, 
@@ -439,6 +1670,21 @@ class CellAssembler:
         
         return cell
     
+    async def _register_cell_signature(self, cell: Cell, quantum_signature: str) -> None:
+        """
+        Re-register a cell with its provider under a new quantum signature.
+        
+        Args:
+            cell: Cell requested under another signature
+            quantum_signature: Quantum signature the cell is used under
+            
+        Raises:
+            CellRequestError: If the provider rejects the new signature
+        """
+        # In a real implementation, this would ask the cell's provider to
+        # replace the signature it holds for the cell
+        cell.quantum_signature = quantum_signature
+    
     async def _request_specific_cell(
         self, 
         provider_url: str, 
@@ -488,8 +1734,9 @@ class CellAssembler:
         """
         Select the most appropriate provider for a given capability.
         
-        In a real implementation, this would consider provider reliability,
-        performance, cost, and other factors.
+        Providers are ranked by the scoreboard's expected cost, which
+        combines EWMA latency and error rate. Providers without history
+        rank first so they are explored.
         
         Args:
             capability: The required capability
@@ -497,9 +1744,7 @@ class CellAssembler:
         Returns:
             URL of the selected provider
         """
-        # Simple implementation that just returns the first provider
-        # In a real system, this would be much more sophisticated
-        return self.provider_urls[0]
+        return self.provider_scoreboard.rank(self.provider_urls, capability)[0]
     
     def _select_best_configuration(self, configurations: List[CellConfiguration]) -> CellConfiguration:
         """
@@ -543,40 +1788,22 @@ class CellAssembler:
     
     def _add_to_cache(self, cell: Cell) -> None:
         """
-        Add a cell to the cache.
+        Add a cell to the warm pool.
+        
+        Cells evicted to make room are released in the background.
         
         Args:
             cell: The cell to cache
         """
-        # Check if we already have this capability cached
-        if cell.capability in self.cell_cache:
-            # Replace if this cell is newer
-            cached_cell = self.cell_cache[cell.capability]
-            cached_created_at = datetime.fromisoformat(cached_cell["created_at"])
-            cell_created_at = datetime.fromisoformat(cell.created_at)
-            
-            if cell_created_at > cached_created_at:
-                logger.debug(f"Replacing cached cell for capability {cell.capability}")
-                self.cell_cache[cell.capability] = cell
-        else:
-            # Add new capability to cache
-            logger.debug(f"Adding cell {cell.id} to cache for capability {cell.capability}")
-            self.cell_cache[cell.capability] = cell
-            
-        # Implement cache size limiting if needed
-        if len(self.cell_cache) > 20:  # Example limit
-            # Remove oldest cell
-            oldest_capability = min(
-                self.cell_cache.keys(),
-                key=lambda cap: datetime.fromisoformat(self.cell_cache[cap].created_at)
-            )
-            logger.debug(f"Cache full, removing oldest cell for capability {oldest_capability}")
-            removed_cell = self.cell_cache.pop(oldest_capability)
-            asyncio.create_task(self.cell_runtime.release_cell(removed_cell))
+        logger.debug(f"Adding cell {cell.id} to cache for capability {cell.capability}")
+        evicted = self.cell_cache.add(cell, self._compatibility_key(cell.context))
+        if evicted:
+            logger.debug(f"Cache full, scheduling release of {len(evicted)} evicted cells")
+            self._schedule_release(evicted)
     
     def _get_from_cache(self, capability: str, context: Dict[str, Any]) -> Optional[Cell]:
         """
-        Retrieve a cell from the cache if available.
+        Take a warm cell out of the pool if a compatible one is available.
         
         Args:
             capability: Required capability
@@ -585,34 +1812,54 @@ class CellAssembler:
         Returns:
             Cached cell or None if not available
         """
-        if capability in self.cell_cache:
-            cell = self.cell_cache[capability]
-            
-            # Check if the cached cell is compatible with current context
-            if self._is_compatible_with_context(cell, context):
-                logger.debug(f"Cache hit for capability {capability}")
-                return cell
-                
-        return None
+        cell = self.cell_cache.acquire(capability, self._compatibility_key(context))
+        if cell:
+            logger.debug(f"Cache hit for capability {capability}")
+        return cell
     
-    def _is_compatible_with_context(self, cell: Cell, context: Dict[str, Any]) -> bool:
+    def _compatibility_key(self, context: Optional[Dict[str, Any]]) -> Hashable:
         """
-        Check if a cached cell is compatible with the current context.
+        Derive the context compatibility key used to bucket warm cells.
+        
+        Cells are only reused for requests whose device characteristics
+        match the ones the cell was acquired for.
         
         Args:
-            cell: Cached cell to check
-            context: Current context information
+            context: Context a cell was acquired for, or a request context
             
         Returns:
-            True if compatible, False otherwise
+            Hashable compatibility key
+        """
+        device_info = (context or {}).get("device_info") or {}
+        return (
+            device_info.get("platform"),
+            bool(device_info.get("gpu_available", False))
+        )
+    
+    def _schedule_release(self, cells: List[Cell]) -> None:
         """
-        # Example compatibility checks:
-        # - Device compatibility
-        # - Required resources availability
-        # - Version compatibility
+        Queue cells for release by the background release task.
         
-        # Simple implementation that always returns True
-        return True
+        Args:
+            cells: Cells to release
+        """
+        self._pending_releases.extend(cells)
+        if self._release_task is None or self._release_task.done():
+            self._release_task = asyncio.ensure_future(self._release_pending_cells())
+    
+    async def _release_pending_cells(self) -> None:
+        """Release queued cells in concurrent batches until the queue is empty."""
+        while self._pending_releases:
+            batch = self._pending_releases[:self.cache_release_batch_size]
+            del self._pending_releases[:self.cache_release_batch_size]
+            
+            results = await asyncio.gather(
+                *(self.cell_runtime.release_cell(cell) for cell in batch),
+                return_exceptions=True
+            )
+            for cell, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error releasing evicted cell {cell.id}: {result}")
     
     def _get_device_info(self) -> Dict[str, Any]:
         """
@@ -644,6 +1891,14 @@ class CellAssembler:
             "uptime_seconds": uptime_seconds,
             "active_solutions": len(self.active_solutions),
             "cached_cells": len(self.cell_cache),
+            "cell_cache": self.cell_cache.get_stats(),
             "total_assemblies": self.total_assemblies,
-            "total_cells_requested": self.total_cells_requested
+            "total_cells_requested": self.total_cells_requested,
+            "average_assembly_time_ms": self.average_assembly_time_ms,
+            "phase_latency": self.telemetry.get_histograms(),
+            "providers": self.provider_scoreboard.get_stats(),
+            "speculation": self.capability_patterns.get_stats(),
+            "solution_templates": self.solution_templates.get_stats(),
+            "intent_cache": self.intent_interpreter.get_cache_stats(),
+            "intent_pattern_version": self.intent_interpreter.pattern_version
         }
@@ -0,0 +1,267 @@
+"""
+Warm cell pool for the QCC Assembler.
+
+This module provides the WarmCellPool class, which keeps initialized cells
+from released solutions so later assemblies can reuse them instead of
+requesting and initializing new cells from providers.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Hashable
+
+from qcc.common.models import Cell
+
+logger = logging.getLogger(__name__)
+
+# (capability, context compatibility key)
+BucketKey = Tuple[str, Hashable]
+
+
+class WarmCellPool:
+    """
+    Bounded pool of warm cells grouped by capability and context.
+
+    Cells are stored in buckets keyed by capability and a context
+    compatibility key, so a lookup is a single dictionary access. Each
+    bucket holds several cells, and the pool as a whole is bounded by cell
+    count and by estimated memory.
+
+    Eviction policies:
+    - ``lru``: evict the cell that has been pooled the longest
+    - ``lfu``: evict the oldest cell of the least frequently hit bucket
+
+    Hit counts of emptied buckets are kept for the ``max_cells`` most
+    recently emptied ones, so a bucket refilled soon keeps its frequency.
+
+    Attributes:
+        max_memory_mb (float): Memory budget for pooled cells
+        max_cells (int): Maximum number of pooled cells
+        max_cells_per_bucket (int): Maximum cells per capability/context bucket
+        eviction_policy (str): Either ``lru`` or ``lfu``
+        default_cell_memory_mb (float): Estimate for cells without usage data
+    """
+
+    def __init__(
+        self,
+        max_memory_mb: float = 512,
+        max_cells: int = 100,
+        max_cells_per_bucket: int = 4,
+        eviction_policy: str = "lru",
+        default_cell_memory_mb: float = 10
+    ):
+        """
+        Initialize the warm cell pool.
+
+        Args:
+            max_memory_mb: Memory budget for pooled cells
+            max_cells: Maximum number of pooled cells
+            max_cells_per_bucket: Maximum cells per capability/context bucket
+            eviction_policy: Either "lru" or "lfu"
+            default_cell_memory_mb: Estimate for cells without usage data
+
+        Raises:
+            ValueError: If the eviction policy is unknown
+        """
+        if eviction_policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
+        self.max_memory_mb = max_memory_mb
+        self.max_cells = max_cells
+        self.max_cells_per_bucket = max_cells_per_bucket
+        self.eviction_policy = eviction_policy
+        self.default_cell_memory_mb = default_cell_memory_mb
+
+        # bucket key -> OrderedDict(cell_id -> cell), oldest first
+        self._buckets: Dict[BucketKey, "OrderedDict[str, Cell]"] = {}
+
+        # cell_id -> (bucket key, memory estimate)
+        self._entries: Dict[str, Tuple[BucketKey, float]] = {}
+
+        # LRU order of all pooled cells, oldest first
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+
+        # LFU bookkeeping: hits per non-empty bucket, hits of recently
+        # emptied buckets (oldest first) and non-empty buckets by hit count
+        self._bucket_hits: Dict[BucketKey, int] = {}
+        self._idle_hits: "OrderedDict[BucketKey, int]" = OrderedDict()
+        self._freq_buckets: Dict[int, "OrderedDict[BucketKey, None]"] = {}
+        self._min_freq: Optional[int] = None
+
+        self.memory_mb = 0.0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "additions": 0,
+            "evictions": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, cell_id: str) -> bool:
+        return cell_id in self._entries
+
+    def add(self, cell: Cell, compatibility_key: Hashable = None) -> List[Cell]:
+        """
+        Add a cell to the pool.
+
+        Args:
+            cell: Initialized cell to keep warm
+            compatibility_key: Context compatibility key of the cell
+
+        Returns:
+            Cells evicted to make room, which the caller must release
+        """
+        if cell.id in self._entries:
+            return []
+
+        key = (cell.capability, compatibility_key)
+        memory_mb = self._estimate_memory(cell)
+        evicted = []
+
+        # Keep the bucket within its own limit by dropping its oldest cell
+        bucket = self._buckets.get(key)
+        if bucket is not None and len(bucket) >= self.max_cells_per_bucket:
+            oldest_id = next(iter(bucket))
+            evicted.append(self._remove(oldest_id))
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = OrderedDict()
+            self._buckets[key] = bucket
+            self._lfu_insert(key)
+        bucket[cell.id] = cell
+        self._entries[cell.id] = (key, memory_mb)
+        self._lru[cell.id] = None
+        self.memory_mb += memory_mb
+        self.stats["additions"] += 1
+
+        # Enforce pool-wide limits
+        while self._entries and (len(self._entries) > self.max_cells or self.memory_mb > self.max_memory_mb):
+            victim_id = self._select_victim()
+            evicted.append(self._remove(victim_id))
+
+        self.stats["evictions"] += len(evicted)
+        for evicted_cell in evicted:
+            logger.debug(f"Evicted cell {evicted_cell.id} for capability {evicted_cell.capability} from warm pool")
+
+        return evicted
+
+    def acquire(self, capability: str, compatibility_key: Hashable = None) -> Optional[Cell]:
+        """
+        Take the most recently pooled compatible cell out of the pool.
+
+        Args:
+            capability: Required capability
+            compatibility_key: Context compatibility key of the request
+
+        Returns:
+            Warm cell, or None if the bucket is empty
+        """
+        key = (capability, compatibility_key)
+        bucket = self._buckets.get(key)
+        if not bucket:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self._lfu_touch(key)
+
+        cell_id = next(reversed(bucket))
+        return self._remove(cell_id)
+
+    def available(self, capability: str, compatibility_key: Hashable = None) -> int:
+        """
+        Count warm cells available for a capability without taking one.
+
+        Args:
+            capability: Required capability
+            compatibility_key: Context compatibility key of the request
+
+        Returns:
+            Number of pooled cells in the matching bucket
+        """
+        return len(self._buckets.get((capability, compatibility_key), ()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with pool size, memory and hit statistics
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "buckets": len(self._buckets),
+            "memory_mb": self.memory_mb,
+            "max_memory_mb": self.max_memory_mb,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "eviction_policy": self.eviction_policy
+        }
+
+    def _estimate_memory(self, cell: Cell) -> float:
+        """Estimate the memory footprint of a cell in MB."""
+        resource_usage = getattr(cell, "resource_usage", None) or {}
+        return float(resource_usage.get("memory_mb", self.default_cell_memory_mb))
+
+    def _select_victim(self) -> str:
+        """Select the cell to evict according to the eviction policy."""
+        if self.eviction_policy == "lfu" and self._min_freq is not None:
+            key = next(iter(self._freq_buckets[self._min_freq]))
+            return next(iter(self._buckets[key]))
+        return next(iter(self._lru))
+
+    def _remove(self, cell_id: str) -> Cell:
+        """Remove a pooled cell from all indexes."""
+        key, memory_mb = self._entries.pop(cell_id)
+        bucket = self._buckets[key]
+        cell = bucket.pop(cell_id)
+        self._lru.pop(cell_id, None)
+        self.memory_mb -= memory_mb
+
+        if not bucket:
+            del self._buckets[key]
+            self._lfu_discard(key)
+
+        return cell
+
+    def _lfu_insert(self, key: BucketKey) -> None:
+        """Track a bucket that just became non-empty."""
+        freq = self._idle_hits.pop(key, 0)
+        self._bucket_hits[key] = freq
+        self._freq_buckets.setdefault(freq, OrderedDict())[key] = None
+        if self._min_freq is None or freq < self._min_freq:
+            self._min_freq = freq
+
+    def _lfu_touch(self, key: BucketKey) -> None:
+        """Record a hit on a non-empty bucket."""
+        freq = self._bucket_hits.get(key, 0)
+        self._bucket_hits[key] = freq + 1
+
+        level = self._freq_buckets[freq]
+        del level[key]
+        if not level:
+            del self._freq_buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq_buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _lfu_discard(self, key: BucketKey) -> None:
+        """Stop tracking a bucket that just became empty."""
+        freq = self._bucket_hits.pop(key, 0)
+        self._idle_hits[key] = freq
+        while len(self._idle_hits) > self.max_cells:
+            self._idle_hits.popitem(last=False)
+
+        level = self._freq_buckets.get(freq)
+        if level is None or key not in level:
+            return
+
+        del level[key]
+        if not level:
+            del self._freq_buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = min(self._freq_buckets) if self._freq_buckets else None
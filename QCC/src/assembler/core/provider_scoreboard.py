@@ -0,0 +1,234 @@
+"""
+Provider scoreboard for the QCC Assembler.
+
+This module tracks the observed latency and reliability of cell providers
+so the assembler can route requests to the fastest healthy provider and
+decide when a slow request is worth hedging.
+"""
+
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderStats:
+    """
+    Latency and error statistics for one provider (optionally per capability).
+
+    Attributes:
+        ewma_latency_ms (Optional[float]): Exponentially weighted latency
+        ewma_error_rate (float): Exponentially weighted error rate (0-1)
+        requests (int): Number of recorded requests
+        errors (int): Number of recorded failures
+        recent_latencies (deque): Latest latency samples used for percentiles
+    """
+
+    def __init__(self, window_size: int = 100):
+        """
+        Initialize empty provider statistics.
+
+        Args:
+            window_size: Number of recent latency samples to keep
+        """
+        self.ewma_latency_ms = None
+        self.ewma_error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.recent_latencies = deque(maxlen=window_size)
+
+    def record(self, latency_ms: float, error: bool, alpha: float) -> None:
+        """
+        Record the outcome of a request.
+
+        Args:
+            latency_ms: Observed latency in milliseconds
+            error: Whether the request failed
+            alpha: EWMA smoothing factor
+        """
+        self.requests += 1
+        if error:
+            self.errors += 1
+
+        self.ewma_error_rate = alpha * (1.0 if error else 0.0) + (1 - alpha) * self.ewma_error_rate
+
+        # Failures often return early, so only successful latencies are tracked
+        if not error:
+            if self.ewma_latency_ms is None:
+                self.ewma_latency_ms = latency_ms
+            else:
+                self.ewma_latency_ms = alpha * latency_ms + (1 - alpha) * self.ewma_latency_ms
+            self.recent_latencies.append(latency_ms)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile over the recent window.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in milliseconds, or None if there are no samples
+        """
+        if not self.recent_latencies:
+            return None
+
+        ordered = sorted(self.recent_latencies)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "ewma_latency_ms": self.ewma_latency_ms,
+            "ewma_error_rate": self.ewma_error_rate,
+            "p95_latency_ms": self.percentile(95),
+            "requests": self.requests,
+            "errors": self.errors
+        }
+
+
+class ProviderScoreboard:
+    """
+    Tracks provider performance per provider and per capability.
+
+    Providers are ranked by expected cost: EWMA latency inflated by the EWMA
+    error rate. Capability-specific statistics are preferred once they have
+    enough samples; otherwise the provider-wide statistics are used.
+    Providers with no history are ranked first so they get explored.
+
+    Attributes:
+        alpha (float): EWMA smoothing factor
+        error_penalty (float): Cost multiplier applied per unit of error rate
+        min_samples (int): Samples required before per-capability stats are trusted
+        window_size (int): Latency samples kept for percentile estimates
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        error_penalty: float = 10.0,
+        min_samples: int = 5,
+        window_size: int = 100
+    ):
+        """
+        Initialize the provider scoreboard.
+
+        Args:
+            alpha: EWMA smoothing factor (higher reacts faster)
+            error_penalty: Cost multiplier applied per unit of error rate
+            min_samples: Samples required before per-capability stats are trusted
+            window_size: Latency samples kept for percentile estimates
+        """
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.min_samples = min_samples
+        self.window_size = window_size
+
+        # (provider_url, capability or None) -> ProviderStats
+        self._stats: Dict[Tuple[str, Optional[str]], ProviderStats] = {}
+
+    def record_result(
+        self,
+        provider_url: str,
+        capability: Optional[str],
+        latency_ms: float,
+        error: bool = False
+    ) -> None:
+        """
+        Record the outcome of a provider request.
+
+        Args:
+            provider_url: Provider that served the request
+            capability: Capability requested, if known
+            latency_ms: Observed latency in milliseconds
+            error: Whether the request failed
+        """
+        self._get_stats(provider_url, None).record(latency_ms, error, self.alpha)
+        if capability:
+            self._get_stats(provider_url, capability).record(latency_ms, error, self.alpha)
+
+    def rank(self, provider_urls: List[str], capability: Optional[str] = None) -> List[str]:
+        """
+        Order providers from best to worst for a capability.
+
+        Args:
+            provider_urls: Candidate providers
+            capability: Capability being requested
+
+        Returns:
+            Providers sorted by expected cost (ties keep the given order)
+        """
+        return sorted(provider_urls, key=lambda url: self.expected_cost(url, capability))
+
+    def expected_cost(self, provider_url: str, capability: Optional[str] = None) -> float:
+        """
+        Estimate the cost of sending a request to a provider.
+
+        Args:
+            provider_url: Provider to score
+            capability: Capability being requested
+
+        Returns:
+            Expected cost (lower is better); 0 for providers with no history
+        """
+        stats = self._effective_stats(provider_url, capability)
+        if stats is None:
+            return 0.0
+
+        latency_ms = stats.ewma_latency_ms
+        if latency_ms is None:
+            # Only failures so far
+            return float("inf") if stats.ewma_error_rate >= 1.0 else self.error_penalty * 1000
+
+        return latency_ms * (1 + self.error_penalty * stats.ewma_error_rate)
+
+    def hedge_delay_ms(self, provider_url: str, capability: Optional[str] = None) -> Optional[float]:
+        """
+        Get how long to wait on a provider before hedging to another one.
+
+        Args:
+            provider_url: Provider handling the primary request
+            capability: Capability being requested
+
+        Returns:
+            The provider's p95 latency, or None without enough history
+        """
+        stats = self._effective_stats(provider_url, capability)
+        if stats is None or len(stats.recent_latencies) < self.min_samples:
+            return None
+        return stats.percentile(95)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get provider-wide and per-capability statistics.
+
+        Returns:
+            Dictionary keyed by provider URL
+        """
+        result = {}
+        for (provider_url, capability), stats in self._stats.items():
+            entry = result.setdefault(provider_url, {"capabilities": {}})
+            if capability is None:
+                entry.update(stats.to_dict())
+            else:
+                entry["capabilities"][capability] = stats.to_dict()
+        return result
+
+    def _get_stats(self, provider_url: str, capability: Optional[str]) -> ProviderStats:
+        """Get or create the statistics entry for a provider/capability pair."""
+        key = (provider_url, capability)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = ProviderStats(self.window_size)
+            self._stats[key] = stats
+        return stats
+
+    def _effective_stats(self, provider_url: str, capability: Optional[str]) -> Optional[ProviderStats]:
+        """Get capability stats if trustworthy, else provider-wide stats."""
+        if capability:
+            stats = self._stats.get((provider_url, capability))
+            if stats is not None and stats.requests >= self.min_samples:
+                return stats
+        return self._stats.get((provider_url, None))
@@ -0,0 +1,143 @@
+"""
+Speculative assembly support for the QCC Assembler.
+
+This module provides the CapabilityPatternTracker class, which learns which
+capability sets are requested together so the assembler can start
+acquiring cells before intent analysis has finished.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+
+class CapabilityPatternTracker:
+    """
+    Tracks co-occurring capability sets and speculation outcomes.
+
+    Each completed assembly contributes its capability set. The most
+    frequent sets are used to predict which cells the next assembly is
+    likely to need. The tracker also counts how many speculatively
+    acquired cells were used (hits) or discarded (waste).
+
+    Attributes:
+        max_patterns (int): Maximum number of capability sets remembered
+        stats (Dict[str, int]): Speculation counters
+    """
+
+    def __init__(self, max_patterns: int = 200):
+        """
+        Initialize the pattern tracker.
+
+        Args:
+            max_patterns: Maximum number of capability sets remembered
+        """
+        self.max_patterns = max_patterns
+
+        # capability set -> observation count, least recently observed first
+        self._patterns: "OrderedDict[FrozenSet[str], int]" = OrderedDict()
+
+        self.stats = {
+            "speculations": 0,
+            "prefetched": 0,
+            "hits": 0,
+            "wasted": 0
+        }
+
+    def observe(self, capabilities: Iterable[str], weight: int = 1) -> None:
+        """
+        Record that a set of capabilities was used together.
+
+        Args:
+            capabilities: Capabilities of an assembled solution
+            weight: Number of observations to record
+        """
+        key = frozenset(capabilities)
+        if not key:
+            return
+
+        self._patterns[key] = self._patterns.pop(key, 0) + weight
+        while len(self._patterns) > self.max_patterns:
+            self._patterns.popitem(last=False)
+
+    def load_configurations(self, configurations: Iterable[Any]) -> None:
+        """
+        Seed patterns from quantum trail configurations.
+
+        Args:
+            configurations: CellConfiguration objects or their dictionaries
+        """
+        for configuration in configurations:
+            if isinstance(configuration, dict):
+                cell_specs = configuration.get("cell_specs", [])
+                use_count = configuration.get("use_count", 1)
+            else:
+                cell_specs = getattr(configuration, "cell_specs", [])
+                use_count = getattr(configuration, "use_count", 1)
+
+            capabilities = [spec.get("capability") for spec in cell_specs if spec.get("capability")]
+            self.observe(capabilities, max(1, use_count))
+
+    def predict(self, top_k: int = 2, max_capabilities: int = 6) -> List[str]:
+        """
+        Predict the capabilities the next assembly is likely to need.
+
+        Args:
+            top_k: Number of most frequent capability sets to combine
+            max_capabilities: Maximum number of capabilities to return
+
+        Returns:
+            Capabilities ordered by how often they were observed
+        """
+        if not self._patterns or top_k <= 0:
+            return []
+
+        top_sets = sorted(self._patterns.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+        weights: Dict[str, int] = {}
+        for capability_set, count in top_sets:
+            for capability in capability_set:
+                weights[capability] = weights.get(capability, 0) + count
+
+        ranked = sorted(weights, key=lambda capability: (-weights[capability], capability))
+        return ranked[:max_capabilities]
+
+    def record_speculation(self, prefetched: int) -> None:
+        """
+        Record the start of a speculative acquisition.
+
+        Args:
+            prefetched: Number of cells requested speculatively
+        """
+        self.stats["speculations"] += 1
+        self.stats["prefetched"] += prefetched
+
+    def record_hit(self) -> None:
+        """Record that a speculatively acquired cell was used."""
+        self.stats["hits"] += 1
+
+    def record_waste(self, count: int = 1) -> None:
+        """
+        Record speculatively requested cells that were not used.
+
+        Args:
+            count: Number of unused cells
+        """
+        self.stats["wasted"] += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get speculation metrics.
+
+        Returns:
+            Dictionary with counters, hit rate and waste rate
+        """
+        prefetched = self.stats["prefetched"]
+        return {
+            **self.stats,
+            "patterns": len(self._patterns),
+            "hit_rate": self.stats["hits"] / prefetched if prefetched else 0.0,
+            "waste_rate": self.stats["wasted"] / prefetched if prefetched else 0.0
+        }
@@ -0,0 +1,152 @@
+"""
+Solution template cache for the QCC Assembler.
+
+This module provides the SolutionTemplateCache class, which remembers how
+a normalized request was resolved (capabilities, connections and the chosen
+quantum trail configuration) so repeated requests can skip straight to
+cell acquisition.
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class SolutionTemplateCache:
+    """
+    LRU cache of resolved solution templates with a time-to-live.
+
+    A template is a dictionary holding the intent analysis, the resolved
+    capability list, the connection map and the selected cell
+    configuration (or None) for one normalized request and context
+    fingerprint.
+
+    Attributes:
+        max_size (int): Maximum number of templates
+        ttl_seconds (float): Time-to-live for each template
+        stats (Dict[str, int]): Cache counters
+    """
+
+    def __init__(self, max_size: int = 500, ttl_seconds: float = 300):
+        """
+        Initialize the template cache.
+
+        Args:
+            max_size: Maximum number of templates
+            ttl_seconds: Time-to-live for each template in seconds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        # key -> template, least recently used first
+        self.cache: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.expiry_times: Dict[Hashable, float] = {}
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0
+        }
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a template.
+
+        Args:
+            key: Template key
+
+        Returns:
+            The template, or None if missing or expired
+        """
+        if key not in self.cache:
+            self.stats["misses"] += 1
+            return None
+
+        if time.time() > self.expiry_times.get(key, 0):
+            self.cache.pop(key)
+            self.expiry_times.pop(key, None)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self.cache.move_to_end(key)
+        self.stats["hits"] += 1
+        return self.cache[key]
+
+    def put(self, key: Hashable, template: Dict[str, Any]) -> None:
+        """
+        Store a template.
+
+        Args:
+            key: Template key
+            template: Resolved template
+        """
+        if key not in self.cache and len(self.cache) >= self.max_size:
+            oldest_key, _ = self.cache.popitem(last=False)
+            self.expiry_times.pop(oldest_key, None)
+            self.stats["evictions"] += 1
+
+        self.cache[key] = template
+        self.cache.move_to_end(key)
+        self.expiry_times[key] = time.time() + self.ttl_seconds
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Remove a template.
+
+        Args:
+            key: Template key
+
+        Returns:
+            True if a template was removed
+        """
+        if self.cache.pop(key, None) is None:
+            return False
+
+        self.expiry_times.pop(key, None)
+        self.stats["invalidations"] += 1
+        return True
+
+    def invalidate_capabilities(self, capabilities: Iterable[str], keep: Optional[Hashable] = None) -> int:
+        """
+        Remove every template that uses any of the given capabilities.
+
+        Args:
+            capabilities: Capabilities whose templates are stale
+            keep: Key of a template to leave in place
+
+        Returns:
+            Number of templates removed
+        """
+        stale = set(capabilities)
+        keys = [
+            key for key, template in self.cache.items()
+            if key != keep and stale.intersection(template.get("required_capabilities", []))
+        ]
+        for key in keys:
+            self.invalidate(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all templates."""
+        self.cache.clear()
+        self.expiry_times.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, counters and hit rate
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self.cache),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
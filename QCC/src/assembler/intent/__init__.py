@@ -6,13 +6,25 @@ and determining the required capabilities and configuration.
 """
 
 from .interpreter import IntentInterpreter
-from .models import IntentAnalysis, RequiredCapability
-from .patterns import intentPatterns, capabilityMapping
+from .models import IntentAnalysis, RequiredCapability, FrozenDict, freeze, thaw
+from .patterns import intentPatterns, capabilityMapping, abbreviationMapping, connectionRules
+from .matcher import IntentMatcher, AbbreviationExpander, ConnectionIndex
+from .registry import PatternRegistry, PatternSnapshot
 
 __all__ = [
     'IntentInterpreter',
     'IntentAnalysis',
     'RequiredCapability',
+    'FrozenDict',
+    'freeze',
+    'thaw',
     'intentPatterns',
-    'capabilityMapping'
+    'capabilityMapping',
+    'abbreviationMapping',
+    'connectionRules',
+    'IntentMatcher',
+    'AbbreviationExpander',
+    'ConnectionIndex',
+    'PatternRegistry',
+    'PatternSnapshot'
 ]
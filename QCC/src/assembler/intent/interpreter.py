@@ -8,14 +8,54 @@ user requests to determine required capabilities and configurations.
 import re
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Set, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Set, Tuple, Hashable
 from datetime import datetime
 
-from .models import IntentAnalysis, RequiredCapability
-from .patterns import intentPatterns, capabilityMapping
+from qcc.common.telemetry import telemetry
+
+from .models import IntentAnalysis, RequiredCapability, FrozenDict, freeze
+from .matcher import IntentMatcher, AbbreviationExpander, ConnectionIndex
+from .registry import PatternRegistry, PatternSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Interpreter used by process pool workers, rebuilt when the pattern version changes
+_worker_interpreter = None
+
+
+def _analyze_chunk(
+    items: List[Tuple[str, str, Dict[str, Any]]],
+    approximate: bool,
+    tables: Dict[str, Dict[str, Any]],
+    pattern_version: int
+) -> List[Dict[str, Any]]:
+    """
+    Analyze normalized requests in a process pool worker.
+    
+    Args:
+        items: Tuples of (user request, normalized request, context)
+        approximate: Whether to use keyword-only matching
+        tables: Raw pattern tables of the caller's snapshot
+        pattern_version: Version of the caller's snapshot
+        
+    Returns:
+        Intent analyses in the same order as the items
+    """
+    global _worker_interpreter
+    if _worker_interpreter is None or _worker_interpreter.pattern_version != pattern_version:
+        _worker_interpreter = IntentInterpreter(
+            cache_size=0,
+            registry=PatternRegistry.from_tables(tables, pattern_version)
+        )
+    
+    snapshot = _worker_interpreter.registry.snapshot
+    return [
+        _worker_interpreter._build_analysis(user_request, normalized_request, context, snapshot, approximate)
+        for user_request, normalized_request, context in items
+    ]
+
 class IntentInterpreter:
     """
     Interprets user intent to determine required capabilities.
@@ -24,42 +64,235 @@ class IntentInterpreter:
     and translates them into specific capability requirements and
     configuration parameters.
     
+    Pattern tables come from a PatternRegistry. Each analysis uses the
+    registry snapshot current when it starts and is tagged with that
+    snapshot's ``pattern_version``; memoized analyses are keyed by version,
+    so a reload never serves results computed from older patterns.
+    
     Attributes:
-        pattern_cache (Dict[str, re.Pattern]): Compiled regex patterns
+        registry (PatternRegistry): Source of compiled pattern snapshots
+        cache_size (int): Maximum number of memoized analyses (0 disables)
     """
     
-    def __init__(self):
-        """Initialize the intent interpreter."""
-        self.pattern_cache = {}
-        for pattern_name, pattern_str in intentPatterns.items():
-            self.pattern_cache[pattern_name] = re.compile(pattern_str, re.IGNORECASE)
+    # Words suggesting a visual answer when no pattern matched
+    _VISUAL_WORDS = re.compile(r'\b(show|display|visual|graph|chart|picture|image)\b')
+    
+    def __init__(self, cache_size: int = 1024, registry: Optional[PatternRegistry] = None):
+        """
+        Initialize the intent interpreter.
+        
+        Args:
+            cache_size: Maximum number of memoized analyses (0 disables)
+            registry: Pattern registry (defaults to one over the patterns module)
+        """
+        self.registry = registry or PatternRegistry()
+        
+        # (normalized request, device fingerprint, context used, pattern version) -> frozen analysis
+        self.cache_size = cache_size
+        self._analysis_cache: "OrderedDict[Hashable, FrozenDict]" = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
         
         logger.info("Intent interpreter initialized with %d patterns", len(self.pattern_cache))
+    
+    @property
+    def pattern_version(self) -> int:
+        """Version of the pattern snapshot new analyses use."""
+        return self.registry.snapshot.version
+    
+    @property
+    def pattern_cache(self) -> Dict[str, re.Pattern]:
+        """Compiled regex patterns of the current snapshot."""
+        return self.registry.snapshot.matcher.patterns
+    
+    @property
+    def matcher(self) -> IntentMatcher:
+        """Keyword-gated matcher of the current snapshot."""
+        return self.registry.snapshot.matcher
+    
+    @property
+    def abbreviations(self) -> AbbreviationExpander:
+        """Abbreviation expander of the current snapshot."""
+        return self.registry.snapshot.abbreviations
+    
+    @property
+    def capability_mapping(self) -> Dict[str, Any]:
+        """Capabilities by pattern of the current snapshot."""
+        return self.registry.snapshot.capability_mapping
+    
+    @property
+    def connection_index(self) -> ConnectionIndex:
+        """Connection suggestions of the current snapshot."""
+        return self.registry.snapshot.connection_index
+    
+    def reload_patterns(self) -> PatternSnapshot:
+        """
+        Reload the pattern tables from the registry source and recompile.
+        
+        Analyses memoized for older versions are no longer served and age
+        out of the cache.
+        
+        Returns:
+            The new pattern snapshot
+        """
+        return self.registry.reload()
         
     async def analyze(self, user_request: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Analyze a user request to determine required capabilities.
         
+        Results are memoized by normalized request and device fingerprint.
+        The returned analysis is read-only and may be shared with other
+        callers; use ``copy.deepcopy`` to get a mutable copy.
+        
         Args:
             user_request: Natural language request from the user
             context: Additional context information
             
         Returns:
-            Dictionary containing intent analysis results
+            Read-only dictionary containing intent analysis results
         """
         logger.info("Analyzing intent: %s", user_request)
         
         # Initialize context if not provided
         context = context or {}
         
+        # One snapshot serves the whole analysis, even if a reload swaps it meanwhile
+        snapshot = self.registry.snapshot
+        
         # Normalize request text
-        normalized_request = self._normalize_text(user_request)
+        with telemetry.span("intent.normalize"):
+            normalized_request = self._normalize_text(user_request, snapshot)
+        
+        cache_key = self._cache_key(normalized_request, context, snapshot)
+        cached = self._cache_lookup(cache_key, user_request)
+        if cached is not None:
+            return cached
+        
+        intent_analysis = freeze(self._build_analysis(user_request, normalized_request, context, snapshot))
+        self._cache_store(cache_key, intent_analysis)
+        return intent_analysis
+    
+    async def analyze_batch(
+        self,
+        requests: List[str],
+        contexts: Optional[List[Optional[Dict[str, Any]]]] = None,
+        approximate: bool = False,
+        use_processes: bool = False,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze many requests at once.
+        
+        Requests are normalized in one pass and deduplicated by cache key,
+        so each distinct request and device fingerprint is analyzed once and
+        cached results are reused. Results are read-only, as with analyze().
+        
+        Args:
+            requests: Natural language requests
+            contexts: Context per request (same length as requests), or None
+            approximate: Classify by keyword co-occurrence only, skipping
+                the regular expressions; results are not cached
+            use_processes: Analyze distinct requests in a process pool;
+                contexts must then be picklable
+            max_workers: Process pool size (defaults to the CPU count)
+            chunk_size: Requests sent to a worker at a time
+            
+        Returns:
+            Intent analyses in the same order as the requests
+            
+        Raises:
+            ValueError: If contexts and requests differ in length
+        """
+        if contexts is not None and len(contexts) != len(requests):
+            raise ValueError("contexts must have one entry per request")
         
+        logger.info("Analyzing batch of %d intents", len(requests))
+        contexts = [context or {} for context in (contexts or [None] * len(requests))]
+        
+        snapshot = self.registry.snapshot
+        with telemetry.span("intent.normalize_batch", size=len(requests)):
+            normalized_requests = [self._normalize_text(user_request, snapshot) for user_request in requests]
+        
+        # One analysis per distinct cache key
+        keys = []
+        computed = {}
+        pending = {}
+        for user_request, normalized_request, context in zip(requests, normalized_requests, contexts):
+            key = self._cache_key(normalized_request, context, snapshot)
+            keys.append(key)
+            if key in pending or key in computed:
+                continue
+            if not approximate and key in self._analysis_cache:
+                computed[key] = self._cache_lookup(key, user_request)
+                continue
+            pending[key] = (user_request, normalized_request, context)
+        
+        with telemetry.span("intent.match_batch", size=len(pending)):
+            items = list(pending.values())
+            if use_processes and len(items) > chunk_size:
+                chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+                loop = asyncio.get_event_loop()
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    chunk_results = await asyncio.gather(*(
+                        loop.run_in_executor(
+                            executor, _analyze_chunk, chunk, approximate, snapshot.tables, snapshot.version
+                        )
+                        for chunk in chunks
+                    ))
+                analyses = [analysis for chunk in chunk_results for analysis in chunk]
+            else:
+                analyses = [
+                    self._build_analysis(user_request, normalized_request, context, snapshot, approximate)
+                    for user_request, normalized_request, context in items
+                ]
+        
+        for key, analysis in zip(pending, analyses):
+            computed[key] = freeze(analysis)
+            if not approximate:
+                self.cache_stats["misses"] += 1
+                self._cache_store(key, computed[key])
+        
+        results = []
+        for user_request, key in zip(requests, keys):
+            analysis = computed[key]
+            if analysis["original_request"] == user_request:
+                results.append(analysis)
+            else:
+                results.append(FrozenDict({**analysis, "original_request": user_request}))
+        
+        return results
+    
+    def _build_analysis(
+        self,
+        user_request: str,
+        normalized_request: str,
+        context: Dict[str, Any],
+        snapshot: PatternSnapshot,
+        approximate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the intent analysis of a normalized request.
+        
+        Args:
+            user_request: Natural language request from the user
+            normalized_request: Normalized request text
+            context: Additional context information
+            snapshot: Pattern snapshot to analyze with
+            approximate: Whether to use keyword-only matching
+            
+        Returns:
+            Dictionary containing intent analysis results
+        """
         # Identify capability requirements
-        required_capabilities = self._identify_capabilities(normalized_request, context)
+        with telemetry.span("intent.match_patterns"):
+            required_capabilities = self._identify_capabilities(
+                normalized_request, context, approximate, snapshot
+            )
         
         # Identify connections between capabilities
-        suggested_connections = self._identify_connections(required_capabilities)
+        with telemetry.span("intent.identify_connections"):
+            suggested_connections = self._identify_connections(required_capabilities, snapshot)
         
         # Create intent analysis result
         intent_analysis = {
@@ -71,49 +304,129 @@ class IntentInterpreter:
             "analyzed_at": datetime.now().isoformat(),
             "context_used": bool(context),
             "confidence_score": self._calculate_confidence(required_capabilities),
+            "pattern_version": snapshot.version,
             "use_previous_configurations": True  # Default to using previous configurations
         }
         
         logger.debug("Intent analysis complete: %s", intent_analysis["required_capabilities"])
         return intent_analysis
     
-    def _normalize_text(self, text: str) -> str:
+    def _cache_key(self, normalized_request: str, context: Dict[str, Any], snapshot: PatternSnapshot) -> Hashable:
+        """Build the analysis cache key of a normalized request."""
+        return (normalized_request, self._device_fingerprint(context), bool(context), snapshot.version)
+    
+    def _cache_lookup(self, cache_key: Hashable, user_request: str) -> Optional[FrozenDict]:
+        """
+        Get a memoized analysis for a request.
+        
+        Args:
+            cache_key: Analysis cache key
+            user_request: Raw request text, reported as ``original_request``
+            
+        Returns:
+            The cached analysis, or None on a miss
+        """
+        cached = self._analysis_cache.get(cache_key)
+        if cached is None:
+            self.cache_stats["misses"] += 1
+            return None
+        
+        self._analysis_cache.move_to_end(cache_key)
+        self.cache_stats["hits"] += 1
+        if cached["original_request"] == user_request:
+            return cached
+        return FrozenDict({**cached, "original_request": user_request})
+    
+    def _cache_store(self, cache_key: Hashable, intent_analysis: FrozenDict) -> None:
+        """Memoize an analysis, evicting the least recently used one if full."""
+        if self.cache_size <= 0:
+            return
+        
+        self._analysis_cache[cache_key] = intent_analysis
+        self._analysis_cache.move_to_end(cache_key)
+        if len(self._analysis_cache) > self.cache_size:
+            self._analysis_cache.popitem(last=False)
+            self.cache_stats["evictions"] += 1
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get analysis cache statistics.
+        
+        Returns:
+            Dictionary with size, counters and hit rate
+        """
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {
+            **self.cache_stats,
+            "size": len(self._analysis_cache),
+            "max_size": self.cache_size,
+            "hit_rate": self.cache_stats["hits"] / lookups if lookups else 0.0
+        }
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized analyses and connection suggestions."""
+        self._analysis_cache.clear()
+        self.connection_index.clear_cache()
+    
+    def _device_fingerprint(self, context: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """
+        Reduce device information to the fields that change an analysis.
+        
+        Args:
+            context: Request context
+            
+        Returns:
+            Tuple of platform, memory class and GPU availability, or None
+            if the context has no device information
+        """
+        device_info = context.get("device_info")
+        if device_info is None:
+            return None
+        
+        memory_gb = device_info.get("memory_gb", 4)
+        memory_class = "low" if memory_gb < 2 else "medium" if memory_gb < 8 else "high"
+        return (device_info.get("platform"), memory_class, bool(device_info.get("gpu_available")))
+    
+    def normalize_request(self, user_request: str) -> str:
+        """
+        Normalize a request the same way analyze() does.
+        
+        Callers can use the result to recognize repeated requests without
+        running a full analysis.
+        
+        Args:
+            user_request: Natural language request from the user
+            
+        Returns:
+            Normalized request text
+        """
+        return self._normalize_text(user_request)
+    
+    def _normalize_text(self, text: str, snapshot: Optional[PatternSnapshot] = None) -> str:
         """
         Normalize text for analysis.
         
         Args:
             text: Raw text input
+            snapshot: Pattern snapshot (defaults to the current one)
             
         Returns:
             Normalized text
         """
-        # Convert to lowercase
-        normalized = text.lower()
+        snapshot = snapshot or self.registry.snapshot
         
-        # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        # Convert to lowercase and collapse whitespace
+        normalized = ' '.join(text.lower().split())
         
         # Expand common abbreviations
-        abbreviations = {
-            'doc': 'document',
-            'pic': 'picture',
-            'calc': 'calculator',
-            'app': 'application',
-            'info': 'information',
-            'stats': 'statistics',
-            'ui': 'user interface',
-            'db': 'database'
-        }
-        
-        for abbr, expansion in abbreviations.items():
-            normalized = re.sub(r'\b' + abbr + r'\b', expansion, normalized)
-        
-        return normalized
+        return snapshot.abbreviations.expand(normalized)
     
     def _identify_capabilities(
         self, 
         normalized_request: str,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        approximate: bool = False,
+        snapshot: Optional[PatternSnapshot] = None
     ) -> List[RequiredCapability]:
         """
         Identify required capabilities from the normalized request.
@@ -121,35 +434,45 @@ class IntentInterpreter:
         Args:
             normalized_request: Normalized user request
             context: Additional context information
+            approximate: Match patterns by keyword co-occurrence only
+            snapshot: Pattern snapshot (defaults to the current one)
             
         Returns:
             List of required capabilities
         """
+        snapshot = snapshot or self.registry.snapshot
         required_capabilities = []
         
-        # Check each pattern
-        for pattern_name, pattern in self.pattern_cache.items():
-            match = pattern.search(normalized_request)
-            if match:
-                logger.debug("Matched pattern: %s", pattern_name)
+        seen = set()
+        
+        if approximate:
+            matched_patterns = snapshot.matcher.match_keywords(normalized_request)
+        else:
+            # Only patterns whose trigger words occur in the request are run
+            matched_patterns = snapshot.matcher.match(normalized_request)
+        
+        for pattern_name in matched_patterns:
+            logger.debug("Matched pattern: %s", pattern_name)
+            
+            # Look up capabilities for this pattern
+            for capability_info in snapshot.capability_mapping.get(pattern_name, ()):
+                # Add the capability if not already present
+                if capability_info["name"] in seen:
+                    continue
+                seen.add(capability_info["name"])
                 
-                # Look up capabilities for this pattern
-                if pattern_name in capabilityMapping:
-                    for capability_info in capabilityMapping[pattern_name]:
-                        capability = RequiredCapability(
-                            name=capability_info["name"],
-                            parameters=capability_info.get("parameters", {}),
-                            priority=capability_info.get("priority", 1),
-                            confidence=capability_info.get("confidence", 0.8)
-                        )
-                        
-                        # Apply device-specific adjustments from context
-                        if context and "device_info" in context:
-                            self._adjust_for_device(capability, context["device_info"])
-                        
-                        # Add the capability if not already present
-                        if not any(cap.name == capability.name for cap in required_capabilities):
-                            required_capabilities.append(capability)
+                capability = RequiredCapability(
+                    name=capability_info["name"],
+                    parameters=dict(capability_info.get("parameters", {})),
+                    priority=capability_info.get("priority", 1),
+                    confidence=capability_info.get("confidence", 0.8)
+                )
+                
+                # Apply device-specific adjustments from context
+                if context and "device_info" in context:
+                    self._adjust_for_device(capability, context["device_info"])
+                
+                required_capabilities.append(capability)
         
         # If no capabilities identified, use fallbacks
         if not required_capabilities:
@@ -164,7 +487,7 @@ class IntentInterpreter:
             )
             
             # If request looks like it might need visuals, add UI capability
-            if re.search(r'\b(show|display|visual|graph|chart|picture|image)\b', normalized_request):
+            if self._VISUAL_WORDS.search(normalized_request):
                 required_capabilities.append(
                     RequiredCapability(
                         name="ui_rendering",
@@ -210,56 +533,23 @@ class IntentInterpreter:
             if device_info.get("gpu_available"):
                 capability.parameters["use_gpu"] = True
     
-    def _identify_connections(self, capabilities: List[RequiredCapability]) -> Dict[str, List[str]]:
+    def _identify_connections(
+        self,
+        capabilities: List[RequiredCapability],
+        snapshot: Optional[PatternSnapshot] = None
+    ) -> Dict[str, List[str]]:
         """
         Identify suggested connections between capabilities.
         
         Args:
             capabilities: List of required capabilities
+            snapshot: Pattern snapshot (defaults to the current one)
             
         Returns:
             Dictionary mapping source capabilities to target capabilities
         """
-        connections = {}
-        
-        # Simple rules for connecting capabilities
-        # In a real implementation, this would be more sophisticated
-        
-        for source_cap in capabilities:
-            connections[source_cap.name] = []
-            
-            # UI should connect to data providers
-            if source_cap.name == "ui_rendering":
-                for target_cap in capabilities:
-                    if target_cap.name in [
-                        "text_generation", 
-                        "data_analysis", 
-                        "media_processing",
-                        "file_system"
-                    ]:
-                        connections[source_cap.name].append(target_cap.name)
-            
-            # Text generation should connect to data sources
-            elif source_cap.name == "text_generation":
-                for target_cap in capabilities:
-                    if target_cap.name in [
-                        "data_analysis",
-                        "file_system",
-                        "web_search"
-                    ]:
-                        connections[source_cap.name].append(target_cap.name)
-            
-            # Data analysis should connect to data sources
-            elif source_cap.name == "data_analysis":
-                for target_cap in capabilities:
-                    if target_cap.name in [
-                        "file_system",
-                        "database",
-                        "web_search"
-                    ]:
-                        connections[source_cap.name].append(target_cap.name)
-        
-        return connections
+        snapshot = snapshot or self.registry.snapshot
+        return snapshot.connection_index.suggest([cap.name for cap in capabilities])
     
     def _calculate_confidence(self, capabilities: List[RequiredCapability]) -> float:
         """
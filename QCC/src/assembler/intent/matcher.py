@@ -0,0 +1,277 @@
+"""
+Compiled intent matcher for the Intent Interpreter.
+
+This module provides the IntentMatcher class, which finds every intent
+pattern matching a request with one tokenization pass and a keyword index,
+the AbbreviationExpander class, which expands all abbreviations in a
+single substitution, and the ConnectionIndex class, which suggests
+connections between capabilities from a precomputed adjacency index.
+"""
+
+import re
+import logging
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Pattern, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Leading alternation of an intent pattern, e.g. \b(create|make|start)
+_LEADING_GROUP = re.compile(r'^\\b\(([^()]+)\)')
+# Any plain alternation group of an intent pattern
+_GROUP = re.compile(r'\(([^()]+)\)')
+_WORD = re.compile(r'\w+')
+
+
+class IntentMatcher:
+    """
+    Matches a request against all intent patterns in one pass.
+
+    Every intent pattern starts with a word-bounded group of trigger
+    phrases, so a pattern can only match a request containing the first
+    word of one of its triggers. The matcher indexes patterns by those
+    words, tokenizes the request once, and runs only the regexes whose
+    trigger words occur in it. Patterns without a recognizable trigger
+    group are always run.
+
+    For bulk classification, match_keywords() skips the regexes entirely
+    and treats the request as a bag of words: a pattern matches when every
+    one of its groups has a phrase whose words all occur in the request.
+
+    Attributes:
+        patterns (Dict[str, Pattern]): Compiled patterns in declaration order
+    """
+
+    def __init__(self, patterns: Dict[str, str], flags: int = re.IGNORECASE):
+        """
+        Compile the patterns and build the trigger index.
+
+        Args:
+            patterns: Pattern names mapped to regular expressions
+            flags: Flags used to compile every pattern
+        """
+        self.patterns: Dict[str, Pattern] = {}
+        self._order: Dict[str, int] = {}
+        self._trigger_index: Dict[str, List[str]] = {}
+        self._ungated: List[str] = []
+        self._keyword_groups: Dict[str, List[List[FrozenSet[str]]]] = {}
+
+        for position, (name, pattern_str) in enumerate(patterns.items()):
+            self.patterns[name] = re.compile(pattern_str, flags)
+            self._order[name] = position
+
+            triggers = self._extract_triggers(pattern_str)
+            if triggers is None:
+                self._ungated.append(name)
+                continue
+            for trigger in triggers:
+                self._trigger_index.setdefault(trigger, []).append(name)
+
+            groups = self._extract_keyword_groups(pattern_str)
+            if groups is not None:
+                self._keyword_groups[name] = groups
+
+        logger.debug(
+            "Intent matcher indexed %d patterns on %d trigger words (%d ungated)",
+            len(self.patterns), len(self._trigger_index), len(self._ungated)
+        )
+
+    def match(self, text: str) -> List[str]:
+        """
+        Find all patterns that match a text.
+
+        Args:
+            text: Normalized request text
+
+        Returns:
+            Names of the matching patterns in declaration order
+        """
+        candidates = set(self._ungated)
+        for token in set(_WORD.findall(text.lower())):
+            names = self._trigger_index.get(token)
+            if names:
+                candidates.update(names)
+
+        return [
+            name for name in sorted(candidates, key=self._order.__getitem__)
+            if self.patterns[name].search(text)
+        ]
+
+    def match_keywords(self, text: str) -> List[str]:
+        """
+        Find patterns whose keywords all occur in a text, without regexes.
+
+        This ignores word order and spacing between groups, so it can
+        report patterns that match() would reject; it is meant for
+        approximate classification of large batches.
+
+        Args:
+            text: Normalized request text
+
+        Returns:
+            Names of the matching patterns in declaration order
+        """
+        tokens = set(_WORD.findall(text.lower()))
+        candidates = set(self._ungated)
+        for token in tokens:
+            names = self._trigger_index.get(token)
+            if names:
+                candidates.update(names)
+
+        matched = []
+        for name in sorted(candidates, key=self._order.__getitem__):
+            groups = self._keyword_groups.get(name)
+            if groups is None:
+                if self.patterns[name].search(text):
+                    matched.append(name)
+            elif all(any(phrase <= tokens for phrase in group) for group in groups):
+                matched.append(name)
+        return matched
+
+    @staticmethod
+    def _extract_keyword_groups(pattern_str: str) -> Optional[List[List[FrozenSet[str]]]]:
+        """
+        Get the word sets of every phrase in each group of a pattern.
+
+        Args:
+            pattern_str: Regular expression source
+
+        Returns:
+            One list of phrase word sets per group, or None if a group holds
+            anything other than plain words
+        """
+        groups = []
+        for group in _GROUP.findall(pattern_str):
+            phrases = []
+            for alternative in group.split('|'):
+                words = alternative.lower().split()
+                if not words or not all(re.fullmatch(r'\w+', word) for word in words):
+                    return None
+                phrases.append(frozenset(words))
+            groups.append(phrases)
+        return groups or None
+
+    @staticmethod
+    def _extract_triggers(pattern_str: str) -> Optional[Set[str]]:
+        """
+        Get the first words of a pattern's leading trigger group.
+
+        Args:
+            pattern_str: Regular expression source
+
+        Returns:
+            Lowercase trigger words, or None if the pattern does not start
+            with a plain word alternation
+        """
+        group = _LEADING_GROUP.match(pattern_str)
+        if not group:
+            return None
+
+        triggers = set()
+        for alternative in group.group(1).split('|'):
+            words = alternative.split()
+            if not words or not re.fullmatch(r'\w+', words[0]):
+                return None
+            triggers.add(words[0].lower())
+        return triggers
+
+
+class AbbreviationExpander:
+    """
+    Expands whole-word abbreviations with one regular expression pass.
+
+    Attributes:
+        expansions (Dict[str, str]): Abbreviations mapped to their expansions
+    """
+
+    def __init__(self, expansions: Dict[str, str]):
+        """
+        Compile the combined abbreviation pattern.
+
+        Args:
+            expansions: Abbreviations mapped to their expansions
+        """
+        self.expansions = dict(expansions)
+        # Longest first so an abbreviation never shadows a longer one
+        alternatives = sorted(self.expansions, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(abbr) for abbr in alternatives) + r')\b'
+        ) if alternatives else None
+
+    def expand(self, text: str) -> str:
+        """
+        Replace every abbreviation in a text.
+
+        Args:
+            text: Lowercase text
+
+        Returns:
+            Text with abbreviations expanded
+        """
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(lambda match: self.expansions[match.group(1)], text)
+
+
+class ConnectionIndex:
+    """
+    Suggests connections between capabilities from an adjacency index.
+
+    Connection rules are compiled once into a set of targets per source
+    capability, so the suggestions for a capability set are the
+    intersections of those sets with it. Suggestions for recently seen
+    capability sets are cached.
+
+    Attributes:
+        adjacency (Dict[str, FrozenSet[str]]): Connectable targets by source
+        cache_size (int): Maximum number of cached capability sets
+    """
+
+    def __init__(self, rules: Dict[str, Sequence[str]], cache_size: int = 256):
+        """
+        Compile the adjacency index.
+
+        Args:
+            rules: Source capabilities mapped to the capabilities they connect to
+            cache_size: Maximum number of cached capability sets (0 disables)
+        """
+        self.adjacency: Dict[str, FrozenSet[str]] = {
+            source: frozenset(targets) for source, targets in rules.items()
+        }
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, ...], Tuple[Tuple[str, Tuple[str, ...]], ...]]" = OrderedDict()
+
+    def suggest(self, capabilities: Sequence[str]) -> Dict[str, List[str]]:
+        """
+        Suggest connections within a set of capabilities.
+
+        Args:
+            capabilities: Capability names in priority order
+
+        Returns:
+            Every capability mapped to the capabilities it should connect
+            to, in the order they were given
+        """
+        key = tuple(capabilities)
+        suggestions = self._cache.get(key)
+        if suggestions is not None:
+            self._cache.move_to_end(key)
+        else:
+            present = frozenset(key)
+            suggestions = []
+            for source in key:
+                targets = self.adjacency.get(source, frozenset()) & present
+                suggestions.append(
+                    (source, tuple(name for name in key if name in targets) if targets else ())
+                )
+            suggestions = tuple(suggestions)
+
+            if self.cache_size > 0:
+                self._cache[key] = suggestions
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return {source: list(targets) for source, targets in suggestions}
+
+    def clear_cache(self) -> None:
+        """Drop all cached suggestions."""
+        self._cache.clear()
@@ -9,6 +9,68 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field, asdict
 
 
+class FrozenDict(dict):
+    """
+    Read-only dictionary used for shared, cached analysis results.
+    
+    Any attempt to modify it raises TypeError. Copies made with
+    ``copy.copy`` or ``copy.deepcopy`` are ordinary mutable containers, so
+    callers that need to change a result should copy it first.
+    """
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached intent analysis results are read-only; copy before modifying")
+    
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+    
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return thaw(self)
+    
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dictionaries and lists into read-only equivalents.
+    
+    Args:
+        value: Value to freeze
+        
+    Returns:
+        The value with dictionaries as FrozenDict and lists as tuples
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Recursively convert frozen values back into mutable dictionaries and lists.
+    
+    Args:
+        value: Value to thaw
+        
+    Returns:
+        The value with dictionaries as dict and tuples as lists
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
 @dataclass
 class RequiredCapability:
     """
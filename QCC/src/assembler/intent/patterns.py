@@ -2,7 +2,8 @@
 Pattern definitions for the Intent Interpreter.
 
 This module defines regex patterns for identifying user intents,
-and the mapping between patterns and required capabilities.
+the mapping between patterns and required capabilities, and the rules
+for connecting capabilities.
 """
 
 # Regular expression patterns for recognizing user intents
@@ -151,3 +152,25 @@ capabilityMapping = {
         {"name": "ui_rendering", "parameters": {"type": "information_display"}, "priority": 2, "confidence": 0.8}
     ]
 }
+
+# Abbreviations expanded during request normalization
+abbreviationMapping = {
+    'doc': 'document',
+    'pic': 'picture',
+    'calc': 'calculator',
+    'app': 'application',
+    'info': 'information',
+    'stats': 'statistics',
+    'ui': 'user interface',
+    'db': 'database'
+}
+
+# Capabilities each capability should connect to when both are required
+connectionRules = {
+    # UI should connect to data providers
+    "ui_rendering": ["text_generation", "data_analysis", "media_processing", "file_system"],
+    # Text generation should connect to data sources
+    "text_generation": ["data_analysis", "file_system", "web_search"],
+    # Data analysis should connect to data sources
+    "data_analysis": ["file_system", "database", "web_search"]
+}
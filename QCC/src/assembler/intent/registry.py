@@ -0,0 +1,305 @@
+"""
+Pattern registry for the Intent Interpreter.
+
+This module provides the PatternRegistry class, which loads the intent
+pattern tables from the built-in patterns module or from pattern files,
+compiles them into immutable versioned snapshots, and swaps a new snapshot
+in without restarting the system.
+"""
+
+import os
+import json
+import asyncio
+import logging
+import importlib
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import yaml
+
+from . import patterns
+from .models import freeze
+from .matcher import IntentMatcher, AbbreviationExpander, ConnectionIndex
+
+logger = logging.getLogger(__name__)
+
+# Pattern file keys mapped to the patterns module tables they replace
+TABLES = {
+    "intent_patterns": "intentPatterns",
+    "capability_mapping": "capabilityMapping",
+    "abbreviations": "abbreviationMapping",
+    "connection_rules": "connectionRules"
+}
+
+PATTERN_FILE_EXTENSIONS = (".json", ".yaml", ".yml")
+
+
+@dataclass(frozen=True)
+class PatternSnapshot:
+    """
+    Compiled pattern tables at one version.
+
+    Snapshots are never modified once built, so a request can use one
+    snapshot from start to finish while a newer one is swapped in.
+
+    Attributes:
+        version (int): Registry version, increasing with every reload
+        source (str): Where the tables were loaded from
+        tables (Dict[str, Dict[str, Any]]): Raw tables by pattern file key
+        matcher (IntentMatcher): Keyword-gated matcher over the intent patterns
+        abbreviations (AbbreviationExpander): Abbreviation expander
+        capability_mapping (Dict[str, Any]): Read-only capabilities by pattern
+        connection_index (ConnectionIndex): Connection suggestions
+        loaded_at (str): ISO timestamp of compilation
+    """
+    version: int
+    source: str
+    tables: Dict[str, Dict[str, Any]]
+    matcher: IntentMatcher
+    abbreviations: AbbreviationExpander
+    capability_mapping: Dict[str, Any]
+    connection_index: ConnectionIndex
+    loaded_at: str
+
+    @classmethod
+    def compile(cls, tables: Dict[str, Dict[str, Any]], version: int, source: str) -> "PatternSnapshot":
+        """
+        Compile pattern tables into a snapshot.
+
+        Args:
+            tables: Raw tables by pattern file key
+            version: Version of the snapshot
+            source: Where the tables were loaded from
+
+        Returns:
+            The compiled snapshot
+
+        Raises:
+            re.error: If an intent pattern is not a valid regular expression
+        """
+        return cls(
+            version=version,
+            source=source,
+            tables=tables,
+            matcher=IntentMatcher(tables["intent_patterns"]),
+            abbreviations=AbbreviationExpander(tables["abbreviations"]),
+            capability_mapping=freeze(tables["capability_mapping"]),
+            connection_index=ConnectionIndex(tables["connection_rules"]),
+            loaded_at=datetime.now().isoformat()
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a summary dictionary."""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "patterns": len(self.matcher.patterns),
+            "loaded_at": self.loaded_at
+        }
+
+
+class PatternRegistry:
+    """
+    Loads, compiles and hot-swaps intent pattern tables.
+
+    The registry reads the tables from the patterns module, or from a
+    pattern file or a directory of pattern files when a source path is
+    given. JSON and YAML files may define any of ``intent_patterns``,
+    ``capability_mapping``, ``abbreviations`` and ``connection_rules``;
+    files in a directory are merged in name order, and tables no file
+    defines come from the patterns module.
+
+    Readers take ``registry.snapshot`` once per request. Reloading compiles
+    a new snapshot off the event loop and then replaces that reference, so
+    the request path never waits on a lock or sees a partly built snapshot.
+
+    Attributes:
+        source (Optional[str]): Pattern file or directory, or None for the module
+        snapshot (PatternSnapshot): Current compiled snapshot
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        """
+        Initialize the registry and compile the first snapshot.
+
+        Args:
+            source: Pattern file or directory, or None to use the patterns module
+        """
+        self.source = source
+        self._reload_lock = threading.Lock()
+        self._source_state = self._stat_source()
+        self._watch_task: Optional[asyncio.Task] = None
+        self.snapshot = PatternSnapshot.compile(self._read_tables(reload_module=False), 1, self._source_name())
+        self._version = self.snapshot.version
+
+        logger.info("Pattern registry loaded version 1 from %s", self.snapshot.source)
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, Dict[str, Any]], version: int) -> "PatternRegistry":
+        """
+        Create a registry holding given tables, as used by worker processes.
+
+        Args:
+            tables: Raw tables by pattern file key
+            version: Version to report for the snapshot
+
+        Returns:
+            Registry whose snapshot is compiled from the tables
+        """
+        registry = cls.__new__(cls)
+        registry.source = None
+        registry._version = version
+        registry._reload_lock = threading.Lock()
+        registry._source_state = None
+        registry._watch_task = None
+        registry.snapshot = PatternSnapshot.compile(tables, version, "tables")
+        return registry
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot."""
+        return self.snapshot.version
+
+    def reload(self) -> PatternSnapshot:
+        """
+        Reload the tables from the source and swap in a new snapshot.
+
+        If the tables cannot be read or compiled, the current snapshot stays
+        in place and the error is raised.
+
+        Returns:
+            The new snapshot
+        """
+        with self._reload_lock:
+            source_state = self._stat_source()
+            tables = self._read_tables(reload_module=True)
+            snapshot = PatternSnapshot.compile(tables, self._version + 1, self._source_name())
+
+            self._version = snapshot.version
+            self._source_state = source_state
+            self.snapshot = snapshot
+
+        logger.info("Pattern registry swapped in version %d from %s", snapshot.version, snapshot.source)
+        return snapshot
+
+    async def reload_async(self) -> PatternSnapshot:
+        """
+        Reload in a worker thread so compilation does not block the event loop.
+
+        Returns:
+            The new snapshot
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.reload)
+
+    def has_changed(self) -> bool:
+        """Check whether the pattern files changed since the last load."""
+        return self.source is not None and self._stat_source() != self._source_state
+
+    def start_watching(self, interval_seconds: float = 5.0) -> None:
+        """
+        Poll the pattern files and reload whenever they change.
+
+        Args:
+            interval_seconds: Seconds between checks
+        """
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.ensure_future(self._watch(interval_seconds))
+
+    async def stop_watching(self) -> None:
+        """Stop polling the pattern files."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+    async def _watch(self, interval_seconds: float) -> None:
+        """Reload whenever the pattern files change until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if not self.has_changed():
+                    continue
+                await self.reload_async()
+            except Exception as e:
+                # Keep serving the last good snapshot until the files are fixed
+                logger.error("Failed to reload patterns from %s: %s", self.source, e)
+                self._source_state = self._stat_source()
+
+    def _source_name(self) -> str:
+        """Describe where the tables come from."""
+        return self.source if self.source is not None else patterns.__name__
+
+    def _read_tables(self, reload_module: bool) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the raw tables from the source.
+
+        Args:
+            reload_module: Whether to re-import the patterns module first
+
+        Returns:
+            Raw tables by pattern file key
+
+        Raises:
+            ValueError: If a pattern file does not hold a mapping of tables
+        """
+        if reload_module:
+            importlib.reload(patterns)
+
+        tables = {key: dict(getattr(patterns, name)) for key, name in TABLES.items()}
+        if self.source is None:
+            return tables
+
+        loaded = {}
+        for path in self._pattern_files():
+            with open(path, "r") as f:
+                data = json.load(f) if path.endswith(".json") else yaml.safe_load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"Pattern file {path} must contain a mapping")
+
+            for key in TABLES:
+                if key in data:
+                    loaded.setdefault(key, {}).update(data[key])
+
+        tables.update(loaded)
+        return tables
+
+    def _pattern_files(self) -> List[str]:
+        """List the pattern files of the source in load order."""
+        if os.path.isdir(self.source):
+            return [
+                os.path.join(self.source, name)
+                for name in sorted(os.listdir(self.source))
+                if name.endswith(PATTERN_FILE_EXTENSIONS)
+            ]
+        return [self.source]
+
+    def _stat_source(self) -> Optional[Tuple[Tuple[str, float, int], ...]]:
+        """
+        Fingerprint the pattern files by path, modification time and size.
+
+        Files removed while they are listed are left out, and a missing or
+        unreadable source has no fingerprint, so both count as changes.
+        """
+        if self.source is None or not os.path.exists(self.source):
+            return None
+
+        try:
+            paths = self._pattern_files()
+        except OSError as e:
+            logger.warning("Cannot list pattern files in %s: %s", self.source, e)
+            return None
+
+        state = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning("Cannot stat pattern file %s: %s", path, e)
+                continue
+            state.append((path, stat.st_mtime, stat.st_size))
+        return tuple(state)
@@ -10,10 +10,14 @@ from .cell_runtime import CellRuntime
 from .cell_connector import CellConnector
 from .lifecycle_manager import LifecycleManager
 from .resource_manager import ResourceManager
+from .payload import SharedPayload
+from .snapshots import StateSnapshot
 
 __all__ = [
     'CellRuntime',
     'CellConnector',
     'LifecycleManager',
-    'ResourceManager'
+    'ResourceManager',
+    'SharedPayload',
+    'StateSnapshot'
 ]
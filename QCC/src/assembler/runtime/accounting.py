@@ -0,0 +1,303 @@
+"""
+Per-cell resource accounting for the QCC Assembler.
+
+This module provides the ResourceAccountant class, which measures the
+memory and CPU time each cell actually uses, so resource limits are
+enforced against the cell that consumes the resources:
+
+- Cells in worker processes are measured by their worker's RSS and CPU times.
+- Cells in this process are charged the CPU time of their own method calls,
+  measured per coroutine step on the event loop and per call in threads.
+- With allocation tracing enabled, cells in this process are charged the
+  live Python allocations made from their own source file. Instances of
+  one cell type share that file, so they share its memory evenly.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import tracemalloc
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Where a cell's memory figure comes from
+MEMORY_WORKER = "worker"
+MEMORY_TRACED = "traced"
+MEMORY_SHARED = "shared"
+
+
+class _Metered:
+    """Awaitable that runs a coroutine and charges the CPU time of its steps."""
+
+    __slots__ = ("_coro", "_charge")
+
+    def __init__(self, coro: Any, charge: Callable[[float], None]):
+        self._coro = coro
+        self._charge = charge
+
+    def __await__(self):
+        coro = self._coro
+        value, error = None, None
+        while True:
+            # Only time spent inside the coroutine counts, not while it is suspended
+            started = time.thread_time()
+            try:
+                if error is not None:
+                    future = coro.throw(error)
+                else:
+                    future = coro.send(value)
+            except StopIteration as stop:
+                self._charge(time.thread_time() - started)
+                return stop.value
+            except BaseException:
+                self._charge(time.thread_time() - started)
+                raise
+            self._charge(time.thread_time() - started)
+
+            try:
+                value, error = (yield future), None
+            except BaseException as e:
+                value, error = None, e
+
+
+def metered(coro: Any, charge: Callable[[float], None]) -> _Metered:
+    """
+    Wrap a coroutine so the CPU time of running it is charged.
+
+    Args:
+        coro: Coroutine to run
+        charge: Called with CPU seconds after every step of the coroutine
+
+    Returns:
+        Awaitable with the coroutine's result
+    """
+    return _Metered(coro, charge)
+
+
+def call_timed(function: Callable[[], Any], charge: Callable[[float], None]) -> Any:
+    """
+    Call a function in the current thread and charge its CPU time.
+
+    Args:
+        function: Function to call
+        charge: Called with the CPU seconds the call took
+
+    Returns:
+        The function's result
+    """
+    started = time.thread_time()
+    try:
+        return function()
+    finally:
+        charge(time.thread_time() - started)
+
+
+class ResourceAccountant:
+    """
+    Measures the memory and CPU time of individual cells.
+
+    Memory of cells in this process is only known when allocation tracing
+    is enabled. Without it they are reported the process RSS split evenly
+    (the "shared" source), which is not precise enough to enforce limits
+    against. Traced allocations only record the code that made them, not
+    the instance, and cells of the same type share one source file: traced
+    memory of a type is split evenly among its instances, so one instance
+    holding more than its siblings is reported the same average. Cells
+    that must be limited individually belong on the process backend.
+
+    Attributing traced memory scans every live allocation, so it runs in
+    a worker thread and is refreshed at most once per scan interval;
+    samples in between reuse the last scan's figures.
+
+    Attributes:
+        trace_allocations (bool): Whether Python allocations are traced
+        trace_frames (int): Stack frames kept per traced allocation
+        scan_interval_seconds (float): Minimum time between allocation scans
+    """
+
+    def __init__(self, trace_allocations: bool = False, trace_frames: int = 16, scan_interval_seconds: float = 5.0):
+        """
+        Initialize the accountant.
+
+        Args:
+            trace_allocations: Trace allocations to attribute in-process memory
+            trace_frames: Stack frames kept per traced allocation; deeper
+                stacks attribute memory allocated by libraries a cell calls
+            scan_interval_seconds: Minimum time between allocation scans
+        """
+        self.trace_allocations = trace_allocations
+        self.trace_frames = trace_frames
+        self.scan_interval_seconds = scan_interval_seconds
+        self._started_tracing = False
+        self._traced: Dict[str, int] = {}
+        self._traced_files: set = set()
+        self._last_scan: Optional[float] = None
+        self._cells: Dict[str, Dict[str, Any]] = {}
+        self._last_sample = time.monotonic()
+
+    def start(self) -> None:
+        """Start allocation tracing, if enabled."""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop allocation tracing, if this accountant started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def register(self, cell_id: str, source_file: Optional[str] = None, pid: Optional[int] = None) -> None:
+        """
+        Start accounting for a cell.
+
+        Args:
+            cell_id: ID of the cell
+            source_file: File the cell's class is defined in, for in-process cells
+            pid: Process ID of the cell's worker, for process cells
+        """
+        self._cells[cell_id] = {
+            "source_file": source_file,
+            "pid": pid,
+            "cpu_seconds": 0.0,
+            "sampled_cpu_seconds": 0.0
+        }
+
+    def replace_worker(self, cell_id: str, pid: int) -> None:
+        """
+        Measure a process cell's restarted worker from now on.
+
+        Args:
+            cell_id: ID of the cell
+            pid: Process ID of the new worker
+        """
+        account = self._cells.get(cell_id)
+        if account is not None:
+            account["pid"] = pid
+            # The new worker's CPU times start from zero
+            account["sampled_cpu_seconds"] = account["cpu_seconds"]
+
+    def unregister(self, cell_id: str) -> None:
+        """Stop accounting for a cell."""
+        self._cells.pop(cell_id, None)
+
+    def charge_cpu(self, cell_id: str, seconds: float) -> None:
+        """
+        Add CPU time used by a cell in this process.
+
+        Args:
+            cell_id: ID of the cell
+            seconds: CPU seconds used
+        """
+        account = self._cells.get(cell_id)
+        if account is not None:
+            account["cpu_seconds"] += seconds
+
+    def charger(self, cell_id: str) -> Callable[[float], None]:
+        """Get a function charging CPU time to a cell."""
+        return lambda seconds: self.charge_cpu(cell_id, seconds)
+
+    async def sample(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Measure every registered cell.
+
+        Returns:
+            Dictionary mapping cell IDs to their memory_mb, memory_source,
+            cpu_seconds and cpu_percent since the previous sample
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._last_sample, 1e-6)
+        self._last_sample = now
+
+        usage = {}
+        local = []
+        for cell_id, account in self._cells.items():
+            cpu_seconds = account["cpu_seconds"]
+            memory_mb = None
+
+            if account["pid"] is not None:
+                import psutil
+
+                try:
+                    worker = psutil.Process(account["pid"])
+                    memory_mb = worker.memory_info().rss / (1024 * 1024)
+                    times = worker.cpu_times()
+                    cpu_seconds += times.user + times.system
+                except psutil.Error as e:
+                    logger.warning(f"Cannot measure worker process {account['pid']} of cell {cell_id}: {e}")
+                    memory_mb = 0.0
+            else:
+                local.append(cell_id)
+
+            usage[cell_id] = {
+                "memory_mb": memory_mb,
+                "memory_source": MEMORY_WORKER,
+                "cpu_seconds": cpu_seconds,
+                "cpu_percent": (cpu_seconds - account["sampled_cpu_seconds"]) / elapsed * 100
+            }
+            account["sampled_cpu_seconds"] = cpu_seconds
+
+        if local:
+            await self._measure_local_memory(local, usage)
+
+        return usage
+
+    async def _measure_local_memory(self, cell_ids: list, usage: Dict[str, Dict[str, Any]]) -> None:
+        """Fill in the memory of cells running in this process."""
+        if tracemalloc.is_tracing():
+            by_file: Dict[str, list] = {}
+            for cell_id in cell_ids:
+                source_file = self._cells[cell_id]["source_file"]
+                if source_file is not None:
+                    by_file.setdefault(source_file, []).append(cell_id)
+
+            source_files = set(by_file)
+            now = time.monotonic()
+            if source_files and (
+                self._last_scan is None
+                or now - self._last_scan >= self.scan_interval_seconds
+                or not source_files <= self._traced_files
+            ):
+                self._last_scan = now
+                loop = asyncio.get_event_loop()
+                self._traced = await loop.run_in_executor(None, self._traced_bytes, source_files)
+                self._traced_files = source_files
+
+            for source_file, sharing in by_file.items():
+                memory_mb = self._traced.get(source_file, 0) / (1024 * 1024) / len(sharing)
+                for cell_id in sharing:
+                    usage[cell_id]["memory_mb"] = memory_mb
+                    usage[cell_id]["memory_source"] = MEMORY_TRACED
+
+        untraced = [cell_id for cell_id in cell_ids if usage[cell_id]["memory_mb"] is None]
+        if untraced:
+            import psutil
+
+            per_cell = psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024) / len(untraced)
+            for cell_id in untraced:
+                usage[cell_id]["memory_mb"] = per_cell
+                usage[cell_id]["memory_source"] = MEMORY_SHARED
+
+    @staticmethod
+    def _traced_bytes(source_files: set) -> Dict[str, int]:
+        """
+        Sum live traced allocations by the innermost cell source file on their stack.
+
+        Each allocation is counted once, for the cell whose code is closest
+        to it, so memory a cell allocates through a library call is still
+        charged to that cell.
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(True, source_file, all_frames=True) for source_file in source_files
+        ])
+        totals: Dict[str, int] = {}
+        # One statistic per distinct stack, whose frames run from the oldest call
+        for statistic in snapshot.statistics("traceback"):
+            owner = next(
+                (frame.filename for frame in reversed(statistic.traceback) if frame.filename in source_files), None
+            )
+            if owner is not None:
+                totals[owner] = totals.get(owner, 0) + statistic.size
+        return totals
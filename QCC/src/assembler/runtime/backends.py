@@ -0,0 +1,402 @@
+"""
+Cell execution backends for the QCC Assembler.
+
+This module decides where a cell's methods run. By default async methods
+run on the event loop and sync methods on the shared thread pool. A cell
+manifest can instead place a cell on the event loop, on the thread pool,
+or in a dedicated worker process, so CPU-bound cells run on their own
+core without holding the GIL of the process that serves every other cell.
+"""
+
+import os
+import signal
+import asyncio
+import inspect
+import logging
+import functools
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from .class_loader import CellClassCache
+from .accounting import call_timed
+from .deadlines import current_cancellation
+
+logger = logging.getLogger(__name__)
+
+# Where a cell's methods run:
+#   auto: async methods on the event loop, sync methods on the thread pool
+#   loop: every method on the event loop, for cheap non-blocking cells
+#   thread: every method on the thread pool, async ones on a private loop
+#   process: every method in a dedicated worker process
+EXECUTION_BACKENDS = ("auto", "loop", "thread", "process")
+
+
+def get_execution_settings(cell: Any) -> Dict[str, Any]:
+    """
+    Read the execution section of a cell's manifest.
+
+    Manifests declare placement as, for example,
+    ``"execution": {"backend": "process", "cpu_affinity": [2]}``.
+
+    Args:
+        cell: Cell object, optionally with a manifest dictionary or object
+
+    Returns:
+        Execution settings, empty if the manifest declares none
+    """
+    manifest = getattr(cell, "manifest", None)
+    if isinstance(manifest, dict):
+        execution = manifest.get("execution")
+    else:
+        execution = getattr(manifest, "execution", None)
+    return dict(execution) if isinstance(execution, dict) else {}
+
+
+def _run_in_thread(method: Callable, params: Dict[str, Any]) -> Any:
+    """Run a cell method to completion in a pool thread."""
+    if inspect.iscoroutinefunction(method):
+        return asyncio.run(method(**params))
+    return method(**params)
+
+
+class LocalCell:
+    """
+    A cell instance in this process, bound to the loop or thread backend.
+
+    Attribute access is forwarded to the instance; methods come back as
+    coroutine functions that run where the backend places them, so the
+    executor awaits every cell the same way. On the thread backend the
+    call's cancellation token can interrupt the pool thread.
+    """
+
+    def __init__(
+        self,
+        instance: Any,
+        backend: str,
+        thread_pool: Optional[Executor] = None,
+        charge: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Wrap a cell instance.
+
+        Args:
+            instance: The cell instance
+            backend: "loop" or "thread"
+            thread_pool: Executor for the thread backend, or None for the
+                event loop's default executor
+            charge: Function charged the CPU time of calls on the thread backend
+        """
+        self._instance = instance
+        self._backend = backend
+        self._thread_pool = thread_pool
+        self._charge = charge
+
+    @property
+    def instance(self) -> Any:
+        """The wrapped cell instance."""
+        return self._instance
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(self._instance, name)
+        if not callable(attribute):
+            return attribute
+
+        if self._backend == "thread":
+            async def call(**params):
+                loop = asyncio.get_event_loop()
+                run = functools.partial(_run_in_thread, attribute, params)
+                token = current_cancellation.get()
+                if token is not None:
+                    run = functools.partial(token.run, run)
+                if self._charge is not None:
+                    run = functools.partial(call_timed, run, self._charge)
+                return await loop.run_in_executor(self._thread_pool, run)
+        else:
+            async def call(**params):
+                result = attribute(**params)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+        call.__name__ = name
+        call.__wrapped__ = attribute
+        return call
+
+
+# State of a worker process: its cells, their classes and its private event loop
+_worker_cells: Dict[str, Any] = {}
+_worker_classes = CellClassCache()
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(cpu_affinity: Optional[List[int]]) -> None:
+    """Pin a new worker process to its cores, where the platform allows."""
+    if cpu_affinity and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(cpu_affinity))
+        except OSError as e:
+            logger.warning(f"Could not pin worker process {os.getpid()} to cores {cpu_affinity}: {e}")
+
+
+def _parameter_names(method: Callable) -> Tuple[str, ...]:
+    """Get the names of the parameters a method declares."""
+    try:
+        return tuple(inspect.signature(method).parameters)
+    except (TypeError, ValueError):
+        return ()
+
+
+def _worker_load(
+    cell_id: str,
+    module_path: Optional[str],
+    code: Optional[str]
+) -> Tuple[int, Dict[str, Tuple[str, ...]]]:
+    """
+    Instantiate a cell inside the worker process.
+
+    Args:
+        cell_id: ID of the cell
+        module_path: Module defining the cell class
+        code: Source code defining the cell class, if no module is given
+
+    Returns:
+        Tuple of the worker's process ID and the parameter names of the
+        cell's public methods, by method name
+
+    Raises:
+        ValueError: If no cell class is found
+    """
+    if module_path:
+        entry = _worker_classes.load_module(module_path)
+    else:
+        entry = _worker_classes.load_code(code)
+
+    instance = entry.cell_class()
+    _worker_cells[cell_id] = instance
+    methods = {
+        name: _parameter_names(getattr(instance, name))
+        for name in dir(instance)
+        if not name.startswith("_") and callable(getattr(instance, name, None))
+    }
+    return os.getpid(), methods
+
+
+def _worker_reload(
+    cell_id: str,
+    module_path: Optional[str],
+    code: Optional[str],
+    init_params: Optional[Dict[str, Any]]
+) -> Tuple[int, Dict[str, Tuple[str, ...]]]:
+    """
+    Instantiate a cell in a restarted worker and initialize it again.
+
+    Both run in one job, so calls queued behind it reach an initialized cell.
+
+    Args:
+        cell_id: ID of the cell
+        module_path: Module defining the cell class
+        code: Source code defining the cell class, if no module is given
+        init_params: Keyword arguments for the cell's initialize method, or
+            None if the cell was not initialized
+
+    Returns:
+        Tuple of the worker's process ID and the parameter names of the
+        cell's public methods, by method name
+
+    Raises:
+        RuntimeError: If the cell's initialization fails
+    """
+    loaded = _worker_load(cell_id, module_path, code)
+    if init_params is not None:
+        result = _worker_call(cell_id, "initialize", init_params)
+        if not isinstance(result, dict) or result.get("status") != "success":
+            del _worker_cells[cell_id]
+            error = result.get("error") if isinstance(result, dict) else None
+            raise RuntimeError(f"Cell initialization failed: {error or result}")
+    return loaded
+
+
+def _worker_call(cell_id: str, method_name: str, params: Dict[str, Any]) -> Any:
+    """Call a method of a cell inside the worker process."""
+    global _worker_loop
+
+    method = getattr(_worker_cells[cell_id], method_name)
+    if inspect.iscoroutinefunction(method):
+        # One loop per worker, so async cells keep loop-bound state between calls
+        if _worker_loop is None:
+            _worker_loop = asyncio.new_event_loop()
+        return _worker_loop.run_until_complete(method(**params))
+    return method(**params)
+
+
+class ProcessCell:
+    """
+    A cell running in a dedicated worker process.
+
+    The cell is instantiated inside the worker and its methods are called
+    over the process pool's pipe, so arguments and results must pickle.
+    Public methods of the cell come back as coroutine functions, like
+    LocalCell's. A call still running when its cancellation token is
+    interrupted cannot be stopped inside the worker, so the worker is
+    killed and replaced by a fresh one with a new instance of the cell,
+    initialized again with init_params.
+
+    Attributes:
+        cell_id (str): ID of the cell
+        pid (Optional[int]): Process ID of the worker, once started
+        cpu_affinity (Optional[List[int]]): Cores the worker is pinned to
+        init_params (Optional[Dict[str, Any]]): Keyword arguments the cell
+            was initialized with, replayed in a restarted worker
+    """
+
+    def __init__(
+        self,
+        cell_id: str,
+        cpu_affinity: Optional[List[int]] = None,
+        start_method: Optional[str] = None,
+        on_restart: Optional[Callable[[int], None]] = None,
+        on_restart_failed: Optional[Callable[[BaseException], None]] = None
+    ):
+        """
+        Create the worker process for a cell.
+
+        Args:
+            cell_id: ID of the cell
+            cpu_affinity: Cores to pin the worker to, or None for any core
+            start_method: multiprocessing start method, or None for the
+                platform default
+            on_restart: Called with the new worker's process ID after the
+                worker was replaced
+            on_restart_failed: Called with the error if the cell could not
+                be loaded or initialized in the new worker
+        """
+        self.cell_id = cell_id
+        self.cpu_affinity = cpu_affinity
+        self.pid: Optional[int] = None
+        self.init_params: Optional[Dict[str, Any]] = None
+        self._start_method = start_method
+        self._on_restart = on_restart
+        self._on_restart_failed = on_restart_failed
+        self._source: Tuple[Optional[str], Optional[str]] = (None, None)
+        self._methods: Dict[str, Tuple[str, ...]] = {}
+        self._pool = self._create_pool()
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """Create the single-worker pool the cell runs in."""
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context(self._start_method),
+            initializer=_init_worker,
+            initargs=(self.cpu_affinity,)
+        )
+
+    async def start(self, module_path: Optional[str] = None, code: Optional[str] = None) -> "ProcessCell":
+        """
+        Instantiate the cell in the worker.
+
+        Args:
+            module_path: Module defining the cell class
+            code: Source code defining the cell class, if no module is given
+
+        Returns:
+            This process cell
+        """
+        loop = asyncio.get_event_loop()
+        self._source = (module_path, code)
+        self.pid, methods = await loop.run_in_executor(
+            self._pool, _worker_load, self.cell_id, module_path, code
+        )
+        self._methods = methods
+        logger.debug(f"Started cell {self.cell_id} in worker process {self.pid}")
+        return self
+
+    async def call(self, method_name: str, params: Dict[str, Any]) -> Any:
+        """
+        Call a method of the cell in the worker.
+
+        Args:
+            method_name: Name of the method
+            params: Keyword arguments for the method
+
+        Returns:
+            The method's result
+        """
+        future = self._pool.submit(_worker_call, self.cell_id, method_name, params)
+        token = current_cancellation.get()
+        if token is not None:
+            remove = token.add_interrupt_handler(functools.partial(self._interrupt, future))
+            future.add_done_callback(lambda done: remove())
+        return await asyncio.wrap_future(future)
+
+    def restart(self) -> None:
+        """
+        Kill the worker and replace it with a fresh one.
+
+        The cell is instantiated and initialized again in the new worker,
+        losing the state of the old instance. Calls made meanwhile run once
+        it is initialized.
+        """
+        stuck_pool, stuck_pid = self._pool, self.pid
+        self._pool = self._create_pool()
+        loading = self._pool.submit(_worker_reload, self.cell_id, *self._source, self.init_params)
+        asyncio.wrap_future(loading).add_done_callback(self._restarted)
+
+        if stuck_pid is not None:
+            try:
+                os.kill(stuck_pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError as e:
+                logger.warning(f"Could not kill worker process {stuck_pid} of cell {self.cell_id}: {e}")
+        stuck_pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning(f"Restarting worker process {stuck_pid} of cell {self.cell_id}")
+
+    def _interrupt(self, future: Future) -> bool:
+        """Restart the worker if a cancelled call is still running in it."""
+        if future.done():
+            return False
+        self.restart()
+        return True
+
+    def _restarted(self, loading: "asyncio.Future") -> None:
+        """Record the new worker once the cell is loaded in it."""
+        if loading.cancelled():
+            return
+        if loading.exception() is not None:
+            logger.error(f"Could not restart cell {self.cell_id} in a new worker: {loading.exception()}")
+            if self._on_restart_failed is not None:
+                self._on_restart_failed(loading.exception())
+            return
+        self.pid, methods = loading.result()
+        self._methods = methods
+        logger.debug(f"Restarted cell {self.cell_id} in worker process {self.pid}")
+        if self._on_restart is not None:
+            self._on_restart(self.pid)
+
+    def parameter_names(self, method_name: str) -> Tuple[str, ...]:
+        """
+        Get the names of the parameters a method of the cell declares.
+
+        Args:
+            method_name: Name of the method
+
+        Returns:
+            Parameter names, empty if the cell has no such method
+        """
+        return self._methods.get(method_name, ())
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.debug(f"Stopped worker process {self.pid} of cell {self.cell_id}")
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self._methods:
+            raise AttributeError(f"Cell {self.cell_id} has no method '{name}'")
+
+        async def call(**params):
+            return await self.call(name, params)
+
+        call.__name__ = name
+        return call
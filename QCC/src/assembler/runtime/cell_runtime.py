@@ -10,6 +10,7 @@ import asyncio
 from typing import Dict, List, Any, Optional, Set
 
 from qcc.common.models import Cell
+from qcc.common.telemetry import telemetry
 
 from .cell_connector import CellConnector
 from .lifecycle_manager import LifecycleManager
@@ -56,13 +57,15 @@ class CellRuntime:
         logger.info(f"Activating cell: {cell.id}")
         
         # Allocate resources
-        resources_allocated = await self.resource_manager.allocate_resources(cell)
+        with telemetry.span("runtime.allocate_resources", cell_id=cell.id):
+            resources_allocated = await self.resource_manager.allocate_resources(cell)
         if not resources_allocated:
             logger.error(f"Failed to allocate resources for cell: {cell.id}")
             raise RuntimeError(f"Resource allocation failed for cell: {cell.id}")
             
         # Activate the cell
-        activated = await self.lifecycle_manager.activate(cell)
+        with telemetry.span("runtime.activate_cell", cell_id=cell.id, capability=cell.capability):
+            activated = await self.lifecycle_manager.activate(cell)
         if not activated:
             # Release resources if activation fails
             await self.resource_manager.release_resources(cell)
@@ -185,7 +188,8 @@ class CellRuntime:
         logger.info(f"Connecting cells: {source_cell.id} -> {target_cell.id}")
         
         # Create the connection
-        connected = await self.connector.connect(source_cell, target_cell)
+        with telemetry.span("runtime.connect_cells", source=source_cell.id, target=target_cell.id):
+            connected = await self.connector.connect(source_cell, target_cell)
         
         logger.info(f"Cells connected: {source_cell.id} -> {target_cell.id}")
         return connected
@@ -0,0 +1,199 @@
+"""
+Cell class loading for the QCC Assembler.
+
+This module provides the CellClassCache class, which resolves the class
+of a cell from its module path or source code once and reuses it for
+every later instance. Modules are reloaded and code is recompiled only
+when their content changes.
+"""
+
+import os
+import inspect
+import hashlib
+import logging
+import importlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CellClassEntry:
+    """
+    A resolved cell class.
+
+    Attributes:
+        cell_class (type): Class to instantiate
+        namespace (Dict[str, Any]): Globals the class was defined in
+        module_name (Optional[str]): Module of the class, for module cells
+        filename (Optional[str]): File the class's code was compiled from
+        fingerprint (Optional[Tuple]): Source file state or code hash
+            the class was loaded from
+    """
+    cell_class: type
+    namespace: Dict[str, Any]
+    module_name: Optional[str]
+    filename: Optional[str]
+    fingerprint: Optional[Tuple]
+
+
+def code_filename(code: Any) -> str:
+    """
+    Name the pseudo-file cell code is compiled as.
+
+    Args:
+        code: Cell source as str or bytes
+
+    Returns:
+        Filename unique to the code's content
+    """
+    source = code.encode('utf-8') if isinstance(code, str) else bytes(code)
+    return f"<cell {hashlib.sha256(source).hexdigest()[:12]}>"
+
+
+def find_cell_class(candidates: Iterable[Any]) -> Optional[type]:
+    """
+    Pick the cell class among module or namespace members.
+
+    Args:
+        candidates: Objects defined by the cell's module or code
+
+    Returns:
+        The first class with a callable initialize method, or None
+    """
+    for obj in candidates:
+        if inspect.isclass(obj) and callable(getattr(obj, 'initialize', None)):
+            return obj
+    return None
+
+
+class CellClassCache:
+    """
+    Cache of cell classes keyed by module path or code content hash.
+
+    Module cells are imported once; later loads only compare the module
+    file's modification time and size, and reload the module when it
+    changed. Code cells are compiled and executed once per distinct
+    source. Cells of the same type therefore share one class and one
+    module namespace, as instances of any Python class do.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached code cell classes
+        """
+        self.max_entries = max_entries
+        self._modules: Dict[str, CellClassEntry] = {}
+        self._code: "OrderedDict[str, CellClassEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    def load_module(self, module_path: str) -> CellClassEntry:
+        """
+        Resolve the cell class of a module.
+
+        Args:
+            module_path: Importable module name
+
+        Returns:
+            The cached or newly loaded entry
+
+        Raises:
+            ImportError: If the module cannot be imported
+            ValueError: If the module defines no cell class
+        """
+        with self._lock:
+            entry = self._modules.get(module_path)
+            if entry is not None:
+                module = importlib.import_module(module_path)
+                if self._fingerprint(module) == entry.fingerprint:
+                    self.stats["hits"] += 1
+                    return entry
+
+                # Source changed since the class was loaded
+                module = importlib.reload(module)
+                self.stats["reloads"] += 1
+                logger.info(f"Reloaded changed cell module {module_path}")
+            else:
+                module = importlib.import_module(module_path)
+                self.stats["misses"] += 1
+
+            cell_class = find_cell_class(
+                obj for _, obj in inspect.getmembers(module)
+                if getattr(obj, '__module__', None) == module_path
+            )
+            if cell_class is None:
+                raise ValueError(f"No valid cell class found in module {module_path}")
+
+            entry = CellClassEntry(
+                cell_class, vars(module), module_path, getattr(module, '__file__', None), self._fingerprint(module)
+            )
+            self._modules[module_path] = entry
+            return entry
+
+    def load_code(self, code: Any) -> CellClassEntry:
+        """
+        Resolve the cell class defined by source code.
+
+        Args:
+            code: Cell source as str or bytes
+
+        Returns:
+            The cached or newly compiled entry
+
+        Raises:
+            SyntaxError: If the code does not compile
+            ValueError: If the code defines no cell class
+        """
+        source = code.encode('utf-8') if isinstance(code, str) else bytes(code)
+        digest = hashlib.sha256(source).hexdigest()
+
+        with self._lock:
+            entry = self._code.get(digest)
+            if entry is not None:
+                self._code.move_to_end(digest)
+                self.stats["hits"] += 1
+                return entry
+
+            self.stats["misses"] += 1
+            namespace: Dict[str, Any] = {}
+            filename = f"<cell {digest[:12]}>"
+            exec(compile(source, filename, "exec"), namespace)
+
+            cell_class = find_cell_class(namespace.values())
+            if cell_class is None:
+                raise ValueError("No valid cell class found in cell code")
+
+            entry = CellClassEntry(cell_class, namespace, None, filename, (digest,))
+            self._code[digest] = entry
+            if len(self._code) > self.max_entries:
+                self._code.popitem(last=False)
+            return entry
+
+    def clear(self) -> None:
+        """Forget every cached class."""
+        with self._lock:
+            self._modules.clear()
+            self._code.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit, miss and reload counts and the number of cached classes."""
+        return {**self.stats, "entries": len(self._modules) + len(self._code)}
+
+    @staticmethod
+    def _fingerprint(module: Any) -> Optional[Tuple]:
+        """Fingerprint a module's source file by path, modification time and size."""
+        path = getattr(module, '__file__', None)
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (path, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,199 @@
+"""
+Single-flight coalescing of capability calls for the QCC Assembler.
+
+This module provides the SingleFlight class, which lets concurrent
+identical calls to an idempotent capability share one execution, and
+keeps each result for a short time so calls right after it are served
+without executing again. Capabilities opt in through their manifest entry:
+
+    {"name": "file_info", ..., "coalesce": {"cache_ttl_ms": 250}}
+"""
+
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+def get_coalescing_policies(cell: Any) -> Dict[str, float]:
+    """
+    Read the capabilities a cell's manifest declares as coalescible.
+
+    Args:
+        cell: Cell object, optionally with a manifest dictionary or object
+
+    Returns:
+        Dictionary mapping capability names to result cache TTLs in seconds
+    """
+    manifest = getattr(cell, "manifest", None)
+    if isinstance(manifest, dict):
+        capabilities = manifest.get("capabilities")
+    else:
+        capabilities = getattr(manifest, "capabilities", None)
+
+    policies = {}
+    for capability in capabilities or []:
+        coalesce = capability.get("coalesce") if isinstance(capability, dict) else None
+        if coalesce:
+            settings = coalesce if isinstance(coalesce, dict) else {}
+            policies[capability["name"]] = settings.get("cache_ttl_ms", 0) / 1000
+    return policies
+
+
+def call_key(capability: str, parameters: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the key identifying identical calls.
+
+    Args:
+        capability: Name of the capability
+        parameters: Parameters of the call
+
+    Returns:
+        Canonical key, or None if the parameters are not JSON data and
+        calls cannot be compared
+    """
+    try:
+        return f"{capability}:{json.dumps(parameters, sort_keys=True, separators=(',', ':'))}"
+    except (TypeError, ValueError):
+        return None
+
+
+class SingleFlight:
+    """
+    Shares in-flight executions and recent results of identical calls.
+
+    The first call for a key runs the execution as its own task; calls
+    arriving while it runs wait for the same task, and one caller giving
+    up does not cancel it for the others. Successful results are cached
+    per cell for the capability's TTL; failures are never cached. Every
+    caller receives its own shallow copy of a dictionary result.
+
+    Attributes:
+        max_entries (int): Maximum cached results per cell
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize with nothing in flight or cached.
+
+        Args:
+            max_entries: Maximum cached results per cell
+        """
+        self.max_entries = max_entries
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._results: Dict[str, "OrderedDict[str, Tuple[float, Any]]"] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        # Bumped by invalidate() so executions started before it are not cached
+        self._generations: Dict[str, int] = {}
+
+    async def run(
+        self,
+        cell_id: str,
+        key: str,
+        ttl_seconds: float,
+        execute: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Get the result of a call, executing it only if no identical call can serve it.
+
+        Args:
+            cell_id: ID of the cell the call targets
+            key: Key identifying identical calls (see call_key)
+            ttl_seconds: How long the result may be reused
+            execute: Starts the actual execution
+            timeout: Seconds this caller waits for a shared execution
+
+        Returns:
+            Tuple of the result and whether this call started the execution
+
+        Raises:
+            asyncio.TimeoutError: If the timeout passes first
+            Exception: Whatever the shared execution raised
+        """
+        stats = self._stats.setdefault(cell_id, {"executed": 0, "joined": 0, "cached": 0})
+
+        results = self._results.get(cell_id)
+        if results is not None and key in results:
+            expires_at, result = results[key]
+            if expires_at > time.monotonic():
+                results.move_to_end(key)
+                stats["cached"] += 1
+                return self._copy(result), False
+            del results[key]
+
+        task = self._in_flight.get((cell_id, key))
+        started = task is None
+        if started:
+            task = asyncio.ensure_future(execute())
+            self._in_flight[(cell_id, key)] = task
+            generation = self._generations.get(cell_id, 0)
+            task.add_done_callback(lambda done: self._finish(cell_id, key, ttl_seconds, generation, done))
+            stats["executed"] += 1
+        else:
+            stats["joined"] += 1
+
+        result = await asyncio.wait_for(asyncio.shield(task), timeout)
+        return self._copy(result), started
+
+    def invalidate(self, cell_id: str) -> None:
+        """
+        Drop the cached results of a cell, e.g. after a call that may change them.
+
+        Executions already running finish for their callers, but later
+        calls no longer join them and their results are not cached.
+
+        Args:
+            cell_id: ID of the cell
+        """
+        self._generations[cell_id] = self._generations.get(cell_id, 0) + 1
+        results = self._results.get(cell_id)
+        if results:
+            results.clear()
+        for flight in [flight for flight in self._in_flight if flight[0] == cell_id]:
+            del self._in_flight[flight]
+
+    def remove_cell(self, cell_id: str) -> None:
+        """Forget everything about a released cell."""
+        self.invalidate(cell_id)
+        self._results.pop(cell_id, None)
+        self._stats.pop(cell_id, None)
+        self._generations.pop(cell_id, None)
+
+    def get_stats(self, cell_id: str) -> Dict[str, int]:
+        """
+        Get how a cell's coalesced calls were served.
+
+        Args:
+            cell_id: ID of the cell
+
+        Returns:
+            Counts of executed, joined and cached calls
+        """
+        return dict(self._stats.get(cell_id, {"executed": 0, "joined": 0, "cached": 0}))
+
+    def _finish(self, cell_id: str, key: str, ttl_seconds: float, generation: int, task: asyncio.Future) -> None:
+        """Stop sharing a finished execution and cache its result."""
+        if self._in_flight.get((cell_id, key)) is task:
+            del self._in_flight[(cell_id, key)]
+
+        if task.cancelled() or task.exception() is not None or ttl_seconds <= 0:
+            return
+        if cell_id not in self._stats or self._generations.get(cell_id, 0) != generation:
+            # Cell was released or its results invalidated while the call ran
+            return
+
+        results = self._results.setdefault(cell_id, OrderedDict())
+        results[key] = (time.monotonic() + ttl_seconds, task.result())
+        results.move_to_end(key)
+        if len(results) > self.max_entries:
+            results.popitem(last=False)
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        """Give a caller its own top level of a shared result."""
+        return dict(result) if isinstance(result, dict) else result
@@ -0,0 +1,278 @@
+"""
+Deadlines and cancellation for cell method execution.
+
+This module provides the pieces the CellExecutor uses to bound how long a
+cell method may run:
+
+- AdaptiveTimeouts derives a deadline per cell type and method from its
+  observed latency, instead of one global timeout for every call.
+- The current_deadline context variable carries a caller's deadline into
+  the calls it makes, so nested capability calls share the same budget.
+- CancellationToken lets sync cell methods stop early when cancelled.
+  When forced interrupts are enabled it also stops a method that ignores
+  it by raising ExecutionCancelledError in its thread, so runaway calls
+  give their thread pool slot back. The current_cancellation context
+  variable hands the token to execution backends that run the method in
+  another thread or process.
+"""
+
+import time
+import ctypes
+import logging
+import threading
+import contextvars
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+from qcc.common.exceptions import ExecutionCancelledError
+from qcc.common.telemetry import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline of the capability call being executed
+current_deadline: contextvars.ContextVar = contextvars.ContextVar("current_deadline", default=None)
+
+# CancellationToken of the cell method call being executed
+current_cancellation: contextvars.ContextVar = contextvars.ContextVar("current_cancellation", default=None)
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation signal for one cell method call.
+
+    Sync cell methods receive the token when they declare a
+    ``cancellation_token`` parameter and should call
+    ``raise_if_cancelled()`` between units of work. With force_interrupt,
+    a method still running in a thread after ``interrupt()`` gets
+    ExecutionCancelledError raised asynchronously in that thread at its
+    next Python bytecode. That can land anywhere, including in a finally
+    block or while a lock is held, so it is off unless enabled; native
+    code that never returns to Python cannot be interrupted either way.
+    Calls running elsewhere, such as in a worker process, are stopped by
+    the interrupt handlers their backend registers.
+
+    Attributes:
+        deadline (Optional[float]): Absolute time.monotonic() deadline
+        reason (Optional[str]): Why the call was cancelled
+        force_interrupt (bool): Whether interrupt() raises in the call's thread
+    """
+
+    def __init__(self, deadline: Optional[float] = None, force_interrupt: bool = False):
+        """
+        Initialize an uncancelled token.
+
+        Args:
+            deadline: Absolute time.monotonic() deadline of the call
+            force_interrupt: Raise ExecutionCancelledError in the thread
+                running the call when it is interrupted
+        """
+        self.deadline = deadline
+        self.force_interrupt = force_interrupt
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread_id: Optional[int] = None
+        self._interrupt_handlers: List[Callable[[], bool]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the call was cancelled."""
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline, or None without one."""
+        return None if self.deadline is None else max(self.deadline - time.monotonic(), 0.0)
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """
+        Ask the call to stop.
+
+        Args:
+            reason: Why the call is cancelled
+        """
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Stop the calling method if the call was cancelled.
+
+        Raises:
+            ExecutionCancelledError: If the call was cancelled
+        """
+        if self._event.is_set():
+            raise ExecutionCancelledError(f"Execution cancelled: {self.reason}", reason=self.reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until cancelled or the timeout passes, for methods that poll.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            True if the call was cancelled
+        """
+        return self._event.wait(timeout)
+
+    def run(self, function, *args, **kwargs) -> Any:
+        """
+        Run a function in the current thread, interruptible if forced
+        interrupts are enabled.
+
+        Args:
+            function: Function to run
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's result
+        """
+        with self._lock:
+            self._thread_id = threading.get_ident()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._thread_id = None
+                if self.force_interrupt:
+                    # Drop an interrupt that was raised too late to fire in the function
+                    _set_async_exc(threading.get_ident(), None)
+
+    def add_interrupt_handler(self, handler: Callable[[], bool]) -> Callable[[], None]:
+        """
+        Register a function that stops the call where run() cannot reach it.
+
+        Args:
+            handler: Function stopping the call, returning True if it was
+                still running
+
+        Returns:
+            Function removing the handler once the call has finished
+        """
+        with self._lock:
+            self._interrupt_handlers.append(handler)
+
+        def remove() -> None:
+            with self._lock:
+                if handler in self._interrupt_handlers:
+                    self._interrupt_handlers.remove(handler)
+
+        return remove
+
+    def interrupt(self) -> bool:
+        """
+        Run the interrupt handlers and, with force_interrupt, raise
+        ExecutionCancelledError in the thread running the call, if any.
+
+        Returns:
+            True if a running call was interrupted
+        """
+        with self._lock:
+            thread_id = self._thread_id if self.force_interrupt else None
+            interrupted = thread_id is not None and _set_async_exc(thread_id, ExecutionCancelledError)
+            handlers = list(self._interrupt_handlers)
+        if interrupted:
+            logger.warning(f"Interrupted thread {thread_id} still running after cancellation: {self.reason}")
+
+        for handler in handlers:
+            try:
+                interrupted = handler() or interrupted
+            except Exception as e:
+                logger.error(f"Interrupt handler failed after cancellation: {e}")
+        return interrupted
+
+
+def _set_async_exc(thread_id: int, exception_type: Optional[type]) -> bool:
+    """Set or, with None, clear the pending asynchronous exception of a thread."""
+    pythonapi = getattr(ctypes, "pythonapi", None)
+    if pythonapi is None:
+        return False
+    exception = ctypes.py_object(exception_type) if exception_type is not None else None
+    return pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exception) == 1
+
+
+class AdaptiveTimeouts:
+    """
+    Per-method deadlines derived from observed latency.
+
+    Every completed or timed-out call is recorded in a latency histogram
+    for its cell type and method. Once enough samples exist, the timeout
+    is the p99 latency times a multiplier, kept between a floor and the
+    global execution timeout. Timed-out calls record their full timeout,
+    so a method that legitimately got slower backs off toward the ceiling.
+
+    Attributes:
+        default_ms (float): Timeout before enough samples, and the ceiling
+        multiplier (float): Factor applied to the p99 latency
+        min_samples (int): Samples needed before adapting
+        floor_ms (float): Smallest adaptive timeout
+        enabled (bool): Whether timeouts adapt at all
+    """
+
+    def __init__(
+        self,
+        default_ms: float,
+        multiplier: float = 3.0,
+        min_samples: int = 20,
+        floor_ms: float = 100.0,
+        enabled: bool = True
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            default_ms: Timeout before enough samples, and the ceiling
+            multiplier: Factor applied to the p99 latency
+            min_samples: Samples needed before adapting
+            floor_ms: Smallest adaptive timeout
+            enabled: Whether timeouts adapt at all
+        """
+        self.default_ms = default_ms
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.floor_ms = floor_ms
+        self.enabled = enabled
+        self._latencies: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, type_key: str, method_name: str, latency_ms: float) -> None:
+        """
+        Record the latency of a call.
+
+        Args:
+            type_key: Identifies the cell type
+            method_name: Name of the method called
+            latency_ms: Duration of the call in milliseconds
+        """
+        histogram = self._latencies.get((type_key, method_name))
+        if histogram is None:
+            histogram = self._latencies[(type_key, method_name)] = LatencyHistogram()
+        histogram.record(latency_ms)
+
+    def timeout_ms(self, type_key: str, method_name: str) -> float:
+        """
+        Get the timeout for a call.
+
+        Args:
+            type_key: Identifies the cell type
+            method_name: Name of the method to call
+
+        Returns:
+            Timeout in milliseconds
+        """
+        histogram = self._latencies.get((type_key, method_name))
+        if not self.enabled or histogram is None or histogram.count < self.min_samples:
+            return self.default_ms
+        adaptive = histogram.percentile(99) * self.multiplier
+        return min(max(adaptive, self.floor_ms), self.default_ms)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the latency summary and current timeout of every tracked method."""
+        return {
+            f"{type_key}.{method_name}": {
+                "p99_ms": histogram.percentile(99),
+                "count": histogram.count,
+                "timeout_ms": self.timeout_ms(type_key, method_name)
+            }
+            for (type_key, method_name), histogram in self._latencies.items()
+        }
@@ -18,22 +18,32 @@ import logging
 import time
 import uuid
 import os
-import sys
 import json
-import importlib
+import pickle
 import inspect
+import itertools
+import functools
 import traceback
-from typing import Dict, List, Any, Optional, Tuple, Union, Set, Callable
+from typing import Dict, List, Any, Optional, Tuple, Union, Set, Callable, AsyncIterator
 from datetime import datetime
 
 # Local imports
 from qcc.common.exceptions import (
     CellExecutionError, CellNotFoundError, CellCommunicationError,
-    ResourceLimitExceededError, SecurityError, CellLifecycleError
+    ResourceLimitExceededError, SecurityError, CellLifecycleError, ExecutionCancelledError
 )
 from qcc.common.models import Cell
 import qcc.common.utils as utils
 
+from .message_bus import MessageBus, DROPPED, TIMED_OUT, CLOSED
+from .payload import transfer_payloads, return_payloads
+from .class_loader import CellClassCache, code_filename
+from .accounting import ResourceAccountant, MEMORY_SHARED, metered, call_timed
+from .deadlines import AdaptiveTimeouts, CancellationToken, current_deadline, current_cancellation
+from .backends import EXECUTION_BACKENDS, LocalCell, ProcessCell, get_execution_settings
+from .coalescing import SingleFlight, call_key, get_coalescing_policies
+from .snapshots import SnapshotStore, StateSnapshot
+
 logger = logging.getLogger(__name__)
 
 class CellExecutor:
@@ -63,15 +73,38 @@ class CellExecutor:
         self.max_concurrent_cells = self.execution_settings.get('max_concurrent_cells', 20)
         self.resource_monitoring_interval_ms = self.execution_settings.get('resource_monitoring_interval_ms', 1000)
         
+        # Channel flow control: bound, overflow policy and how long a blocked sender waits
+        self.channel_max_depth = self.execution_settings.get('channel_max_depth', 1000)
+        self.channel_overflow_policy = self.execution_settings.get('channel_overflow_policy', 'block')
+        self.channel_coalesce_key = self.execution_settings.get('channel_coalesce_key', 'key')
+        self.channel_block_timeout_ms = self.execution_settings.get('channel_block_timeout_ms', self.execution_timeout_ms)
+        
+        # Execution backends: where cells run unless their manifest says otherwise
+        self.default_execution_backend = self.execution_settings.get('default_execution_backend', 'auto')
+        self.max_worker_processes = self.execution_settings.get('max_worker_processes', os.cpu_count() or 1)
+        self.pin_worker_processes = self.execution_settings.get('pin_worker_processes', False)
+        self.worker_start_method = self.execution_settings.get('worker_start_method')
+        
+        # Idle suspension: cells idle this long are suspended while memory use is high
+        self.idle_suspend_ms = self.execution_settings.get('idle_suspend_ms')
+        self.idle_suspend_memory_percent = self.execution_settings.get('idle_suspend_memory_percent', 80)
+        
         # Active cells dictionary: cell_id -> cell_instance
         self.active_cells = {}
         
         # Cell resource usage tracking: cell_id -> resource_stats
         self.cell_resources = {}
         
-        # Cell communication channels: (source_cell_id, target_cell_id) -> channel
+        # Cell communication channels: (source_cell_id, target_cell_id) -> channel info
         self.communication_channels = {}
         
+        # Per-cell inboxes carrying the messages of those channels
+        self.message_bus = MessageBus()
+        
+        # Message IDs are unique per executor prefix
+        self._message_id_prefix = uuid.uuid4().hex[:12]
+        self._message_counter = itertools.count(1)
+        
         # Resource monitoring task
         self.monitoring_task = None
         
@@ -81,11 +114,52 @@ class CellExecutor:
         # Cell capability cache: cell_id -> {capability_name -> function}
         self.capability_cache = {}
         
+        # Worker processes of cells on the process backend: cell_id -> ProcessCell
+        self.cell_processes = {}
+        
+        # Resolved cell classes by module path or code hash
+        self.class_cache = CellClassCache(self.execution_settings.get('cell_class_cache_size', 256))
+        
+        # Per-cell memory and CPU accounting; memory limits of cells in this
+        # process can only be enforced against traced allocations
+        self.accountant = ResourceAccountant(
+            trace_allocations=self.execution_settings.get('trace_cell_allocations', False),
+            trace_frames=self.execution_settings.get('trace_frames', 16),
+            scan_interval_seconds=self.execution_settings.get('allocation_scan_interval_ms', 5000) / 1000
+        )
+        
+        # Per-method timeouts adapted to observed latency, capped by execution_timeout_ms
+        self.timeouts = AdaptiveTimeouts(
+            default_ms=self.execution_timeout_ms,
+            multiplier=self.execution_settings.get('timeout_multiplier', 3.0),
+            min_samples=self.execution_settings.get('timeout_min_samples', 20),
+            floor_ms=self.execution_settings.get('min_timeout_ms', 100),
+            enabled=self.execution_settings.get('adaptive_timeouts', True)
+        )
+        self.cancellation_grace_ms = self.execution_settings.get('cancellation_grace_ms', 100)
+        # Raising in the thread of a method that ignores cancellation is unsafe, so opt-in
+        self.force_cancellation_interrupts = self.execution_settings.get('force_cancellation_interrupts', False)
+        self._token_parameters = {}
+        
+        # Shared executions and short-lived results of coalescible capabilities
+        self.single_flight = SingleFlight(self.execution_settings.get('coalescing_cache_size', 1024))
+        
+        # Compact snapshots of the state suspended cells saved
+        self.snapshots = SnapshotStore(
+            compression=self.execution_settings.get('snapshot_compression', 'zlib'),
+            compression_level=self.execution_settings.get('snapshot_compression_level', 1),
+            spill_threshold_bytes=self.execution_settings.get('snapshot_spill_threshold_bytes', 16 * 1024 * 1024),
+            spill_dir=self.execution_settings.get('snapshot_spill_dir'),
+            delta=self.execution_settings.get('delta_snapshots', True)
+        )
+        self._idle_resumes = {}
+        
         logger.info(f"Cell Executor initialized with max {self.max_concurrent_cells} concurrent cells")
 
     async def start(self):
         """Start the cell executor and resource monitoring."""
         if self.monitoring_task is None:
+            self.accountant.start()
             self.monitoring_task = asyncio.create_task(self._monitor_resources())
             logger.info("Cell resource monitoring started")
 
@@ -108,6 +182,8 @@ class CellExecutor:
             except Exception as e:
                 logger.error(f"Error releasing cell {cell_id} during shutdown: {e}")
         
+        self.accountant.stop()
+        
         logger.info("Cell Executor stopped")
 
     async def initialize_cell(self, cell: Cell) -> str:
@@ -135,7 +211,8 @@ class CellExecutor:
             # Create execution environment for the cell
             cell_env = await self._create_cell_environment(cell)
             
-            # Store the environment
+            # Store the environment, with the cell to rebuild it from on resume
+            cell_env['cell'] = cell
             self.cell_environments[cell_id] = cell_env
             
             # Initialize cell instance
@@ -199,7 +276,9 @@ class CellExecutor:
                 'cell_id': cell.id if hasattr(cell, 'id') else str(uuid.uuid4()),
                 'provider': cell.provider if hasattr(cell, 'provider') else 'unknown',
                 'permissions': []
-            }
+            },
+            'execution': self._select_execution(cell),
+            'coalesce': get_coalescing_policies(cell)
         }
         
         # Add cell-specific resource limits if provided
@@ -222,6 +301,39 @@ class CellExecutor:
         
         return cell_env
 
+    def _select_execution(self, cell: Cell) -> Dict[str, Any]:
+        """
+        Choose where a cell runs from its manifest's execution section.
+        
+        Cells without one use the default_execution_backend setting. Process
+        placement falls back to the thread backend once max_worker_processes
+        workers are running.
+        
+        Args:
+            cell: Cell object
+            
+        Returns:
+            Execution settings with the chosen backend and CPU affinity
+        """
+        execution = get_execution_settings(cell)
+        backend = execution.get('backend', self.default_execution_backend)
+        
+        if backend not in EXECUTION_BACKENDS:
+            logger.warning(f"Unknown execution backend '{backend}' for cell {getattr(cell, 'id', None)}, using 'auto'")
+            backend = 'auto'
+        
+        if backend == 'process' and len(self.cell_processes) >= self.max_worker_processes:
+            logger.warning(f"Worker process limit ({self.max_worker_processes}) reached, running cell "
+                           f"{getattr(cell, 'id', None)} on the thread backend")
+            backend = 'thread'
+        
+        cpu_affinity = execution.get('cpu_affinity')
+        if backend == 'process' and cpu_affinity is None and self.pin_worker_processes:
+            # Spread pinned workers across cores round-robin
+            cpu_affinity = [len(self.cell_processes) % (os.cpu_count() or 1)]
+        
+        return {'backend': backend, 'cpu_affinity': cpu_affinity}
+
     async def _destroy_cell_environment(self, cell_id: str) -> None:
         """
         Destroy a cell's execution environment and clean up resources.
@@ -230,16 +342,17 @@ class CellExecutor:
             cell_id: ID of the cell to clean up
         """
         if cell_id in self.cell_environments:
-            # Clean up modules
-            for module_name in self.cell_environments[cell_id].get('modules', {}):
-                if module_name in sys.modules:
-                    try:
-                        del sys.modules[module_name]
-                    except Exception:
-                        pass
+            # Modules and code namespaces stay in the class cache, shared
+            # with other cells of the same type
+            
+            # Stop the cell's worker process
+            cell_process = self.cell_processes.pop(cell_id, None)
+            if cell_process is not None:
+                cell_process.close()
             
-            # Clean up globals
-            self.cell_environments[cell_id]['globals'].clear()
+            self.accountant.unregister(cell_id)
+            self.single_flight.remove_cell(cell_id)
+            self.snapshots.discard(cell_id)
             
             # Remove from environments dictionary
             del self.cell_environments[cell_id]
@@ -262,59 +375,51 @@ class CellExecutor:
             CellExecutionError: If cell instantiation fails
         """
         cell_instance = None
+        backend = cell_env.get('execution', {}).get('backend', 'auto')
         
         try:
             # Different instantiation methods based on cell type
-            if hasattr(cell, 'module_path') and cell.module_path:
-                # Import from module path
-                module_name = cell.module_path
-                if module_name in sys.modules:
-                    # Reload the module if it's already loaded
-                    module = importlib.reload(sys.modules[module_name])
-                else:
-                    # Import the module
-                    module = importlib.import_module(module_name)
+            if backend == 'process':
+                # Instantiate inside the cell's own worker process
+                if not getattr(cell, 'module_path', None) and not getattr(cell, 'code', None):
+                    raise CellExecutionError("Process backend requires cell code or a module path")
                 
-                # Find the cell class in the module
-                cell_class = None
-                for name, obj in inspect.getmembers(module):
-                    if inspect.isclass(obj) and issubclass(obj, object) and obj.__module__ == module_name:
-                        if hasattr(obj, 'initialize') and callable(getattr(obj, 'initialize')):
-                            cell_class = obj
-                            break
+                cell_process = ProcessCell(
+                    cell_id,
+                    cpu_affinity=cell_env['execution']['cpu_affinity'],
+                    start_method=self.worker_start_method,
+                    on_restart=functools.partial(self.accountant.replace_worker, cell_id),
+                    on_restart_failed=functools.partial(self._fail_restarted_cell, cell_id)
+                )
+                self.cell_processes[cell_id] = cell_process
+                cell_instance = await cell_process.start(
+                    getattr(cell, 'module_path', None), getattr(cell, 'code', None)
+                )
+                self.accountant.register(cell_id, pid=cell_process.pid)
+                cell_env['type_key'] = getattr(cell, 'module_path', None) or code_filename(cell.code)
                 
-                if not cell_class:
-                    raise CellExecutionError(f"No valid cell class found in module {module_name}")
+            elif hasattr(cell, 'module_path') and cell.module_path:
+                # Resolve the class from its module, imported once and
+                # reloaded only when the module's source changes
+                entry = self.class_cache.load_module(cell.module_path)
                 
                 # Instantiate the cell class
-                cell_instance = cell_class()
+                cell_instance = entry.cell_class()
                 
-                # Store the module in the environment
-                cell_env['modules'][module_name] = module
+                # Record the module in the environment
+                cell_env['modules'][entry.module_name] = entry.namespace
+                cell_env['type_key'] = entry.module_name
+                self.accountant.register(cell_id, source_file=entry.filename)
                 
             elif hasattr(cell, 'code') and cell.code:
-                # Dynamically execute cell code
-                cell_code = cell.code
-                
-                # Create a namespace for the cell code
-                cell_globals = {}
-                cell_env['globals'] = cell_globals
-                
-                # Execute cell code in the namespace
-                exec(cell_code, cell_globals)
-                
-                # Find the cell class in the namespace
-                cell_class = None
-                for name, obj in cell_globals.items():
-                    if inspect.isclass(obj) and hasattr(obj, 'initialize') and callable(getattr(obj, 'initialize')):
-                        cell_class = obj
-                        break
-                
-                if not cell_class:
-                    raise CellExecutionError("No valid cell class found in cell code")
+                # Resolve the class from the code, compiled once per distinct source
+                entry = self.class_cache.load_code(cell.code)
+                cell_env['globals'] = entry.namespace
+                cell_env['type_key'] = entry.filename
+                self.accountant.register(cell_id, source_file=entry.filename)
                 
                 # Instantiate the cell class
-                cell_instance = cell_class()
+                cell_instance = entry.cell_class()
                 
             elif hasattr(cell, 'wasm_module') and cell.wasm_module:
                 # For WebAssembly cells, we'd use a WebAssembly runtime
@@ -325,6 +430,9 @@ class CellExecutor:
             else:
                 raise CellExecutionError("No valid cell code or module provided")
             
+            if backend in ('loop', 'thread'):
+                cell_instance = LocalCell(cell_instance, backend, charge=self.accountant.charger(cell_id))
+            
             # Initialize the cell with parameters
             init_params = {
                 'cell_id': cell_id,
@@ -337,8 +445,12 @@ class CellExecutor:
             if hasattr(cell, 'provider'):
                 init_params['provider'] = cell.provider
                 
+            # A restarted worker process initializes its cell the same way
+            if cell_id in self.cell_processes:
+                self.cell_processes[cell_id].init_params = init_params
+                
             # Call initialize method
-            init_result = await self._execute_cell_method(cell_instance, 'initialize', init_params)
+            init_result = await self._execute_cell_method(cell_instance, 'initialize', init_params, cell_id=cell_id)
             
             # Validate initialization result
             if not init_result or not isinstance(init_result, dict) or init_result.get('status') != 'success':
@@ -364,6 +476,18 @@ class CellExecutor:
             logger.error(traceback.format_exc())
             raise CellExecutionError(f"Cell instantiation failed: {str(e)}")
 
+    def _fail_restarted_cell(self, cell_id: str, error: BaseException) -> None:
+        """
+        Mark a cell failed after its restarted worker could not initialize it.
+        
+        Args:
+            cell_id: ID of the cell
+            error: Error raised while loading or initializing the cell
+        """
+        if cell_id in self.cell_resources:
+            self.cell_resources[cell_id]['status'] = 'failed'
+            logger.error(f"Cell {cell_id} failed after its worker was restarted: {error}")
+
     def _get_allowed_imports(self, cell: Cell) -> List[str]:
         """
         Determine allowed imports for a cell based on its type and permissions.
@@ -443,7 +567,7 @@ class CellExecutor:
             cell_instance = self.active_cells[cell_id]
             
             if hasattr(cell_instance, 'activate') and callable(cell_instance.activate):
-                result = await self._execute_cell_method(cell_instance, 'activate')
+                result = await self._execute_cell_method(cell_instance, 'activate', cell_id=cell_id)
             else:
                 # If no activate method, assume success
                 result = {
@@ -490,7 +614,7 @@ class CellExecutor:
             cell_instance = self.active_cells[cell_id]
             
             if hasattr(cell_instance, 'deactivate') and callable(cell_instance.deactivate):
-                result = await self._execute_cell_method(cell_instance, 'deactivate')
+                result = await self._execute_cell_method(cell_instance, 'deactivate', cell_id=cell_id)
             else:
                 # If no deactivate method, assume success
                 result = {
@@ -514,6 +638,13 @@ class CellExecutor:
         """
         Suspend an active cell, preserving its state.
         
+        State the cell saves as a dictionary is also snapshotted into a
+        StateSnapshot, returned under 'snapshot', which resume_cell accepts
+        in place of the saved state. The executor then drops the cell's
+        instance, and worker process, and rebuilds it from the snapshot on
+        resume. Cells whose state cannot be pickled, or whose resume method
+        cannot take saved state, stay live instead.
+        
         Args:
             cell_id: ID of the cell to suspend
             
@@ -537,7 +668,7 @@ class CellExecutor:
             cell_instance = self.active_cells[cell_id]
             
             if hasattr(cell_instance, 'suspend') and callable(cell_instance.suspend):
-                result = await self._execute_cell_method(cell_instance, 'suspend')
+                result = await self._execute_cell_method(cell_instance, 'suspend', cell_id=cell_id)
             else:
                 # If no suspend method, assume success with empty state
                 result = {
@@ -546,6 +677,24 @@ class CellExecutor:
                     'saved_state': {}
                 }
             
+            # Keep a compact snapshot of the state in place of the live cell
+            saved_state = result.get('saved_state') if isinstance(result, dict) else None
+            snapshot = None
+            if (
+                isinstance(saved_state, dict) and saved_state
+                and self._resume_arguments(cell_instance, saved_state) is not None
+            ):
+                try:
+                    snapshot = self.snapshots.save(cell_id, saved_state)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    logger.warning(f"Could not snapshot the state of cell {cell_id}, keeping it live: {e}")
+            
+            if snapshot is not None:
+                result['snapshot'] = snapshot
+                self._drop_cell_instance(cell_id)
+            else:
+                self.snapshots.discard(cell_id)
+            
             # Update cell status
             self.cell_resources[cell_id]['status'] = 'suspended'
             self.cell_resources[cell_id]['last_active'] = time.time()
@@ -558,13 +707,28 @@ class CellExecutor:
             logger.error(f"Error suspending cell {cell_id}: {e}")
             raise CellLifecycleError(f"Cell suspension failed: {str(e)}")
 
+    def _drop_cell_instance(self, cell_id: str) -> None:
+        """Drop a suspended cell's instance and worker process, keeping its environment."""
+        self.active_cells[cell_id] = None
+        self.capability_cache.pop(cell_id, None)
+        self.single_flight.invalidate(cell_id)
+        self.accountant.unregister(cell_id)
+        
+        cell_process = self.cell_processes.pop(cell_id, None)
+        if cell_process is not None:
+            cell_process.close()
+
     async def resume_cell(self, cell_id: str, saved_state: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Resume a suspended cell with saved state.
         
+        A cell dropped on suspension is first instantiated and initialized
+        again. The cell's snapshot is discarded once it has resumed.
+        
         Args:
             cell_id: ID of the cell to resume
-            saved_state: Saved state from suspension
+            saved_state: Saved state or StateSnapshot from suspension;
+                defaults to the cell's latest snapshot
             
         Returns:
             Resume result
@@ -582,15 +746,26 @@ class CellExecutor:
             raise CellLifecycleError(f"Cell {cell_id} cannot be resumed from '{self.cell_resources[cell_id]['status']}' state")
         
         try:
-            # Call resume method if it exists
+            # Rebuild the cell if it was dropped on suspension
             cell_instance = self.active_cells[cell_id]
+            if cell_instance is None:
+                cell_env = self.cell_environments[cell_id]
+                cell_instance = await self._instantiate_cell(cell_id, cell_env['cell'], cell_env)
+                self.active_cells[cell_id] = cell_instance
             
+            if saved_state is None:
+                saved_state = self.snapshots.latest(cell_id)
+            if isinstance(saved_state, StateSnapshot):
+                saved_state = saved_state.restore()
+            
+            # Call resume method if it exists
             if hasattr(cell_instance, 'resume') and callable(cell_instance.resume):
-                params = {}
-                if saved_state:
-                    params['saved_state'] = saved_state
+                params = self._resume_arguments(cell_instance, saved_state)
+                if params is None:
+                    logger.warning(f"Resume method of cell {cell_id} does not take saved state")
+                    params = {}
                 
-                result = await self._execute_cell_method(cell_instance, 'resume', params)
+                result = await self._execute_cell_method(cell_instance, 'resume', params, cell_id=cell_id)
             else:
                 # If no resume method, assume success
                 result = {
@@ -598,9 +773,13 @@ class CellExecutor:
                     'state': 'active'
                 }
             
+            # The resumed cell holds the state again
+            self.snapshots.discard(cell_id)
+            
             # Update cell status
             self.cell_resources[cell_id]['status'] = 'active'
             self.cell_resources[cell_id]['last_active'] = time.time()
+            self.cell_resources[cell_id]['idle_suspended'] = False
             
             logger.info(f"Resumed cell {cell_id}")
             
@@ -610,6 +789,35 @@ class CellExecutor:
             logger.error(f"Error resuming cell {cell_id}: {e}")
             raise CellLifecycleError(f"Cell resume failed: {str(e)}")
 
+    def _resume_arguments(self, cell_instance: Any, saved_state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Shape saved state as the arguments of a cell's resume method.
+        
+        Cells take the state either as a saved_state keyword or, like the
+        shipped cells, under 'saved_state' in a parameters dictionary.
+        
+        Args:
+            cell_instance: Cell instance
+            saved_state: Saved state to resume with, or None
+            
+        Returns:
+            Keyword arguments for resume, or None if the cell has no resume
+            method that can take the state
+        """
+        if isinstance(cell_instance, ProcessCell):
+            names = cell_instance.parameter_names('resume')
+        else:
+            try:
+                names = tuple(inspect.signature(cell_instance.resume).parameters)
+            except (AttributeError, TypeError, ValueError):
+                names = ()
+        
+        if 'saved_state' in names:
+            return {'saved_state': saved_state} if saved_state else {}
+        if 'parameters' in names:
+            return {'parameters': {'saved_state': saved_state} if saved_state else {}}
+        return None if saved_state else {}
+
     async def release_cell(self, cell_id: str) -> Dict[str, Any]:
         """
         Release a cell, cleaning up its resources.
@@ -632,7 +840,7 @@ class CellExecutor:
             cell_instance = self.active_cells[cell_id]
             
             if hasattr(cell_instance, 'release') and callable(cell_instance.release):
-                result = await self._execute_cell_method(cell_instance, 'release')
+                result = await self._execute_cell_method(cell_instance, 'release', cell_id=cell_id)
             else:
                 # If no release method, assume success
                 result = {
@@ -655,13 +863,7 @@ class CellExecutor:
                 del self.capability_cache[cell_id]
             
             # Clean up communication channels
-            channels_to_remove = []
-            for channel_key in self.communication_channels:
-                if cell_id in channel_key:
-                    channels_to_remove.append(channel_key)
-            
-            for channel_key in channels_to_remove:
-                del self.communication_channels[channel_key]
+            await self._remove_cell_channels(cell_id)
             
             logger.info(f"Released cell {cell_id}")
             
@@ -685,13 +887,7 @@ class CellExecutor:
                     del self.capability_cache[cell_id]
                 
                 # Clean up communication channels
-                channels_to_remove = []
-                for channel_key in self.communication_channels:
-                    if cell_id in channel_key:
-                        channels_to_remove.append(channel_key)
-                
-                for channel_key in channels_to_remove:
-                    del self.communication_channels[channel_key]
+                await self._remove_cell_channels(cell_id)
             except Exception as cleanup_error:
                 logger.error(f"Error during cell cleanup: {cleanup_error}")
             
@@ -701,14 +897,27 @@ class CellExecutor:
                 'state': 'unknown'
             }
 
-    async def execute_capability(self, cell_id: str, capability: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def execute_capability(
+        self,
+        cell_id: str,
+        capability: str,
+        parameters: Dict[str, Any] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Execute a capability on a cell.
         
+        Capabilities whose manifest entry declares "coalesce" are treated as
+        idempotent: identical concurrent calls share one execution and its
+        result is reused for the declared cache_ttl_ms. Any other capability
+        call on the cell drops those cached results, since it may change them.
+        
         Args:
             cell_id: ID of the cell
             capability: Name of the capability to execute
             parameters: Parameters for the capability
+            deadline: Optional absolute time.monotonic() deadline; defaults
+                to the deadline of the capability call this one is nested in
             
         Returns:
             Capability execution result
@@ -717,6 +926,76 @@ class CellExecutor:
             CellNotFoundError: If cell is not found
             CellExecutionError: If capability execution fails
         """
+        await self._resume_if_idle_suspended(cell_id)
+        cell_instance = self._get_capability_target(cell_id, capability)
+        
+        parameters = parameters or {}
+        coalesce = self.cell_environments.get(cell_id, {}).get('coalesce') or {}
+        key = call_key(capability, parameters) if capability in coalesce else None
+        
+        try:
+            # Execute the capability with parameters
+            execute = functools.partial(
+                self._execute_cell_method, cell_instance, capability, parameters, cell_id=cell_id, deadline=deadline
+            )
+            if key is not None:
+                result, executed = await self._execute_coalesced(cell_id, capability, key, coalesce[capability],
+                                                                 execute, deadline)
+            else:
+                if coalesce and capability not in coalesce:
+                    self.single_flight.invalidate(cell_id)
+                result, executed = await execute(), True
+            
+            # Update resource tracking
+            self.cell_resources[cell_id]['last_active'] = time.time()
+            if executed:
+                self.cell_resources[cell_id]['capabilities_executed'] += 1
+            
+            # Log execution
+            if result and isinstance(result, dict) and result.get('status') == 'success':
+                logger.debug(f"Executed capability '{capability}' on cell {cell_id}")
+            else:
+                logger.warning(f"Capability '{capability}' execution on cell {cell_id} returned status: {result.get('status', 'unknown')}")
+            
+            return result
+            
+        except ExecutionCancelledError:
+            raise
+        
+        except Exception as e:
+            logger.error(f"Error executing capability '{capability}' on cell {cell_id}: {e}")
+            logger.error(traceback.format_exc())
+            raise CellExecutionError(f"Capability execution failed: {str(e)}")
+
+    async def _resume_if_idle_suspended(self, cell_id: str) -> None:
+        """Resume a cell the executor suspended for being idle, before calling it."""
+        if not self.cell_resources.get(cell_id, {}).get('idle_suspended'):
+            return
+        
+        # Concurrent calls share one resume
+        resuming = self._idle_resumes.get(cell_id)
+        if resuming is None:
+            logger.debug(f"Resuming idle-suspended cell {cell_id} for a capability call")
+            resuming = self._idle_resumes[cell_id] = asyncio.ensure_future(self.resume_cell(cell_id))
+            resuming.add_done_callback(lambda _: self._idle_resumes.pop(cell_id, None))
+        await asyncio.shield(resuming)
+
+    def _get_capability_target(self, cell_id: str, capability: str) -> Any:
+        """
+        Check that an active cell provides a capability.
+        
+        Args:
+            cell_id: ID of the cell
+            capability: Name of the capability
+            
+        Returns:
+            The cell instance to call the capability on
+            
+        Raises:
+            CellNotFoundError: If cell is not found
+            CellLifecycleError: If cell is not active
+            CellExecutionError: If the cell lacks the capability
+        """
         # Check if cell exists
         if cell_id not in self.active_cells:
             raise CellNotFoundError(f"Cell {cell_id} not found")
@@ -742,34 +1021,289 @@ class CellExecutor:
         if not capability_fn:
             raise CellExecutionError(f"Capability '{capability}' not found in cell {cell_id}")
         
+        return cell_instance
+
+    async def _execute_coalesced(
+        self,
+        cell_id: str,
+        capability: str,
+        key: str,
+        ttl_seconds: float,
+        execute: Callable[[], Any],
+        deadline: Optional[float]
+    ) -> Tuple[Any, bool]:
+        """
+        Execute a coalescible capability call through the single-flight cache.
+        
+        A call joining an execution started by another caller still gives
+        up at its own deadline, without cancelling the shared execution.
+        
+        Args:
+            cell_id: ID of the cell
+            capability: Name of the capability
+            key: Key identifying identical calls
+            ttl_seconds: How long the result may be reused
+            execute: Starts the execution
+            deadline: Absolute time.monotonic() deadline of this call
+            
+        Returns:
+            Tuple of the result and whether this call executed the capability
+            
+        Raises:
+            ExecutionCancelledError: If the deadline passes first
+        """
+        if deadline is None:
+            deadline = current_deadline.get()
+        timeout = max(deadline - time.monotonic(), 0.0) if deadline is not None else None
+        
         try:
-            # Execute the capability with parameters
-            result = await self._execute_cell_method(cell_instance, capability, parameters or {})
+            return await self.single_flight.run(cell_id, key, ttl_seconds, execute, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise ExecutionCancelledError(
+                f"Deadline passed while waiting for a shared call of '{capability}'",
+                cell_id=cell_id, capability=capability, reason="deadline exceeded"
+            )
+
+    async def execute_capability_batch(
+        self,
+        cell_id: str,
+        capability: str,
+        parameters_list: List[Dict[str, Any]],
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a capability once per parameter set, as one batch.
+        
+        Args:
+            cell_id: ID of the cell
+            capability: Name of the capability to execute
+            parameters_list: Parameters for each call
+            deadline: Optional absolute time.monotonic() deadline for the batch
             
-            # Update resource tracking
-            self.cell_resources[cell_id]['last_active'] = time.time()
-            self.cell_resources[cell_id]['capabilities_executed'] += 1
+        Returns:
+            Results in the order of the parameter sets
             
-            # Log execution
-            if result and isinstance(result, dict) and result.get('status') == 'success':
-                logger.debug(f"Executed capability '{capability}' on cell {cell_id}")
+        Raises:
+            CellNotFoundError: If cell is not found
+            CellExecutionError: If the batch cannot be executed
+            ExecutionCancelledError: If the deadline passes first
+        """
+        return [
+            result async for result in self.stream_capability_batch(cell_id, capability, parameters_list, deadline)
+        ]
+
+    async def stream_capability_batch(
+        self,
+        cell_id: str,
+        capability: str,
+        parameters_list: List[Dict[str, Any]],
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a capability once per parameter set, yielding results in order.
+        
+        The cell is checked, the deadline set up, and the calls logged and
+        counted once for the whole batch rather than per call. A cell can
+        handle a batch natively with a ``<capability>_batch(batch)`` method
+        taking the list of parameter sets and returning one result per set.
+        Otherwise the capability is called for each set in turn, a sync
+        method running the whole batch in one thread pool job; a failing
+        call yields an error result and the batch continues.
+        
+        Args:
+            cell_id: ID of the cell
+            capability: Name of the capability to execute
+            parameters_list: Parameters for each call
+            deadline: Optional absolute time.monotonic() deadline for the
+                batch; defaults to the deadline of the capability call this
+                one is nested in
+            
+        Yields:
+            The result of each call, in the order of the parameter sets
+            
+        Raises:
+            CellNotFoundError: If cell is not found
+            CellExecutionError: If the batch cannot be executed
+            ExecutionCancelledError: If the deadline passes first
+        """
+        await self._resume_if_idle_suspended(cell_id)
+        cell_instance = self._get_capability_target(cell_id, capability)
+        parameters_list = [parameters or {} for parameters in parameters_list]
+        
+        coalesce = self.cell_environments.get(cell_id, {}).get('coalesce') or {}
+        if coalesce and capability not in coalesce:
+            self.single_flight.invalidate(cell_id)
+        
+        batch_method = f"{capability}_batch"
+        executed = 0
+        try:
+            if callable(getattr(cell_instance, batch_method, None)):
+                results = await self._execute_cell_method(
+                    cell_instance, batch_method, {'batch': parameters_list}, cell_id=cell_id, deadline=deadline
+                )
+                if not isinstance(results, list) or len(results) != len(parameters_list):
+                    raise CellExecutionError(
+                        f"Batch method '{batch_method}' of cell {cell_id} must return one result per call"
+                    )
+                executed = len(results)
+                for result in results:
+                    yield result
             else:
-                logger.warning(f"Capability '{capability}' execution on cell {cell_id} returned status: {result.get('status', 'unknown')}")
+                async for result in self._run_batch_calls(cell_instance, capability, parameters_list, cell_id, deadline):
+                    executed += 1
+                    yield result
+        
+        finally:
+            # Update resource tracking once for the batch
+            if executed and cell_id in self.cell_resources:
+                self.cell_resources[cell_id]['last_active'] = time.time()
+                self.cell_resources[cell_id]['capabilities_executed'] += executed
+            logger.debug(f"Executed {executed} of {len(parameters_list)} batched calls of "
+                         f"capability '{capability}' on cell {cell_id}")
+
+    async def _run_batch_calls(
+        self,
+        cell_instance: Any,
+        capability: str,
+        parameters_list: List[Dict[str, Any]],
+        cell_id: str,
+        deadline: Optional[float]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Call a capability once per parameter set, yielding results in order.
+        
+        The calls share one cancellation token and one deadline: the
+        capability's timeout per call times the batch size, cut short by
+        the caller's deadline.
+        
+        Args:
+            cell_instance: Cell instance
+            capability: Name of the capability
+            parameters_list: Parameters for each call
+            cell_id: ID of the cell
+            deadline: Absolute time.monotonic() deadline of the batch
             
-            return result
+        Yields:
+            The result of each call, or an error result if it failed
             
+        Raises:
+            ExecutionCancelledError: If the deadline passes first
+        """
+        method = getattr(cell_instance, capability)
+        type_key = self._get_type_key(cell_id, cell_instance)
+        batch_deadline = time.monotonic() + self.timeouts.timeout_ms(type_key, capability) / 1000 * len(parameters_list)
+        if deadline is None:
+            deadline = current_deadline.get()
+        if deadline is not None:
+            batch_deadline = min(batch_deadline, deadline)
+        
+        token = CancellationToken(batch_deadline, force_interrupt=self.force_cancellation_interrupts)
+        charge = self.accountant.charger(cell_id)
+        loop = asyncio.get_event_loop()
+        
+        if inspect.iscoroutinefunction(method):
+            outcomes = (self._call_batch_item(method, params, charge, token) for params in parameters_list)
+        else:
+            # One thread pool job for the whole batch, handing back each outcome as it is ready
+            queue = asyncio.Queue()
+            job = functools.partial(
+                self._run_sync_batch, method, parameters_list, token,
+                self._accepts_cancellation_token(method), loop, queue
+            )
+            job = loop.run_in_executor(None, functools.partial(call_timed, functools.partial(token.run, job), charge))
+            job.add_done_callback(lambda done: done.cancelled() or done.exception())
+            outcomes = (queue.get() for _ in parameters_list)
+        
+        index = 0
+        previous = time.monotonic()
+        try:
+            for index, outcome in enumerate(outcomes):
+                succeeded, value = await asyncio.wait_for(outcome, batch_deadline - time.monotonic())
+                
+                now = time.monotonic()
+                self.timeouts.record(type_key, capability, (now - previous) * 1000)
+                previous = now
+                
+                if succeeded:
+                    yield value
+                else:
+                    logger.warning(f"Call {index} of batch '{capability}' on cell {cell_id} failed: {value}")
+                    yield {'status': 'error', 'error': str(value)}
+        
+        except asyncio.TimeoutError:
+            token.cancel("deadline exceeded")
+            loop.call_later(self.cancellation_grace_ms / 1000, token.interrupt)
+            
+            logger.error(f"Batch '{capability}' on cell {cell_id} timed out after {index} of {len(parameters_list)} calls")
+            raise ExecutionCancelledError(
+                f"Batch timed out after {index} of {len(parameters_list)} calls",
+                cell_id=cell_id, capability=capability, reason="deadline exceeded"
+            )
+        
+        finally:
+            # Skip the remaining calls if the consumer stopped early
+            token.cancel("batch closed")
+
+    async def _call_batch_item(
+        self,
+        method: Callable,
+        params: Dict[str, Any],
+        charge: Callable[[float], None],
+        token: CancellationToken
+    ) -> Tuple[bool, Any]:
+        """Call an async capability for one batch item within the batch's deadline."""
+        deadline_context = current_deadline.set(token.deadline)
+        try:
+            return True, await metered(self._call_method_async(method, params, charge, token), charge)
         except Exception as e:
-            logger.error(f"Error executing capability '{capability}' on cell {cell_id}: {e}")
-            logger.error(traceback.format_exc())
-            raise CellExecutionError(f"Capability execution failed: {str(e)}")
+            return False, e
+        finally:
+            current_deadline.reset(deadline_context)
 
-    async def connect_cells(self, source_id: str, target_id: str) -> Tuple[bool, str]:
+    @staticmethod
+    def _run_sync_batch(
+        method: Callable,
+        parameters_list: List[Dict[str, Any]],
+        token: CancellationToken,
+        accepts_token: bool,
+        loop: asyncio.AbstractEventLoop,
+        outcomes: asyncio.Queue
+    ) -> None:
+        """Call a sync capability for every batch item in one pool thread."""
+        for params in parameters_list:
+            if token.cancelled:
+                return
+            if accepts_token:
+                params = {**params, 'cancellation_token': token}
+            try:
+                outcome = True, method(**params)
+            except Exception as e:
+                outcome = False, e
+            loop.call_soon_threadsafe(outcomes.put_nowait, outcome)
+
+    async def connect_cells(
+        self,
+        source_id: str,
+        target_id: str,
+        max_depth: Optional[int] = None,
+        overflow_policy: Optional[str] = None
+    ) -> Tuple[bool, str]:
         """
         Establish a connection between two cells.
         
+        Both directions of the connection are bounded channels. When a
+        channel is full, the overflow policy decides what happens to a new
+        message: 'block' makes the sender wait for space, 'drop_oldest' and
+        'drop_newest' discard a message, and 'coalesce' replaces the queued
+        message with the same content key (or else drops the oldest).
+        
         Args:
             source_id: ID of the source cell
             target_id: ID of the target cell
+            max_depth: Maximum undelivered messages per direction (0 for
+                unbounded); defaults to the channel_max_depth setting
+            overflow_policy: Overflow policy; defaults to the
+                channel_overflow_policy setting
             
         Returns:
             Tuple containing:
@@ -795,15 +1329,18 @@ class CellExecutor:
             # Create a new channel
             channel_id = f"channel_{source_id[:8]}_{target_id[:8]}_{str(uuid.uuid4())[:8]}"
             
-            # Create bidirectional communication queue
-            queue_source_to_target = asyncio.Queue()
-            queue_target_to_source = asyncio.Queue()
+            # Open both directions in the cells' inboxes
+            max_depth = self.channel_max_depth if max_depth is None else max_depth
+            overflow_policy = overflow_policy or self.channel_overflow_policy
+            for sender_id, receiver_id in ((source_id, target_id), (target_id, source_id)):
+                self.message_bus.open_channel(
+                    sender_id, receiver_id, max_depth, overflow_policy, self.channel_coalesce_key
+                )
             
             # Store the channel
             self.communication_channels[(source_id, target_id)] = {
                 'id': channel_id,
                 'created_at': time.time(),
-                'queue': queue_source_to_target,
                 'source': source_id,
                 'target': target_id
             }
@@ -811,7 +1348,6 @@ class CellExecutor:
             self.communication_channels[(target_id, source_id)] = {
                 'id': channel_id,
                 'created_at': time.time(),
-                'queue': queue_target_to_source,
                 'source': target_id,
                 'target': source_id
             }
@@ -897,6 +1433,8 @@ class CellExecutor:
             del self.communication_channels[(source_id, target_id)]
             if (target_id, source_id) in self.communication_channels:
                 del self.communication_channels[(target_id, source_id)]
+            await self.message_bus.close_channel(source_id, target_id)
+            await self.message_bus.close_channel(target_id, source_id)
             
             logger.info(f"Disconnected cells {source_id} and {target_id}")
             
@@ -910,17 +1448,29 @@ class CellExecutor:
         """
         Send a message from one cell to another.
         
+        The message is delivered by reference. Shared payloads in it, either
+        the message itself or values of a message dictionary, are handed to
+        the target cell without copying, and the sender's handles to them
+        become invalid. If the message is not delivered, the sender keeps
+        its payloads.
+        
+        If the channel is full, its overflow policy applies. A blocking
+        channel waits up to channel_block_timeout_ms for space.
+        
         Args:
             source_id: ID of the source cell
             target_id: ID of the target cell
             message: Message content
             
         Returns:
-            Success indicator (True/False)
+            True if the message was queued or coalesced, False if the
+            'drop_newest' policy discarded it
             
         Raises:
             CellNotFoundError: If either cell is not found
-            CellCommunicationError: If message sending fails
+            CellCommunicationError: If message sending fails, or a blocking
+                channel stays full until the timeout
+            PayloadOwnershipError: If the source cell does not own a shared payload
         """
         # Check if cells exist
         if source_id not in self.active_cells:
@@ -933,31 +1483,53 @@ class CellExecutor:
         if (source_id, target_id) not in self.communication_channels:
             raise CellCommunicationError(f"No connection between cells {source_id} and {target_id}")
         
+        # Move shared payloads to the target before anything is queued
+        content = transfer_payloads(message, source_id, target_id)
+        
         try:
-            # Get the communication channel
-            channel = self.communication_channels[(source_id, target_id)]
-            queue = channel['queue']
+            now = time.time()
             
             # Prepare message with metadata
             message_with_metadata = {
                 'source_id': source_id,
                 'target_id': target_id,
-                'timestamp': time.time(),
-                'message_id': str(uuid.uuid4()),
-                'content': message
+                'timestamp': now,
+                'message_id': f"{self._message_id_prefix}-{next(self._message_counter)}",
+                'content': content
             }
             
-            # Put message in queue
-            await queue.put(message_with_metadata)
+            # Deliver to the target's inbox; undelivered payloads stay with the sender
+            try:
+                outcome = await self.message_bus.send(
+                    source_id, target_id, message_with_metadata,
+                    timeout=self.channel_block_timeout_ms / 1000 if self.channel_block_timeout_ms else None
+                )
+            except BaseException:
+                return_payloads(message, content)
+                raise
+            
+            if outcome in (TIMED_OUT, CLOSED):
+                return_payloads(message, content)
+                raise CellCommunicationError(
+                    f"Channel from {source_id} to {target_id} is "
+                    f"{'full' if outcome == TIMED_OUT else 'closed'}; message not delivered"
+                )
             
             # Update last activity
-            self.cell_resources[source_id]['last_active'] = time.time()
-            self.cell_resources[target_id]['last_active'] = time.time()
+            self.cell_resources[source_id]['last_active'] = now
+            self.cell_resources[target_id]['last_active'] = now
+            
+            if outcome == DROPPED:
+                return_payloads(message, content)
+                logger.debug(f"Channel from {source_id} to {target_id} is full; message dropped")
+                return False
             
             logger.debug(f"Message sent from {source_id} to {target_id}")
             
             return True
             
+        except CellCommunicationError:
+            raise
         except Exception as e:
             logger.error(f"Error sending message from {source_id} to {target_id}: {e}")
             raise CellCommunicationError(f"Failed to send message: {str(e)}")
@@ -982,79 +1554,27 @@ class CellExecutor:
         if cell_id not in self.active_cells:
             raise CellNotFoundError(f"Cell {cell_id} not found")
         
+        # Check if connection exists
+        if sender_id and (sender_id, cell_id) not in self.communication_channels:
+            raise CellCommunicationError(f"No connection between cells {sender_id} and {cell_id}")
+        
+        if not sender_id and not self.message_bus.has_incoming(cell_id):
+            logger.warning(f"Cell {cell_id} has no incoming connections")
+            return None
+        
         try:
-            # If sender is specified, check for messages from that sender
-            if sender_id:
-                # Check if connection exists
-                if (sender_id, cell_id) not in self.communication_channels:
-                    raise CellCommunicationError(f"No connection between cells {sender_id} and {cell_id}")
-                
-                # Get the communication channel
-                channel = self.communication_channels[(sender_id, cell_id)]
-                queue = channel['queue']
-                
-                # Try to get message with timeout
-                try:
-                    message = await asyncio.wait_for(queue.get(), timeout=timeout)
-                    queue.task_done()
-                    
-                    # Update last activity
-                    self.cell_resources[cell_id]['last_active'] = time.time()
-                    
-                    logger.debug(f"Message received by {cell_id} from {sender_id}")
-                    
-                    return message
-                except asyncio.TimeoutError:
-                    return None
-            
-            else:
-                # Check for messages from any connected cell
-                # Collect all queues where this cell is the target
-                queues = []
-                for key, channel in self.communication_channels.items():
-                    source, target = key
-                    if target == cell_id:
-                        queues.append((source, channel['queue']))
-                
-                if not queues:
-                    logger.warning(f"Cell {cell_id} has no incoming connections")
-                    return None
-                
-                # Create tasks to wait on all queues
-                tasks = []
-                for source_id, queue in queues:
-                    task = asyncio.create_task(queue.get())
-                    tasks.append((source_id, task, queue))
-                
-                # Wait for first message or timeout
-                done, pending = await asyncio.wait(
-                    [task for _, task, _ in tasks],
-                    timeout=timeout,
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # Cancel all pending tasks
-                for _, task, _ in tasks:
-                    if task in pending:
-                        task.cancel()
-                
-                # Get the completed task and mark as done
-                if done:
-                    # Find which task completed
-                    for source_id, task, queue in tasks:
-                        if task in done:
-                            message = task.result()
-                            queue.task_done()
-                            
-                            # Update last activity
-                            self.cell_resources[cell_id]['last_active'] = time.time()
-                            
-                            logger.debug(f"Message received by {cell_id} from {source_id}")
-                            
-                            return message
-                
+            # Wait on the cell's inbox, which fans in all of its channels
+            message = await self.message_bus.receive(cell_id, sender_id, timeout)
+            if message is None:
                 return None
-                
+            
+            # Update last activity
+            self.cell_resources[cell_id]['last_active'] = time.time()
+            
+            logger.debug(f"Message received by {cell_id} from {message['source_id']}")
+            
+            return message
+            
         except Exception as e:
             logger.error(f"Error receiving message for {cell_id}: {e}")
             raise CellCommunicationError(f"Failed to receive message: {str(e)}")
@@ -1069,7 +1589,8 @@ class CellExecutor:
             target_id: ID of the target cell
             capability: Name of the capability to call
             parameters: Parameters for the capability
-            timeout: Optional timeout in seconds
+            timeout: Optional timeout in seconds; the call also stays within
+                the deadline of the capability call it is made from
             
         Returns:
             Capability execution result
@@ -1095,7 +1616,11 @@ class CellExecutor:
         
         try:
             # Execute the capability on the target cell
-            result = await self.execute_capability(target_id, capability, parameters or {})
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            inherited = current_deadline.get()
+            if deadline is None or (inherited is not None and inherited < deadline):
+                deadline = inherited
+            result = await self.execute_capability(target_id, capability, parameters or {}, deadline=deadline)
             
             # Update last activity
             self.cell_resources[source_id]['last_active'] = time.time()
@@ -1132,15 +1657,42 @@ class CellExecutor:
             'status': self.cell_resources[cell_id]['status'],
             'resources': {
                 'memory_mb': self.cell_resources[cell_id]['memory_mb'],
-                'cpu_percent': self.cell_resources[cell_id]['cpu_percent']
+                'memory_source': self.cell_resources[cell_id].get('memory_source'),
+                'cpu_percent': self.cell_resources[cell_id]['cpu_percent'],
+                'cpu_seconds': self.cell_resources[cell_id].get('cpu_seconds', 0.0)
             },
             'uptime_seconds': time.time() - self.cell_resources[cell_id]['start_time'],
             'last_active_seconds': time.time() - self.cell_resources[cell_id]['last_active'],
-            'capabilities_executed': self.cell_resources[cell_id]['capabilities_executed']
+            'capabilities_executed': self.cell_resources[cell_id]['capabilities_executed'],
+            'channels': self.message_bus.get_channel_stats(cell_id),
+            'execution': self._get_execution_status(cell_id),
+            'coalescing': self.single_flight.get_stats(cell_id),
+            'snapshot': self.snapshots.get_stats(cell_id)
         }
         
         return status
 
+    def _get_execution_status(self, cell_id: str) -> Dict[str, Any]:
+        """
+        Describe where a cell runs.
+        
+        Args:
+            cell_id: ID of the cell
+            
+        Returns:
+            Dictionary with the backend, and the worker's process ID and
+            CPU affinity for process cells
+        """
+        execution = self.cell_environments.get(cell_id, {}).get('execution', {})
+        status = {'backend': execution.get('backend', 'auto')}
+        
+        cell_process = self.cell_processes.get(cell_id)
+        if cell_process is not None:
+            status['pid'] = cell_process.pid
+            status['cpu_affinity'] = cell_process.cpu_affinity
+        
+        return status
+
     async def get_active_cells(self) -> List[Dict[str, Any]]:
         """
         Get a list of all active cells and their status.
@@ -1156,20 +1708,51 @@ class CellExecutor:
         
         return cell_list
 
-    async def _execute_cell_method(self, cell_instance: Any, method_name: str, parameters: Dict[str, Any] = None) -> Any:
+    async def _remove_cell_channels(self, cell_id: str) -> None:
+        """
+        Remove all channels to and from a cell.
+        
+        Args:
+            cell_id: ID of the cell
+        """
+        for peer_id in self.message_bus.peers(cell_id):
+            self.communication_channels.pop((cell_id, peer_id), None)
+            self.communication_channels.pop((peer_id, cell_id), None)
+        
+        await self.message_bus.remove_cell(cell_id)
+
+    async def _execute_cell_method(
+        self,
+        cell_instance: Any,
+        method_name: str,
+        parameters: Dict[str, Any] = None,
+        cell_id: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> Any:
         """
         Execute a method on a cell instance with timeout and resource monitoring.
         
+        The timeout adapts to the method's observed latency and is cut short
+        by the caller's deadline, or else by the deadline of the capability
+        call this one is nested in. Methods declaring a cancellation_token
+        parameter receive a CancellationToken. Sync methods still running
+        cancellation_grace_ms after their deadline are interrupted if
+        force_cancellation_interrupts is set, and process cells get a
+        fresh worker.
+        
         Args:
             cell_instance: Cell instance
             method_name: Method name to call
             parameters: Optional parameters for the method
+            cell_id: ID of the cell to charge the method's CPU time to
+            deadline: Absolute time.monotonic() deadline of the call
             
         Returns:
             Method result
             
         Raises:
             CellExecutionError: If method execution fails
+            ExecutionCancelledError: If the deadline passes first
             ResourceLimitExceededError: If execution exceeds resource limits
         """
         if not hasattr(cell_instance, method_name) or not callable(getattr(cell_instance, method_name)):
@@ -1180,52 +1763,127 @@ class CellExecutor:
         # Prepare parameters if any
         params = parameters or {}
         
+        # Adaptive timeout for this method, bounded by the caller's deadline
+        type_key = self._get_type_key(cell_id, cell_instance)
+        timeout_seconds = self.timeouts.timeout_ms(type_key, method_name) / 1000
+        if deadline is None:
+            deadline = current_deadline.get()
+        if deadline is not None:
+            timeout_seconds = min(timeout_seconds, deadline - time.monotonic())
+            if timeout_seconds <= 0:
+                raise ExecutionCancelledError(
+                    f"Deadline passed before method {method_name} started",
+                    cell_id=cell_id, capability=method_name, reason="deadline exceeded"
+                )
+        
+        started = time.monotonic()
+        token = CancellationToken(started + timeout_seconds, force_interrupt=self.force_cancellation_interrupts)
+        deadline_context = current_deadline.set(token.deadline)
+        
         try:
             # Run with timeout
-            timeout_seconds = self.execution_timeout_ms / 1000
-            result = await asyncio.wait_for(
-                self._call_method_async(method, params),
-                timeout=timeout_seconds
-            )
+            if cell_id is not None:
+                charge = self.accountant.charger(cell_id)
+                call = metered(self._call_method_async(method, params, charge, token), charge)
+            else:
+                call = self._call_method_async(method, params, token=token)
+            result = await asyncio.wait_for(call, timeout=timeout_seconds)
             
+            self.timeouts.record(type_key, method_name, (time.monotonic() - started) * 1000)
             return result
             
         except asyncio.TimeoutError:
-            logger.error(f"Method {method_name} execution timed out after {timeout_seconds} seconds")
-            raise CellExecutionError(f"Method execution timed out after {timeout_seconds} seconds")
+            # Tell a cooperative sync method to stop, and stop it if it does not
+            # and forced interrupts are enabled
+            token.cancel("deadline exceeded")
+            asyncio.get_event_loop().call_later(self.cancellation_grace_ms / 1000, token.interrupt)
+            self.timeouts.record(type_key, method_name, timeout_seconds * 1000)
+            
+            logger.error(f"Method {method_name} execution timed out after {timeout_seconds:.3f} seconds")
+            raise ExecutionCancelledError(
+                f"Method execution timed out after {timeout_seconds:.3f} seconds",
+                cell_id=cell_id, capability=method_name, reason="deadline exceeded"
+            )
         
         except Exception as e:
             logger.error(f"Error executing method {method_name}: {e}")
             raise CellExecutionError(f"Method execution failed: {str(e)}")
+        
+        finally:
+            current_deadline.reset(deadline_context)
 
-    async def _call_method_async(self, method: Callable, params: Dict[str, Any]) -> Any:
+    def _get_type_key(self, cell_id: Optional[str], cell_instance: Any) -> str:
+        """Identify the cell type whose latency a call counts toward."""
+        type_key = self.cell_environments.get(cell_id, {}).get('type_key') if cell_id else None
+        return type_key or type(cell_instance).__qualname__
+
+    def _accepts_cancellation_token(self, method: Callable) -> bool:
+        """Check whether a method declares a cancellation_token parameter."""
+        function = getattr(method, '__func__', method)
+        accepts = self._token_parameters.get(function)
+        if accepts is None:
+            try:
+                accepts = 'cancellation_token' in inspect.signature(method).parameters
+            except (TypeError, ValueError):
+                accepts = False
+            if hasattr(method, '__func__'):
+                # Bound methods are created per access; cache by their function
+                self._token_parameters[function] = accepts
+        return accepts
+
+    async def _call_method_async(
+        self,
+        method: Callable,
+        params: Dict[str, Any],
+        charge: Optional[Callable[[float], None]] = None,
+        token: Optional[CancellationToken] = None
+    ) -> Any:
         """
         Call a method asynchronously, handling both async and sync methods.
         
         Args:
             method: Method to call
             params: Parameters for the method
+            charge: Optional function charged the CPU time of sync methods
+            token: Optional cancellation token for the call
             
         Returns:
             Method result
         """
+        if token is not None and self._accepts_cancellation_token(method):
+            params = {**params, 'cancellation_token': token}
+        
         if inspect.iscoroutinefunction(method):
-            # Method is already async
-            return await method(**params)
+            # Method is already async; backends running it elsewhere stop it through the token
+            cancellation = current_cancellation.set(token)
+            try:
+                return await method(**params)
+            finally:
+                current_cancellation.reset(cancellation)
         else:
             # Method is synchronous, run in executor
+            function = functools.partial(method, **params)
+            if token is not None:
+                # Let the token interrupt the thread once the call is cancelled
+                function = functools.partial(token.run, function)
+            if charge is not None:
+                function = functools.partial(call_timed, function, charge)
+            
             loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None,
-                lambda: method(**params)
-            )
+            return await loop.run_in_executor(None, function)
 
     async def _monitor_resources(self) -> None:
-        """Monitor resource usage of all active cells and enforce limits."""
-        import psutil
-        
-        process = psutil.Process()
-        
+        """
+        Monitor resource usage of all active cells and enforce limits.
+        
+        Memory limits are only enforced against measured figures: worker
+        process RSS for process cells, and traced allocations for cells in
+        this process when trace_cell_allocations is enabled. Traced memory
+        of a cell type is split evenly among its instances, so the limit
+        applies to their average. The evenly split process RSS reported
+        without tracing is never used to suspend or terminate a cell, so
+        cells that must be held to a limit belong on the process backend.
+        """
         while True:
             try:
                 # Sleep first to allow initialization
@@ -1235,29 +1893,30 @@ class CellExecutor:
                 if not self.active_cells:
                     continue
                 
-                # Get current process memory usage
-                process_memory = process.memory_info().rss / (1024 * 1024)  # MB
-                
-                # Distribute memory usage proportionally among active cells
-                # This is a simplified approach; in a real implementation,
-                # we would use more sophisticated resource tracking
-                per_cell_memory = process_memory / max(len(self.active_cells), 1)
+                usage = await self.accountant.sample()
                 
                 # Update resource usage for all cells
                 for cell_id in list(self.active_cells.keys()):
                     # Skip if cell was removed during iteration
-                    if cell_id not in self.cell_resources:
+                    if cell_id not in self.cell_resources or cell_id not in usage:
                         continue
                     
-                    # Update memory usage
-                    self.cell_resources[cell_id]['memory_mb'] = per_cell_memory
+                    cell_usage = usage[cell_id]
+                    memory_mb = cell_usage['memory_mb']
+                    self.cell_resources[cell_id]['memory_mb'] = memory_mb
+                    self.cell_resources[cell_id]['memory_source'] = cell_usage['memory_source']
+                    self.cell_resources[cell_id]['cpu_percent'] = cell_usage['cpu_percent']
+                    self.cell_resources[cell_id]['cpu_seconds'] = cell_usage['cpu_seconds']
+                    
+                    if cell_usage['memory_source'] == MEMORY_SHARED:
+                        continue
                     
                     # Check if memory limit exceeded
                     cell_memory_limit = self.cell_environments.get(cell_id, {}).get('resource_limits', {}).get(
                         'memory_mb', self.max_memory_per_cell_mb)
                     
-                    if per_cell_memory > cell_memory_limit:
-                        logger.warning(f"Cell {cell_id} exceeded memory limit: {per_cell_memory:.2f}MB > {cell_memory_limit}MB")
+                    if memory_mb > cell_memory_limit:
+                        logger.warning(f"Cell {cell_id} exceeded memory limit: {memory_mb:.2f}MB > {cell_memory_limit}MB")
                         
                         # Handle limit exceeded based on policy
                         enforcement_policy = self.execution_settings.get('resource_limit_policy', 'suspend')
@@ -1277,6 +1936,9 @@ class CellExecutor:
                             except Exception as e:
                                 logger.error(f"Error suspending cell after limit violation: {e}")
                 
+                if self.idle_suspend_ms is not None:
+                    await self._suspend_idle_cells()
+                
             except asyncio.CancelledError:
                 # Task was cancelled, exit gracefully
                 break
@@ -1287,6 +1949,33 @@ class CellExecutor:
         
         logger.info("Resource monitoring stopped")
 
+    async def _suspend_idle_cells(self) -> None:
+        """
+        Suspend cells idle for idle_suspend_ms while memory use is high.
+        
+        Memory use is high when system memory in use reaches
+        idle_suspend_memory_percent; 0 suspends idle cells regardless.
+        Idle-suspended cells resume on their next capability call.
+        """
+        if self.idle_suspend_memory_percent > 0:
+            import psutil
+            
+            if psutil.virtual_memory().percent < self.idle_suspend_memory_percent:
+                return
+        
+        idle_before = time.time() - self.idle_suspend_ms / 1000
+        for cell_id in list(self.active_cells.keys()):
+            resources = self.cell_resources.get(cell_id)
+            if resources is None or resources['status'] != 'active' or resources['last_active'] > idle_before:
+                continue
+            
+            try:
+                await self.suspend_cell(cell_id)
+                resources['idle_suspended'] = True
+                logger.info(f"Suspended idle cell {cell_id} under memory pressure")
+            except Exception as e:
+                logger.error(f"Error suspending idle cell {cell_id}: {e}")
+
 # Cell factory function for the assembler
 def create_cell_executor(config: Dict[str, Any], security_manager=None) -> CellExecutor:
     """
@@ -0,0 +1,565 @@
+"""
+Inter-cell message bus for the QCC Assembler.
+
+This module provides the MessageBus class, which delivers messages between
+connected cells through one inbox per receiving cell. Each inbox fans in
+the channels of all its senders, so receiving a message never depends on
+how many other channels exist in the runtime. Channels can be bounded,
+with a policy deciding what happens when a slow receiver lets one fill up.
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, Set, Deque, List
+
+logger = logging.getLogger(__name__)
+
+# What a full channel does with a new message:
+#   block: the sender waits for space (up to its timeout)
+#   drop_oldest: the oldest undelivered message is discarded
+#   drop_newest: the new message is discarded
+#   coalesce: an undelivered message with the same key is replaced;
+#             without one, the oldest message is discarded
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+# Outcomes of delivering a message
+QUEUED = "queued"
+COALESCED = "coalesced"
+DROPPED = "dropped"
+TIMED_OUT = "timed_out"
+CLOSED = "closed"
+
+
+class _Channel:
+    """Messages from one sender waiting in an inbox, with flow control."""
+
+    __slots__ = (
+        "sender_id", "messages", "consumed", "closed", "max_depth", "policy",
+        "coalesce_key", "_by_key", "stats"
+    )
+
+    def __init__(self, sender_id: str, max_depth: int, policy: str, coalesce_key: str):
+        self.sender_id = sender_id
+        # Entries are [enqueued_at, message, coalesce key]
+        self.messages: Deque[List[Any]] = deque()
+        # Arrival tokens left behind by messages not received through them
+        self.consumed = 0
+        self.closed = False
+        self.max_depth = max_depth
+        self.policy = policy
+        self.coalesce_key = coalesce_key
+        self._by_key: Dict[Any, List[Any]] = {}
+        self.stats = {
+            "sent": 0,
+            "delivered": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "blocked_sends": 0,
+            "blocked_ms": 0.0,
+            "high_watermark": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0
+        }
+
+    def full(self) -> bool:
+        """Check whether the channel is at its bound."""
+        return self.max_depth > 0 and len(self.messages) >= self.max_depth
+
+    def key_of(self, message: Dict[str, Any]) -> Any:
+        """Get the coalescing key of a message, if the channel coalesces."""
+        if self.policy != "coalesce":
+            return None
+        content = message.get("content") if isinstance(message, dict) else None
+        return content.get(self.coalesce_key) if isinstance(content, dict) else None
+
+    def append(self, message: Dict[str, Any], key: Any) -> None:
+        """Queue a message."""
+        entry = [time.monotonic(), message, key]
+        self.messages.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+        self.stats["high_watermark"] = max(self.stats["high_watermark"], len(self.messages))
+
+    def replace(self, message: Dict[str, Any], key: Any) -> bool:
+        """Replace the queued message with the same key, keeping its place."""
+        entry = self._by_key.get(key)
+        if entry is None:
+            return False
+        entry[1] = message
+        self.stats["coalesced"] += 1
+        return True
+
+    def popleft(self, dropped: bool = False) -> Dict[str, Any]:
+        """Remove the oldest message, recording its wait or its drop."""
+        entry = self.messages.popleft()
+        enqueued_at, message, key = entry
+        if key is not None and self._by_key.get(key) is entry:
+            del self._by_key[key]
+
+        if dropped:
+            self.stats["dropped"] += 1
+        else:
+            wait_ms = (time.monotonic() - enqueued_at) * 1000
+            self.stats["delivered"] += 1
+            self.stats["total_wait_ms"] += wait_ms
+            self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], wait_ms)
+        return message
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get depth, flow-control and wait-time metrics."""
+        delivered = self.stats["delivered"]
+        oldest_wait_ms = (time.monotonic() - self.messages[0][0]) * 1000 if self.messages else 0.0
+        return {
+            "depth": len(self.messages),
+            "max_depth": self.max_depth,
+            "policy": self.policy,
+            **self.stats,
+            "avg_wait_ms": self.stats["total_wait_ms"] / delivered if delivered else 0.0,
+            "oldest_wait_ms": oldest_wait_ms
+        }
+
+
+class CellInbox:
+    """
+    Fan-in inbox of one cell.
+
+    Each sender has its own FIFO channel, and every delivered message also
+    leaves a token naming its channel in one arrival queue. Receiving from
+    any sender pops the arrival queue; receiving from one sender pops that
+    channel and leaves the token to be skipped later. Once such stale tokens
+    outnumber the waiting messages they are compacted away, so the arrival
+    queue stays bounded even if only specific senders are received from.
+    Both are O(1) amortized, messages from one sender are received in the
+    order they were sent, and a message is only removed by the receiver
+    that returns it.
+
+    A single condition wakes waiting receivers when messages arrive or
+    channels close, and blocked senders when space frees up.
+
+    Attributes:
+        cell_id (str): ID of the receiving cell
+    """
+
+    def __init__(self, cell_id: str):
+        """
+        Initialize an empty inbox.
+
+        Args:
+            cell_id: ID of the receiving cell
+        """
+        self.cell_id = cell_id
+        self._channels: Dict[str, _Channel] = {}
+        self._arrivals: Deque[_Channel] = deque()
+        self._pending = 0
+        self._available = asyncio.Condition()
+
+    @property
+    def senders(self) -> Set[str]:
+        """IDs of the cells with an open channel into this inbox."""
+        return set(self._channels)
+
+    def has_senders(self) -> bool:
+        """Check whether any channel into this inbox is open."""
+        return bool(self._channels)
+
+    def open(
+        self,
+        sender_id: str,
+        max_depth: int = 0,
+        policy: str = "block",
+        coalesce_key: str = "key"
+    ) -> None:
+        """
+        Open a channel from a sender, if not already open.
+
+        Args:
+            sender_id: ID of the sending cell
+            max_depth: Maximum undelivered messages (0 for unbounded)
+            policy: Overflow policy, one of OVERFLOW_POLICIES
+            coalesce_key: Content field identifying messages to coalesce
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'; expected one of {OVERFLOW_POLICIES}")
+        if sender_id not in self._channels:
+            self._channels[sender_id] = _Channel(sender_id, max_depth, policy, coalesce_key)
+
+    async def close(self, sender_id: str) -> int:
+        """
+        Close the channel from a sender, dropping its undelivered messages.
+
+        Args:
+            sender_id: ID of the sending cell
+
+        Returns:
+            Number of messages dropped
+        """
+        channel = self._channels.pop(sender_id, None)
+        if channel is None:
+            return 0
+
+        channel.closed = True
+        dropped = len(channel.messages)
+        self._pending -= dropped
+        channel.messages.clear()
+        self._compact_arrivals()
+
+        # Wake receivers waiting on this sender and senders blocked on it
+        async with self._available:
+            self._available.notify_all()
+        return dropped
+
+    async def put(self, sender_id: str, message: Dict[str, Any], timeout: Optional[float] = None) -> str:
+        """
+        Deliver a message from a sender, applying the channel's overflow policy.
+
+        Args:
+            sender_id: ID of the sending cell
+            message: Message to deliver
+            timeout: Seconds a blocking channel may wait for space, or None
+                to wait indefinitely
+
+        Returns:
+            QUEUED, COALESCED, DROPPED (drop_newest on a full channel),
+            TIMED_OUT (no space before the timeout) or CLOSED (channel
+            closed while waiting)
+
+        Raises:
+            KeyError: If no channel from the sender is open
+        """
+        channel = self._channels[sender_id]
+        channel.stats["sent"] += 1
+        key = channel.key_of(message)
+
+        async with self._available:
+            if key is not None and channel.replace(message, key):
+                return COALESCED
+
+            if channel.full():
+                if channel.policy == "drop_newest":
+                    channel.stats["dropped"] += 1
+                    return DROPPED
+
+                if channel.policy == "block":
+                    channel.stats["blocked_sends"] += 1
+                    started = time.monotonic()
+                    try:
+                        await asyncio.wait_for(
+                            self._available.wait_for(lambda: channel.closed or not channel.full()),
+                            timeout=timeout
+                        )
+                    except asyncio.TimeoutError:
+                        channel.stats["dropped"] += 1
+                        return TIMED_OUT
+                    finally:
+                        channel.stats["blocked_ms"] += (time.monotonic() - started) * 1000
+                    if channel.closed:
+                        return CLOSED
+                else:
+                    # drop_oldest, or coalesce without a queued message to replace
+                    channel.popleft(dropped=True)
+                    channel.consumed += 1
+                    self._pending -= 1
+                    self._compact_arrivals()
+
+            channel.append(message, key)
+            self._arrivals.append(channel)
+            self._pending += 1
+            self._available.notify_all()
+            return QUEUED
+
+    async def get(self, sender_id: Optional[str] = None, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Receive the next message, waiting for one if necessary.
+
+        Args:
+            sender_id: Only receive messages from this sender
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The message, or None on timeout or if the awaited channel (or,
+            without a sender, every channel) closes
+        """
+        async with self._available:
+            try:
+                await asyncio.wait_for(
+                    self._available.wait_for(lambda: self._ready(sender_id)),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+            message = self._pop(sender_id)
+            if message is not None:
+                # Space freed up for blocked senders
+                self._available.notify_all()
+            return message
+
+    def qsize(self, sender_id: Optional[str] = None) -> int:
+        """
+        Count undelivered messages.
+
+        Args:
+            sender_id: Only count messages from this sender
+
+        Returns:
+            Number of waiting messages
+        """
+        if sender_id is None:
+            return self._pending
+        channel = self._channels.get(sender_id)
+        return len(channel.messages) if channel else 0
+
+    def channel_stats(self, sender_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the metrics of the channel from a sender.
+
+        Args:
+            sender_id: ID of the sending cell
+
+        Returns:
+            Channel metrics, or None if no channel is open
+        """
+        channel = self._channels.get(sender_id)
+        return channel.get_stats() if channel else None
+
+    def _ready(self, sender_id: Optional[str]) -> bool:
+        """Check whether get() can return without waiting."""
+        if sender_id is None:
+            # With no channels left nothing can arrive
+            return self._pending > 0 or not self._channels
+        channel = self._channels.get(sender_id)
+        return channel is None or bool(channel.messages)
+
+    def _pop(self, sender_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Remove and return the next message; only called when _ready()."""
+        if sender_id is not None:
+            channel = self._channels.get(sender_id)
+            if channel is None:
+                return None
+            channel.consumed += 1
+            self._pending -= 1
+            self._compact_arrivals()
+            return channel.popleft()
+
+        if not self._pending:
+            return None
+
+        while True:
+            channel = self._arrivals.popleft()
+            if channel.closed:
+                continue
+            if channel.consumed:
+                channel.consumed -= 1
+                continue
+            self._pending -= 1
+            return channel.popleft()
+
+    def _compact_arrivals(self) -> None:
+        """Drop stale arrival tokens once they outnumber the waiting messages."""
+        if len(self._arrivals) <= 2 * self._pending + 64:
+            return
+
+        # A channel's stale tokens are its oldest ones, as it is consumed in order
+        arrivals = deque()
+        for channel in self._arrivals:
+            if channel.closed:
+                continue
+            if channel.consumed:
+                channel.consumed -= 1
+                continue
+            arrivals.append(channel)
+        self._arrivals = arrivals
+
+
+class MessageBus:
+    """
+    Routes messages between cells through per-cell inboxes.
+
+    The bus keeps an inbox for every receiving cell and an index of each
+    cell's outgoing channels, so connecting, sending, receiving and
+    cleaning up after a cell only touch that cell's own channels.
+    """
+
+    def __init__(self):
+        """Initialize an empty bus."""
+        self._inboxes: Dict[str, CellInbox] = {}
+        self._outgoing: Dict[str, Set[str]] = {}
+
+    def open_channel(
+        self,
+        source_id: str,
+        target_id: str,
+        max_depth: int = 0,
+        policy: str = "block",
+        coalesce_key: str = "key"
+    ) -> None:
+        """
+        Open a one-way channel from a source cell to a target cell.
+
+        Args:
+            source_id: ID of the sending cell
+            target_id: ID of the receiving cell
+            max_depth: Maximum undelivered messages (0 for unbounded)
+            policy: Overflow policy, one of OVERFLOW_POLICIES
+            coalesce_key: Content field identifying messages to coalesce
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        inbox = self._inboxes.get(target_id)
+        if inbox is None:
+            inbox = self._inboxes[target_id] = CellInbox(target_id)
+        inbox.open(source_id, max_depth, policy, coalesce_key)
+        self._outgoing.setdefault(source_id, set()).add(target_id)
+
+    async def close_channel(self, source_id: str, target_id: str) -> int:
+        """
+        Close a one-way channel, dropping its undelivered messages.
+
+        Args:
+            source_id: ID of the sending cell
+            target_id: ID of the receiving cell
+
+        Returns:
+            Number of messages dropped
+        """
+        targets = self._outgoing.get(source_id)
+        if targets is not None:
+            targets.discard(target_id)
+            if not targets:
+                del self._outgoing[source_id]
+
+        inbox = self._inboxes.get(target_id)
+        return await inbox.close(source_id) if inbox else 0
+
+    def has_channel(self, source_id: str, target_id: str) -> bool:
+        """Check whether a channel from source to target is open."""
+        return target_id in self._outgoing.get(source_id, ())
+
+    def has_incoming(self, cell_id: str) -> bool:
+        """Check whether any channel into a cell is open."""
+        inbox = self._inboxes.get(cell_id)
+        return inbox is not None and inbox.has_senders()
+
+    def peers(self, cell_id: str) -> Set[str]:
+        """
+        Get the cells a cell has a channel to or from.
+
+        Args:
+            cell_id: ID of the cell
+
+        Returns:
+            IDs of the connected cells
+        """
+        inbox = self._inboxes.get(cell_id)
+        incoming = inbox.senders if inbox else set()
+        return incoming | self._outgoing.get(cell_id, set())
+
+    async def remove_cell(self, cell_id: str) -> None:
+        """
+        Close every channel to and from a cell.
+
+        Args:
+            cell_id: ID of the cell
+        """
+        for target_id in list(self._outgoing.get(cell_id, ())):
+            await self.close_channel(cell_id, target_id)
+
+        inbox = self._inboxes.pop(cell_id, None)
+        if inbox is not None:
+            for sender_id in inbox.senders:
+                await inbox.close(sender_id)
+                targets = self._outgoing.get(sender_id)
+                if targets is not None:
+                    targets.discard(cell_id)
+                    if not targets:
+                        del self._outgoing[sender_id]
+
+    async def send(
+        self,
+        source_id: str,
+        target_id: str,
+        message: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Deliver a message over an open channel.
+
+        Args:
+            source_id: ID of the sending cell
+            target_id: ID of the receiving cell
+            message: Message to deliver
+            timeout: Seconds a blocking channel may wait for space
+
+        Returns:
+            Delivery outcome (see CellInbox.put)
+
+        Raises:
+            KeyError: If no channel from source to target is open
+        """
+        return await self._inboxes[target_id].put(source_id, message, timeout)
+
+    async def receive(
+        self,
+        cell_id: str,
+        sender_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Receive the next message for a cell.
+
+        Args:
+            cell_id: ID of the receiving cell
+            sender_id: Only receive messages from this sender
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The message, or None on timeout, if the cell has no incoming
+            channels, or if the sender's channel closes while waiting
+        """
+        inbox = self._inboxes.get(cell_id)
+        if inbox is None:
+            return None
+        return await inbox.get(sender_id, timeout)
+
+    def pending(self, cell_id: str, sender_id: Optional[str] = None) -> int:
+        """
+        Count undelivered messages for a cell.
+
+        Args:
+            cell_id: ID of the receiving cell
+            sender_id: Only count messages from this sender
+
+        Returns:
+            Number of waiting messages
+        """
+        inbox = self._inboxes.get(cell_id)
+        return inbox.qsize(sender_id) if inbox else 0
+
+    def get_channel_stats(self, cell_id: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get the metrics of every channel to and from a cell.
+
+        Args:
+            cell_id: ID of the cell
+
+        Returns:
+            Dictionary with "incoming" metrics by sender and "outgoing"
+            metrics by target
+        """
+        inbox = self._inboxes.get(cell_id)
+        incoming = {
+            sender_id: inbox.channel_stats(sender_id) for sender_id in sorted(inbox.senders)
+        } if inbox else {}
+
+        outgoing = {}
+        for target_id in sorted(self._outgoing.get(cell_id, ())):
+            stats = self._inboxes[target_id].channel_stats(cell_id)
+            if stats is not None:
+                outgoing[target_id] = stats
+
+        return {"incoming": incoming, "outgoing": outgoing}
@@ -0,0 +1,258 @@
+"""
+Shared message payloads for the QCC Assembler.
+
+This module provides the SharedPayload class, which carries large binary
+data between cells. Within one process a payload is handed over by
+reference with ownership transfer, so the data is never copied or
+re-serialized; across process boundaries it pickles as a buffer.
+"""
+
+import pickle
+import logging
+from typing import Dict, Any, Optional
+
+from qcc.common.exceptions import PayloadOwnershipError
+
+logger = logging.getLogger(__name__)
+
+
+class SharedPayload:
+    """
+    A buffer handed from cell to cell without copying.
+
+    The payload wraps bytes, a bytearray, a memoryview, or any object that
+    supports the buffer protocol, such as a NumPy array or an Arrow buffer.
+    Exactly one cell owns it at a time. ``transfer()`` returns a new
+    payload over the same memory for the receiving cell and invalidates the
+    sender's handle, so the receiver may safely read, or for writable
+    buffers modify, the data in place.
+
+    Attributes:
+        owner (Optional[str]): ID of the owning cell, or None if unowned
+        content_type (str): Media type describing the data
+        metadata (Dict[str, Any]): Application details, e.g. a table schema
+    """
+
+    __slots__ = ("_data", "_view", "owner", "content_type", "metadata", "_released")
+
+    def __init__(
+        self,
+        data: Any,
+        owner: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Wrap a buffer.
+
+        Args:
+            data: Object supporting the buffer protocol
+            owner: ID of the cell creating the payload
+            content_type: Media type describing the data
+            metadata: Application details
+
+        Raises:
+            TypeError: If data does not support the buffer protocol
+        """
+        self._data = data
+        self._view = memoryview(data)
+        self.owner = owner
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self._released = False
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the data in bytes."""
+        self._check_valid()
+        return self._view.nbytes
+
+    @property
+    def released(self) -> bool:
+        """Whether ownership moved to another handle."""
+        return self._released
+
+    def view(self) -> memoryview:
+        """
+        Get a read-only view of the data without copying.
+
+        Returns:
+            Read-only memoryview over the payload
+
+        Raises:
+            PayloadOwnershipError: If the payload was transferred away
+        """
+        self._check_valid()
+        return self._view.toreadonly()
+
+    def writable_view(self) -> memoryview:
+        """
+        Get a writable view of the data without copying.
+
+        Returns:
+            Writable memoryview over the payload
+
+        Raises:
+            PayloadOwnershipError: If the payload was transferred away
+            TypeError: If the underlying buffer is read-only
+        """
+        self._check_valid()
+        if self._view.readonly:
+            raise TypeError("Payload buffer is read-only")
+        return self._view
+
+    @property
+    def data(self) -> Any:
+        """
+        The wrapped object itself, e.g. to use NumPy or Arrow APIs on it.
+
+        Raises:
+            PayloadOwnershipError: If the payload was transferred away
+        """
+        self._check_valid()
+        return self._data
+
+    def transfer(self, new_owner: str, current_owner: Optional[str] = None) -> "SharedPayload":
+        """
+        Move ownership to another cell.
+
+        Args:
+            new_owner: ID of the receiving cell
+            current_owner: ID of the cell giving the payload away; checked
+                against the owner unless the payload is unowned
+
+        Returns:
+            New payload over the same memory, owned by new_owner
+
+        Raises:
+            PayloadOwnershipError: If the payload was transferred away or
+                belongs to a different cell
+        """
+        self._check_sender(current_owner)
+
+        moved = SharedPayload.__new__(SharedPayload)
+        moved._data = self._data
+        moved._view = self._view
+        moved.owner = new_owner
+        moved.content_type = self.content_type
+        moved.metadata = self.metadata
+        moved._released = False
+
+        self._released = True
+        self._data = None
+        self._view = None
+        return moved
+
+    def _give_back(self, original: "SharedPayload") -> None:
+        """Return ownership to the handle this payload was transferred from."""
+        original._data = self._data
+        original._view = self._view
+        original._released = False
+
+        self._released = True
+        self._data = None
+        self._view = None
+
+    def to_bytes(self) -> bytes:
+        """Copy the data into a bytes object."""
+        self._check_valid()
+        return self._view.tobytes()
+
+    def __reduce_ex__(self, protocol: int):
+        """
+        Pickle for transport to another process.
+
+        With pickle protocol 5 the buffer is passed out of band when the
+        transport supports it; otherwise the data is copied once.
+        """
+        self._check_valid()
+        if protocol >= 5:
+            buffer = pickle.PickleBuffer(self._view if self._view.contiguous else self._view.tobytes())
+        else:
+            buffer = self._view.tobytes()
+        return (_restore_payload, (buffer, self.owner, self.content_type, self.metadata))
+
+    def _check_sender(self, current_owner: Optional[str]) -> None:
+        """Raise if this handle cannot be given away by current_owner."""
+        self._check_valid()
+        if self.owner is not None and current_owner is not None and self.owner != current_owner:
+            raise PayloadOwnershipError(
+                f"Cell {current_owner} cannot transfer a payload owned by {self.owner}",
+                cell_id=current_owner,
+                owner_id=self.owner
+            )
+
+    def _check_valid(self) -> None:
+        """Raise if ownership was transferred away from this handle."""
+        if self._released:
+            raise PayloadOwnershipError("Payload was transferred to another cell", owner_id=self.owner)
+
+    def __repr__(self) -> str:
+        if self._released:
+            return "SharedPayload(<released>)"
+        return f"SharedPayload(owner={self.owner!r}, content_type={self.content_type!r}, nbytes={self._view.nbytes})"
+
+
+def _restore_payload(
+    buffer: Any,
+    owner: Optional[str],
+    content_type: str,
+    metadata: Dict[str, Any]
+) -> SharedPayload:
+    """Rebuild a payload unpickled in another process."""
+    return SharedPayload(buffer, owner=owner, content_type=content_type, metadata=metadata)
+
+
+def transfer_payloads(content: Any, source_id: str, target_id: str) -> Any:
+    """
+    Hand the shared payloads in message content to the receiving cell.
+
+    The content itself, or the values of a content dictionary, are
+    checked; other values pass through untouched by reference.
+
+    Args:
+        content: Message content
+        source_id: ID of the sending cell
+        target_id: ID of the receiving cell
+
+    Returns:
+        Content with every payload replaced by one owned by the target
+
+    Raises:
+        PayloadOwnershipError: If the sender does not own a payload
+    """
+    if isinstance(content, SharedPayload):
+        return content.transfer(target_id, source_id)
+
+    if isinstance(content, dict) and any(isinstance(value, SharedPayload) for value in content.values()):
+        # Check every payload first so a failure leaves all of them with the sender
+        for value in content.values():
+            if isinstance(value, SharedPayload):
+                value._check_sender(source_id)
+        return {
+            key: value.transfer(target_id, source_id) if isinstance(value, SharedPayload) else value
+            for key, value in content.items()
+        }
+
+    return content
+
+
+def return_payloads(content: Any, transferred: Any) -> None:
+    """
+    Undo transfer_payloads for a message that was not delivered.
+
+    The sender's handles in the original content become valid again and
+    the handles made for the receiver are invalidated.
+
+    Args:
+        content: Message content passed to transfer_payloads
+        transferred: Content transfer_payloads returned for it
+    """
+    if isinstance(content, SharedPayload):
+        transferred._give_back(content)
+        return
+
+    if isinstance(content, dict) and transferred is not content:
+        for key, value in content.items():
+            if isinstance(value, SharedPayload):
+                transferred[key]._give_back(value)
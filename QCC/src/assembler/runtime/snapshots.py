@@ -0,0 +1,347 @@
+"""
+Suspended cell state snapshots for the QCC Assembler.
+
+This module provides the SnapshotStore class, which turns the state a
+cell saves on suspension into a compact binary StateSnapshot instead of
+keeping the live dictionary around:
+
+- Each top-level state entry is pickled with protocol 5. Buffers that
+  pickle out-of-band, such as SharedPayload and NumPy arrays, are neither
+  copied into the pickle stream nor compressed.
+- Pickle streams are zlib-compressed when that makes them smaller.
+- Entries above a size threshold are spilled to a file and memory-mapped,
+  so the operating system can page them out.
+- A cell suspended before only stores the entries that changed since its
+  previous snapshot; unchanged entries are shared with it.
+"""
+
+import os
+import mmap
+import zlib
+import pickle
+import hashlib
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Compression applied to pickle streams
+SNAPSHOT_COMPRESSIONS = ("zlib", "none")
+
+_MAGIC = b"QCCS\x01"
+
+
+class _Segment:
+    """One pickled state entry, held in memory or in a memory-mapped spill file."""
+
+    __slots__ = ("digest", "data", "buffers", "compressed", "size", "spilled", "_mapping", "_path")
+
+    def __init__(self, digest: bytes, data: Any, buffers: List[Any], compressed: bool, size: int):
+        self.digest = digest
+        self.data = data
+        self.buffers = buffers
+        self.compressed = compressed
+        self.size = size
+        self.spilled = False
+        self._mapping: Optional[mmap.mmap] = None
+        self._path: Optional[str] = None
+
+    @property
+    def stored_bytes(self) -> int:
+        """Bytes the segment occupies, in memory or on disk."""
+        return len(self.data) + sum(memoryview(buffer).nbytes for buffer in self.buffers)
+
+    def spill(self, directory: Optional[str]) -> None:
+        """Move the segment's bytes to a file and map it back read-only."""
+        fd, path = tempfile.mkstemp(prefix="qcc-snapshot-", suffix=".bin", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as spill_file:
+                spill_file.write(self.data)
+                for buffer in self.buffers:
+                    spill_file.write(buffer)
+            with open(path, "rb") as spill_file:
+                mapping = mmap.mmap(spill_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            os.remove(path)
+            raise
+
+        try:
+            # The mapping stays valid after the file is unlinked, and the
+            # disk space is freed with it
+            os.remove(path)
+        except OSError:
+            self._path = path
+
+        view = memoryview(mapping)
+        offset = len(self.data)
+        buffers = []
+        for buffer in self.buffers:
+            nbytes = memoryview(buffer).nbytes
+            buffers.append(view[offset:offset + nbytes])
+            offset += nbytes
+
+        self.data = view[:len(self.data)]
+        self.buffers = buffers
+        self.spilled = True
+        self._mapping = mapping
+
+    def load(self) -> Any:
+        """Unpickle the entry; spilled buffers are read from the mapping without copying."""
+        data = zlib.decompress(self.data) if self.compressed else self.data
+        return pickle.loads(data, buffers=self.buffers)
+
+    def close(self) -> None:
+        """Release the spill file of the segment."""
+        mapping, self._mapping = self._mapping, None
+        if mapping is None:
+            return
+
+        self.data, self.buffers = b"", []
+        try:
+            mapping.close()
+        except BufferError:
+            # Restored objects still view the mapping; it closes with them
+            pass
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError as e:
+                logger.warning(f"Could not remove snapshot spill file {self._path}: {e}")
+
+
+class StateSnapshot:
+    """
+    Compact binary snapshot of the state a cell saved on suspension.
+
+    Attributes:
+        cell_id (str): ID of the cell the state belongs to
+        sequence (int): Number of snapshots taken of the cell so far
+        segments (Dict[Any, _Segment]): Pickled state entries by key
+        reused (int): Entries shared unchanged with the previous snapshot
+    """
+
+    def __init__(self, cell_id: str, sequence: int, segments: Dict[Any, _Segment], reused: int = 0):
+        """
+        Initialize the snapshot.
+
+        Args:
+            cell_id: ID of the cell
+            sequence: Number of snapshots taken of the cell so far
+            segments: Pickled state entries by key
+            reused: Entries shared unchanged with the previous snapshot
+        """
+        self.cell_id = cell_id
+        self.sequence = sequence
+        self.segments = segments
+        self.reused = reused
+
+    def restore(self) -> Dict[str, Any]:
+        """
+        Rebuild the saved state.
+
+        Returns:
+            A new state dictionary equal to the one the cell saved
+        """
+        return {key: segment.load() for key, segment in self.segments.items()}
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the snapshot, e.g. to persist it.
+
+        Returns:
+            Self-contained bytes readable by StateSnapshot.from_bytes
+        """
+        segments = {
+            key: (segment.digest, segment.compressed, segment.size, bytes(segment.data),
+                  [bytes(buffer) for buffer in segment.buffers])
+            for key, segment in self.segments.items()
+        }
+        return _MAGIC + pickle.dumps((self.cell_id, self.sequence, segments), protocol=5)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "StateSnapshot":
+        """
+        Read a snapshot serialized by to_bytes.
+
+        Args:
+            data: Serialized snapshot
+
+        Returns:
+            The snapshot, held in memory
+
+        Raises:
+            ValueError: If data is not a serialized snapshot
+        """
+        if not data.startswith(_MAGIC):
+            raise ValueError("Not a cell state snapshot")
+        cell_id, sequence, segments = pickle.loads(data[len(_MAGIC):])
+        return cls(cell_id, sequence, {
+            key: _Segment(digest, payload, buffers, compressed, size)
+            for key, (digest, compressed, size, payload, buffers) in segments.items()
+        })
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the state size, stored size and reuse of the snapshot."""
+        return {
+            "sequence": self.sequence,
+            "entries": len(self.segments),
+            "reused_entries": self.reused,
+            "state_bytes": sum(segment.size for segment in self.segments.values()),
+            "memory_bytes": sum(
+                segment.stored_bytes for segment in self.segments.values() if not segment.spilled
+            ),
+            "spilled_bytes": sum(
+                segment.stored_bytes for segment in self.segments.values() if segment.spilled
+            )
+        }
+
+
+class SnapshotStore:
+    """
+    Takes cell state snapshots and keeps each cell's latest one.
+
+    The latest snapshot of a cell is the base of its next one: entries
+    whose pickled bytes did not change are shared instead of being
+    compressed and stored again. Segments no longer used by the latest
+    snapshot are released when it is replaced.
+
+    Attributes:
+        compression (str): "zlib" or "none"
+        compression_level (int): zlib level, 1 (fastest) to 9
+        min_compress_bytes (int): Smallest pickle stream worth compressing
+        spill_threshold_bytes (Optional[int]): Entry size from which it is
+            spilled to disk, or None to keep everything in memory
+        spill_dir (Optional[str]): Directory for spill files
+        delta (bool): Whether snapshots share unchanged entries
+    """
+
+    def __init__(
+        self,
+        compression: str = "zlib",
+        compression_level: int = 1,
+        min_compress_bytes: int = 1024,
+        spill_threshold_bytes: Optional[int] = 16 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        delta: bool = True
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            compression: "zlib" or "none"
+            compression_level: zlib level, 1 (fastest) to 9
+            min_compress_bytes: Smallest pickle stream worth compressing
+            spill_threshold_bytes: Entry size from which it is spilled to
+                disk, or None to keep everything in memory
+            spill_dir: Directory for spill files, or None for the system
+                temporary directory
+            delta: Whether snapshots share unchanged entries
+
+        Raises:
+            ValueError: If the compression is not supported
+        """
+        if compression not in SNAPSHOT_COMPRESSIONS:
+            raise ValueError(f"Unsupported snapshot compression '{compression}'")
+        self.compression = compression
+        self.compression_level = compression_level
+        self.min_compress_bytes = min_compress_bytes
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.spill_dir = spill_dir
+        self.delta = delta
+        self._latest: Dict[str, StateSnapshot] = {}
+        self._sequences: Dict[str, int] = {}
+
+    def save(self, cell_id: str, state: Dict[str, Any]) -> StateSnapshot:
+        """
+        Snapshot a cell's saved state and make it the cell's latest snapshot.
+
+        Args:
+            cell_id: ID of the cell
+            state: State the cell saved
+
+        Returns:
+            The snapshot
+
+        Raises:
+            pickle.PicklingError: If the state cannot be pickled
+        """
+        base = self._latest.get(cell_id) if self.delta else None
+        segments = {}
+        reused = 0
+
+        for key, value in state.items():
+            buffers = []
+            data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+            views = [buffer.raw() for buffer in buffers]
+            digest = self._digest(data, views)
+
+            previous = base.segments.get(key) if base is not None else None
+            if previous is not None and previous.digest == digest:
+                segments[key] = previous
+                reused += 1
+                continue
+
+            segments[key] = self._store(digest, data, views)
+
+        sequence = self._sequences.get(cell_id, 0) + 1
+        self._sequences[cell_id] = sequence
+        snapshot = StateSnapshot(cell_id, sequence, segments, reused)
+        self._replace(cell_id, snapshot)
+
+        logger.debug(f"Snapshot {sequence} of cell {cell_id}: {snapshot.get_stats()}")
+        return snapshot
+
+    def latest(self, cell_id: str) -> Optional[StateSnapshot]:
+        """Get the latest snapshot of a cell, if any."""
+        return self._latest.get(cell_id)
+
+    def discard(self, cell_id: str) -> None:
+        """Forget a cell's snapshots and release their spill files."""
+        self._replace(cell_id, None)
+        self._sequences.pop(cell_id, None)
+
+    def get_stats(self, cell_id: str) -> Optional[Dict[str, Any]]:
+        """Get the statistics of a cell's latest snapshot, if any."""
+        snapshot = self._latest.get(cell_id)
+        return snapshot.get_stats() if snapshot is not None else None
+
+    def _store(self, digest: bytes, data: bytes, views: List[memoryview]) -> _Segment:
+        """Compress and place a changed entry."""
+        size = len(data) + sum(view.nbytes for view in views)
+
+        compressed = False
+        if self.compression == "zlib" and len(data) >= self.min_compress_bytes:
+            packed = zlib.compress(data, self.compression_level)
+            if len(packed) < len(data):
+                data, compressed = packed, True
+
+        if self.spill_threshold_bytes is not None and size >= self.spill_threshold_bytes:
+            segment = _Segment(digest, data, views, compressed, size)
+            segment.spill(self.spill_dir)
+        else:
+            # Own copy of the buffers, so later changes to the cell's objects
+            # do not leak into the snapshot
+            segment = _Segment(digest, data, [view.tobytes() for view in views], compressed, size)
+        return segment
+
+    def _replace(self, cell_id: str, snapshot: Optional[StateSnapshot]) -> None:
+        """Make a snapshot the cell's latest, releasing segments only the old one used."""
+        old = self._latest.pop(cell_id, None)
+        if snapshot is not None:
+            self._latest[cell_id] = snapshot
+        if old is None:
+            return
+
+        kept = {id(segment) for segment in snapshot.segments.values()} if snapshot is not None else set()
+        for segment in old.segments.values():
+            if id(segment) not in kept:
+                segment.close()
+
+    @staticmethod
+    def _digest(data: bytes, views: List[memoryview]) -> bytes:
+        """Hash an entry's pickle stream and out-of-band buffers."""
+        digest = hashlib.blake2b(data, digest_size=16)
+        for view in views:
+            digest.update(view)
+        return digest.digest()
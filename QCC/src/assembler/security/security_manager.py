@@ -11,6 +11,7 @@ from typing import Dict, List, Any, Optional, Set
 
 from qcc.common.exceptions import SecurityVerificationError
 from qcc.common.models import Cell
+from qcc.common.telemetry import telemetry
 
 from .signature_verifier import SignatureVerifier
 from .cell_verifier import CellVerifier
@@ -67,18 +68,21 @@ class SecurityManager:
         logger.info(f"Verifying {len(cells)} cells")
         
         # Verify the quantum signature
-        if not await self.signature_verifier.verify_signature(quantum_signature):
+        with telemetry.span("security.verify_signature"):
+            signature_valid = await self.signature_verifier.verify_signature(quantum_signature)
+        if not signature_valid:
             raise SecurityVerificationError("Invalid quantum signature")
             
         # Verify each cell
         verification_results = []
         for cell_id, cell in cells.items():
             try:
-                verified = await self.cell_verifier.verify_cell(
-                    cell, 
-                    quantum_signature, 
-                    security_level=self.security_level
-                )
+                with telemetry.span("security.verify_cell", cell_id=cell_id):
+                    verified = await self.cell_verifier.verify_cell(
+                        cell, 
+                        quantum_signature, 
+                        security_level=self.security_level
+                    )
                 verification_results.append(verified)
                 
                 if verified:
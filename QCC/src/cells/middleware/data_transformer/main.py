@@ -123,6 +123,18 @@ class DataTransformerCell(BaseCell):
         except Exception as e:
             return self._error_response(f"Error converting data: {str(e)}")
     
+    async def convert_format_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert many data sets in one call.
+        
+        Args:
+            batch: Arguments of each convert_format call
+            
+        Returns:
+            The convert_format result of each call, in order
+        """
+        return [await self.convert_format(**call) for call in batch]
+    
     async def filter_data(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Filter data based on criteria.
@@ -474,6 +486,18 @@ class DataTransformerCell(BaseCell):
         except Exception as e:
             return self._error_response(f"Error transforming data: {str(e)}")
     
+    async def transform_data_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply transformations to many data sets in one call.
+        
+        Args:
+            batch: Arguments of each transform_data call
+            
+        Returns:
+            The transform_data result of each call, in order
+        """
+        return [await self.transform_data(**call) for call in batch]
+    
     def _parse_data(self, data: Any, format: str, options: Dict[str, Any] = None) -> Any:
         """
         Parse data from a specific format.
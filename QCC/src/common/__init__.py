@@ -48,6 +48,8 @@ from .config import (
 
 from .logging import setup_logger, get_logger
 
+from .telemetry import LatencyHistogram, Span, Telemetry, get_telemetry
+
 # Module version
 __version__ = '1.0.0'
 
@@ -92,5 +94,11 @@ __all__ = [
     
     # Logging
     'setup_logger',
-    'get_logger'
+    'get_logger',
+    
+    # Telemetry
+    'LatencyHistogram',
+    'Span',
+    'Telemetry',
+    'get_telemetry'
 ]
@@ -328,6 +328,46 @@ class CellConnectionError(CellError):
         super().__init__(message, error_code="CELL_CONNECTION_ERROR", details=details)
 
 
+class PayloadOwnershipError(CellError):
+    """Error raised when a cell uses a shared payload it does not own."""
+    
+    def __init__(self, message, cell_id=None, owner_id=None, **kwargs):
+        """
+        Initialize payload ownership error.
+        
+        Args:
+            message: Error message
+            cell_id: ID of the cell using the payload
+            owner_id: ID of the cell owning the payload
+        """
+        details = kwargs.get('details', {})
+        details.update({
+            "cell_id": cell_id,
+            "owner_id": owner_id
+        })
+        super().__init__(message, error_code="PAYLOAD_OWNERSHIP_ERROR", details=details)
+
+
+class ExecutionCancelledError(CellExecutionError):
+    """Error raised when a cell method is cancelled, e.g. after its deadline."""
+    
+    def __init__(self, message="Cell method execution was cancelled", cell_id=None, capability=None, reason=None, **kwargs):
+        """
+        Initialize execution cancelled error.
+        
+        Args:
+            message: Error message
+            cell_id: ID of the cell
+            capability: Capability being executed
+            reason: Why the execution was cancelled
+        """
+        details = kwargs.get('details', {})
+        details.update({
+            "reason": reason
+        })
+        super().__init__(message, cell_id=cell_id, capability=capability, details=details)
+
+
 # Runtime Exceptions
 
 class RuntimeError(QCCError):
@@ -0,0 +1,291 @@
+"""
+Latency histograms and trace spans for the QCC system.
+
+This module provides lightweight instrumentation shared by the assembler
+and the components it drives. Every timed span feeds a latency histogram
+named after the span, so per-phase percentiles are always available.
+Individual spans, with parent/child links, are only kept when tracing is
+enabled.
+"""
+
+import time
+import uuid
+import bisect
+import logging
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency buckets in milliseconds
+DEFAULT_BUCKETS_MS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000
+)
+
+# Span that encloses the code currently running in this task
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "qcc_current_span", default=None
+)
+
+
+class LatencyHistogram:
+    """
+    Bucketed latency histogram with percentile estimates.
+
+    Attributes:
+        buckets_ms (Sequence[float]): Upper bounds of the finite buckets
+        counts (List[int]): Samples per bucket, plus one overflow bucket
+        count (int): Number of samples
+        sum_ms (float): Sum of all samples
+        min_ms (Optional[float]): Smallest sample
+        max_ms (Optional[float]): Largest sample
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets_ms: Ascending upper bounds of the buckets in milliseconds
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def record(self, value_ms: float) -> None:
+        """
+        Record a latency sample.
+
+        Args:
+            value_ms: Latency in milliseconds
+        """
+        self.counts[bisect.bisect_left(self.buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.min_ms = value_ms if self.min_ms is None else min(self.min_ms, value_ms)
+        self.max_ms = value_ms if self.max_ms is None else max(self.max_ms, value_ms)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate a latency percentile.
+
+        The estimate interpolates linearly inside the bucket holding the
+        requested rank and is clamped to the observed minimum and maximum.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in milliseconds, or None if there are no samples
+        """
+        if not self.count:
+            return None
+
+        rank = percentile / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets_ms[index - 1] if index > 0 else 0.0
+                upper = self.buckets_ms[index] if index < len(self.buckets_ms) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation with common percentiles."""
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "mean_ms": self.sum_ms / self.count if self.count else None,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {
+                **{str(bound): count for bound, count in zip(self.buckets_ms, self.counts)},
+                "+Inf": self.counts[-1]
+            }
+        }
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Attributes:
+        name (str): Operation name, also used as the histogram name
+        trace_id (str): ID shared by every span of one trace
+        span_id (str): ID of this span
+        parent_id (Optional[str]): ID of the enclosing span
+        attributes (Dict[str, Any]): Operation details
+        start_time (float): Start as a Unix timestamp
+        duration_ms (Optional[float]): Duration once finished
+        status (str): "ok" or "error"
+        error (Optional[str]): Error message if the operation failed
+    """
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.duration_ms = None
+        self.status = "ok"
+        self.error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a detail to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "attributes": self.attributes,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error
+        }
+
+
+class Telemetry:
+    """
+    Collects latency histograms and, optionally, trace spans.
+
+    Spans are linked through a context variable, so spans opened by
+    different components while serving one assembly share a trace, and
+    tasks started inside a span become its children.
+
+    Attributes:
+        tracing_enabled (bool): Whether finished spans are kept
+        max_spans (int): Maximum number of finished spans kept
+        histograms (Dict[str, LatencyHistogram]): Histograms by span name
+    """
+
+    def __init__(self, tracing_enabled: bool = False, max_spans: int = 1000):
+        """
+        Initialize telemetry.
+
+        Args:
+            tracing_enabled: Whether finished spans are kept
+            max_spans: Maximum number of finished spans kept
+        """
+        self.tracing_enabled = tracing_enabled
+        self.max_spans = max_spans
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._spans = deque(maxlen=max_spans)
+
+    def configure(self, tracing_enabled: Optional[bool] = None, max_spans: Optional[int] = None) -> None:
+        """
+        Change telemetry settings.
+
+        Args:
+            tracing_enabled: Whether finished spans are kept
+            max_spans: Maximum number of finished spans kept
+        """
+        if tracing_enabled is not None:
+            self.tracing_enabled = tracing_enabled
+        if max_spans is not None and max_spans != self.max_spans:
+            self.max_spans = max_spans
+            self._spans = deque(self._spans, maxlen=max_spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time an operation as a span.
+
+        The duration is always recorded in the histogram called ``name``.
+
+        Args:
+            name: Operation name
+            **attributes: Operation details
+
+        Yields:
+            The span, which may be given more attributes
+        """
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            _current_span.reset(token)
+            self.record(name, span.duration_ms)
+            if self.tracing_enabled:
+                self._spans.append(span)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """
+        Record a duration measured elsewhere.
+
+        Args:
+            name: Histogram name
+            duration_ms: Duration in milliseconds
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            self.histograms[name] = histogram
+        histogram.record(duration_ms)
+
+    def current_span(self) -> Optional[Span]:
+        """Get the span enclosing the calling code, if any."""
+        return _current_span.get()
+
+    def get_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export all histograms.
+
+        Returns:
+            Histogram dictionaries keyed by name
+        """
+        return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def get_spans(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Export finished spans.
+
+        Args:
+            trace_id: Only return spans of this trace
+
+        Returns:
+            Span dictionaries in the order the spans finished
+        """
+        return [
+            span.to_dict() for span in self._spans
+            if trace_id is None or span.trace_id == trace_id
+        ]
+
+    def reset(self) -> None:
+        """Drop all histograms and spans."""
+        self.histograms.clear()
+        self._spans.clear()
+
+
+# Telemetry shared by all QCC components in this process
+telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Get the process-wide telemetry instance."""
+    return telemetry
@@ -71,6 +71,7 @@ def mock_intent_interpreter():
         }
     
     interpreter.analyze = analyze_mock
+    interpreter.normalize_request = lambda user_request: user_request.lower()
     return interpreter
 
 @pytest.fixture
@@ -109,10 +110,15 @@ def mock_cell_runtime():
         """Mock cell connection."""
         return True
     
+    async def disconnect_cells_mock(source, target):
+        """Mock cell disconnection."""
+        return True
+    
     runtime.activate_cell = activate_cell_mock
     runtime.deactivate_cell = deactivate_cell_mock
     runtime.release_cell = release_cell_mock
     runtime.connect_cells = connect_cells_mock
+    runtime.disconnect_cells = disconnect_cells_mock
     
     return runtime
 
@@ -11,8 +11,10 @@ import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 
 from qcc.assembler.core.assembler import CellAssembler
+from qcc.assembler.core.cell_pool import WarmCellPool
+from qcc.assembler.intent import IntentInterpreter
 from qcc.common.exceptions import CellRequestError, SecurityVerificationError
-from qcc.common.models import Solution, Cell
+from qcc.common.models import Solution, Cell, CellConfiguration
 
 @pytest.mark.asyncio
 async def test_assembler_initialization():
@@ -211,6 +213,686 @@ async def test_assemble_solution_security_verification_error(
         # Verify that release_cell was called to clean up
         assert mock_cell_runtime.release_cell.call_count == 1
 
+@pytest.mark.asyncio
+async def test_connect_and_activate_cells_follows_connection_map():
+    """Test that cells activate after the cells they connect to."""
+    # Arrange
+    assembler = CellAssembler(user_id="test_user")
+    events = []
+    
+    runtime = Mock()
+    async def connect_cells_mock(source, target):
+        events.append(("connect", source.id, target.id))
+        return True
+    
+    async def activate_cell_mock(cell):
+        await asyncio.sleep(0.01)
+        events.append(("activate", cell.id))
+        return True
+    
+    runtime.connect_cells = connect_cells_mock
+    runtime.activate_cell = activate_cell_mock
+    assembler.cell_runtime = runtime
+    
+    cells = {
+        "ui": Cell(id="ui", capability="ui_rendering"),
+        "text": Cell(id="text", capability="text_generation"),
+        "files": Cell(id="files", capability="file_system"),
+        "weather": Cell(id="weather", capability="weather")
+    }
+    connection_map = {
+        "ui_rendering": ["text_generation"],
+        "text": ["files"]
+    }
+    
+    # Act
+    await assembler._connect_and_activate_cells(cells, connection_map)
+    
+    # Assert
+    assert events.index(("activate", "files")) < events.index(("connect", "text", "files"))
+    assert events.index(("activate", "text")) < events.index(("connect", "ui", "text"))
+    assert events.index(("connect", "ui", "text")) < events.index(("activate", "ui"))
+    assert ("activate", "weather") in events
+
+def make_intent_interpreter(plans=None, use_previous_configurations=False):
+    """
+    Mock an intent interpreter planning each request from a table.
+    
+    plans maps a request to its (capabilities, connections) plan or to an
+    exception to raise. Requests without a plan need test_capability.
+    Analyzed requests are kept in ``analyzed``.
+    """
+    interpreter = Mock(spec=IntentInterpreter)
+    interpreter.analyzed = []
+    
+    async def analyze_mock(user_request, context=None):
+        """Mock analysis following the plan table."""
+        interpreter.analyzed.append(user_request)
+        plan = (plans or {}).get(user_request, (["test_capability"], {}))
+        if isinstance(plan, Exception):
+            raise plan
+        capabilities, connections = plan
+        return {
+            "required_capabilities": list(capabilities),
+            "suggested_connections": dict(connections),
+            "use_previous_configurations": use_previous_configurations
+        }
+    
+    interpreter.analyze = analyze_mock
+    interpreter.normalize_request = lambda user_request: user_request.lower()
+    return interpreter
+
+def make_assembler(intent_interpreter, security_manager, cell_runtime, quantum_trail, config=None):
+    """
+    Create an assembler from mocked components whose providers return new
+    cells at once. Capabilities requested from providers are kept in
+    ``requested``.
+    """
+    assembler = CellAssembler(user_id="test_user", config=config)
+    assembler.intent_interpreter = intent_interpreter
+    assembler.security_manager = security_manager
+    assembler.cell_runtime = cell_runtime
+    assembler.quantum_trail = quantum_trail
+    assembler.requested = []
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        """Mock a provider returning a fresh cell."""
+        assembler.requested.append(capability)
+        return Cell(capability=capability, provider=provider_url, quantum_signature=quantum_signature)
+    
+    assembler._request_cell_from_provider = request_cell_mock
+    return assembler
+
+def record_runtime_events(runtime):
+    """Make a mock cell runtime log activations, connections and disconnections."""
+    events = []
+    
+    async def activate_cell_mock(cell):
+        events.append(("activate", cell.capability))
+        cell.status = "active"
+        return True
+    
+    async def connect_cells_mock(source, target):
+        events.append(("connect", source.capability, target.capability))
+        return True
+    
+    async def disconnect_cells_mock(source, target):
+        events.append(("disconnect", source.capability, target.capability))
+        return True
+    
+    runtime.activate_cell = activate_cell_mock
+    runtime.connect_cells = connect_cells_mock
+    runtime.disconnect_cells = disconnect_cells_mock
+    return events
+
+@pytest.mark.asyncio
+async def test_initialize_seeds_capability_patterns_from_quantum_trail(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test the assembler predicts capabilities the quantum trail remembers before its first assembly."""
+    # Arrange
+    queried = []
+    
+    async def find_similar_configurations_mock(capabilities, context_similarity, max_results):
+        queried.append(capabilities)
+        return [{
+            "cell_specs": [{"capability": "text_editor"}, {"capability": "file_system"}],
+            "use_count": 3
+        }]
+    
+    mock_intent_interpreter.capability_mapping = {
+        "edit": [{"name": "text_editor"}, {"name": "file_system"}],
+        "browse": [{"name": "web_browser"}]
+    }
+    mock_quantum_trail.find_similar_configurations = find_similar_configurations_mock
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail,
+        config={"speculative_assembly": True}
+    )
+    
+    # Act
+    await assembler.initialize()
+    
+    # Assert
+    assert queried == [["file_system", "text_editor", "web_browser"]]
+    assert assembler.capability_patterns.predict() == ["file_system", "text_editor"]
+
+@pytest.mark.asyncio
+async def test_speculative_assembly_commits_predicted_cell(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test that a speculatively requested cell is used by the assembly."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail,
+        config={"speculative_assembly": True}
+    )
+    assembler.capability_patterns.observe(["test_capability", "file_system"], weight=5)
+    
+    # Act
+    solution = await assembler.assemble_solution("Test request")
+    
+    # Assert
+    stats = assembler.capability_patterns.get_stats()
+    assert stats["prefetched"] == 2
+    assert stats["hits"] == 1
+    assert assembler.requested.count("test_capability") == 1
+    assert [cell.capability for cell in solution.cells.values()] == ["test_capability"]
+
+@pytest.mark.asyncio
+async def test_speculative_assembly_re_signs_committed_cell(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test speculative cells are requested under a provisional signature and re-signed on commit."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail,
+        config={"speculative_assembly": True}
+    )
+    assembler.capability_patterns.observe(["test_capability"], weight=5)
+    request_signatures = []
+    request_cell = assembler._request_cell_from_provider
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        request_signatures.append(quantum_signature)
+        return await request_cell(provider_url, capability, quantum_signature, context)
+    
+    assembler._request_cell_from_provider = request_cell_mock
+    
+    # Act
+    solution = await assembler.assemble_solution("Test request")
+    
+    # Assert
+    cell = solution.get_cells_by_capability("test_capability")[0]
+    assert len(request_signatures) == 1
+    assert request_signatures[0] is not None
+    assert request_signatures[0] != solution.quantum_signature
+    assert cell.quantum_signature == solution.quantum_signature
+
+@pytest.mark.asyncio
+async def test_speculative_assembly_discards_unneeded_cells(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test that speculative cells the request does not need stay out of the solution."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail,
+        config={"speculative_assembly": True}
+    )
+    assembler.capability_patterns.observe(["test_capability", "file_system"], weight=5)
+    
+    # Act
+    solution = await assembler.assemble_solution("Test request")
+    
+    # Assert
+    assert assembler.capability_patterns.get_stats()["wasted"] == 1
+    assert not solution.get_cells_by_capability("file_system")
+
+@pytest.mark.asyncio
+async def test_assemble_solutions_batch_reports_each_request(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test batch assembly returns a result per request, including failures."""
+    # Arrange
+    interpreter = make_intent_interpreter({"broken": ValueError("Cannot analyze request")})
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    requests = [{"user_request": "Open editor"}, {"user_request": "Open editor"}, {"user_request": "broken"}]
+    
+    # Act
+    results = [result async for result in assembler.assemble_solutions_batch(requests)]
+    
+    # Assert
+    by_index = {result["index"]: result for result in results}
+    assert [by_index[index]["status"] for index in range(3)] == ["success", "success", "error"]
+    assert by_index[0]["solution"].id != by_index[1]["solution"].id
+    assert len(assembler.active_solutions) == 2
+
+@pytest.mark.asyncio
+async def test_assemble_solutions_batch_analyzes_identical_requests_once(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test identical requests in a batch share one intent analysis."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    requests = [{"user_request": "Open editor"}, {"user_request": "Open editor"}]
+    
+    # Act
+    results = [result async for result in assembler.assemble_solutions_batch(requests)]
+    
+    # Assert
+    assert len(results) == 2
+    assert interpreter.analyzed == ["Open editor"]
+
+@pytest.mark.asyncio
+async def test_assemble_solutions_batch_analyzes_each_device_class(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test identical requests from devices of different memory classes are analyzed separately."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    requests = [
+        {"user_request": "Open editor", "context": {"device_info": {"platform": "android", "memory_gb": 1}}},
+        {"user_request": "Open editor", "context": {"device_info": {"platform": "android", "memory_gb": 16}}}
+    ]
+    
+    # Act
+    results = [result async for result in assembler.assemble_solutions_batch(requests)]
+    
+    # Assert
+    assert len(results) == 2
+    assert interpreter.analyzed == ["Open editor", "Open editor"]
+
+@pytest.mark.asyncio
+async def test_assemble_solutions_batch_signs_each_solution(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test identical requests in a batch still get their own quantum signature."""
+    # Arrange
+    signatures = []
+    
+    async def generate_signature_mock(user_id, intent, context):
+        signatures.append(f"qt-{user_id}-{len(signatures)}")
+        return signatures[-1]
+    
+    mock_quantum_trail.generate_signature = generate_signature_mock
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    requests = [{"user_request": "Open editor"}, {"user_request": "Open editor"}]
+    
+    # Act
+    results = [result async for result in assembler.assemble_solutions_batch(requests)]
+    
+    # Assert
+    solution_signatures = {result["solution"].quantum_signature for result in results}
+    assert solution_signatures == set(signatures)
+    assert len(solution_signatures) == 2
+
+@pytest.mark.asyncio
+async def test_solution_templates_skip_repeated_analysis(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a repeated request, up to normalization, reuses the cached template."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    
+    # Act
+    await assembler.assemble_solution("Open editor")
+    await assembler.assemble_solution("open EDITOR")
+    
+    # Assert
+    assert interpreter.analyzed == ["Open editor"]
+    assert (await assembler.get_status())["solution_templates"]["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_solution_templates_are_specific_to_the_device_context(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a request from an incompatible device context is analyzed again."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    mobile = {"device_info": {"platform": "android", "memory_gb": 1}}
+    
+    # Act
+    await assembler.assemble_solution("Open editor")
+    await assembler.assemble_solution("Open editor", mobile)
+    
+    # Assert
+    assert interpreter.analyzed == ["Open editor", "Open editor"]
+
+@pytest.mark.asyncio
+async def test_invalidate_solution_templates_by_capability(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test templates using an invalidated capability are dropped."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    await assembler.assemble_solution("Open editor")
+    
+    # Act
+    dropped = assembler.invalidate_solution_templates(["test_capability"])
+    await assembler.assemble_solution("Open editor")
+    
+    # Assert
+    assert dropped == 1
+    assert interpreter.analyzed == ["Open editor", "Open editor"]
+
+@pytest.mark.asyncio
+async def test_release_solution_invalidates_its_template(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test releasing a solution drops the trail-configuration template it was assembled from."""
+    # Arrange
+    configuration = CellConfiguration(
+        id="editor-config",
+        cell_specs=[{"cell_type": "editor", "capability": "test_capability"}],
+        performance_score=0.9
+    )
+    
+    async def find_similar_mock(*args, **kwargs):
+        return [configuration]
+    
+    mock_quantum_trail.find_similar_configurations = find_similar_mock
+    interpreter = make_intent_interpreter(use_previous_configurations=True)
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    
+    async def request_cells_by_configuration_mock(*args, **kwargs):
+        cell = Cell(capability="test_capability", provider="test-provider")
+        return {cell.id: cell}
+    
+    assembler._request_cells_by_configuration = request_cells_by_configuration_mock
+    solution = await assembler.assemble_solution("Open editor")
+    
+    # Act
+    await assembler.release_solution(solution.id)
+    await assembler.assemble_solution("Open editor")
+    
+    # Assert
+    assert interpreter.analyzed == ["Open editor", "Open editor"]
+
+@pytest.mark.asyncio
+async def test_recording_an_assembly_invalidates_other_templates_for_its_capabilities(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a trail record drops templates sharing its capabilities but keeps the recorded plan's own."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    
+    # Act
+    await assembler.assemble_solution("Open editor")
+    await assembler.assemble_solution("Edit text")
+    await assembler.assemble_solution("Edit text")
+    await assembler.assemble_solution("Open editor")
+    
+    # Assert
+    assert interpreter.analyzed == ["Open editor", "Edit text", "Open editor"]
+
+@pytest.mark.asyncio
+async def test_solution_template_is_keyed_on_the_pattern_version_of_its_analysis(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a template analyzed after a pattern reload is only reused under the new version."""
+    # Arrange
+    interpreter = make_intent_interpreter()
+    interpreter.pattern_version = 1
+    analyze = interpreter.analyze
+    
+    async def reloading_analyze_mock(user_request, context=None):
+        """Mock an analysis running against a pattern snapshot reloaded meanwhile."""
+        return {**await analyze(user_request, context), "pattern_version": 2}
+    
+    interpreter.analyze = reloading_analyze_mock
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    
+    # Act
+    await assembler.assemble_solution("Open editor")
+    interpreter.pattern_version = 2
+    await assembler.assemble_solution("Open editor")
+    
+    # Assert
+    assert interpreter.analyzed == ["Open editor"]
+
+RECONFIGURE_PLANS = {
+    "edit files": (["ui_rendering", "storage"], {"ui_rendering": ["storage"]}),
+    "edit and summarize": (["ui_rendering", "summarization"], {"ui_rendering": ["summarization"]})
+}
+
+@pytest.mark.asyncio
+async def test_reconfigure_solution_acquires_only_missing_cells(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test reconfiguration keeps cells still needed and only requests new ones."""
+    # Arrange
+    assembler = make_assembler(
+        make_intent_interpreter(RECONFIGURE_PLANS), mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    solution = await assembler.assemble_solution("edit files")
+    ui_cell = solution.get_cells_by_capability("ui_rendering")[0]
+    assembler.requested.clear()
+    
+    # Act
+    result = await assembler.reconfigure_solution(solution.id, "edit and summarize")
+    
+    # Assert
+    assert result is solution
+    assert assembler.requested == ["summarization"]
+    assert solution.get_cell(ui_cell.id) is ui_cell
+
+@pytest.mark.asyncio
+async def test_reconfigure_solution_rewires_and_releases_removed_cells(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test reconfiguration only changes the connections that changed."""
+    # Arrange
+    assembler = make_assembler(
+        make_intent_interpreter(RECONFIGURE_PLANS), mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    events = record_runtime_events(mock_cell_runtime)
+    solution = await assembler.assemble_solution("edit files")
+    storage_cell = solution.get_cells_by_capability("storage")[0]
+    events.clear()
+    
+    # Act
+    await assembler.reconfigure_solution(solution.id, "edit and summarize")
+    
+    # Assert
+    assert storage_cell.id not in solution.cells
+    assert storage_cell.status == "released"
+    assert events == [
+        ("activate", "summarization"),
+        ("connect", "ui_rendering", "summarization"),
+        ("disconnect", "ui_rendering", "storage")
+    ]
+
+@pytest.mark.asyncio
+async def test_concurrent_reconfigurations_of_a_solution_run_in_turn(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a reconfiguration starts from the cells the previous one left."""
+    # Arrange
+    assembler = make_assembler(
+        make_intent_interpreter(RECONFIGURE_PLANS), mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    solution = await assembler.assemble_solution("edit files")
+    assembler.requested.clear()
+    
+    # Act
+    await asyncio.gather(
+        assembler.reconfigure_solution(solution.id, "edit and summarize"),
+        assembler.reconfigure_solution(solution.id, "edit files")
+    )
+    
+    # Assert
+    assert assembler.requested == ["summarization", "storage"]
+    assert sorted(cell.capability for cell in solution.cells.values()) == ["storage", "ui_rendering"]
+
+@pytest.mark.asyncio
+async def test_release_solution_waits_for_reconfiguration(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a solution released while it is reconfigured is released after the reconfiguration."""
+    # Arrange
+    assembler = make_assembler(
+        make_intent_interpreter(RECONFIGURE_PLANS), mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    solution = await assembler.assemble_solution("edit files")
+    
+    # Act
+    reconfigured, released = await asyncio.gather(
+        assembler.reconfigure_solution(solution.id, "edit and summarize"),
+        assembler.release_solution(solution.id)
+    )
+    
+    # Assert
+    assert released is True
+    assert solution.id not in assembler.active_solutions
+    assert reconfigured.get_cells_by_capability("summarization")[0].status != "active"
+
+@pytest.mark.asyncio
+async def test_assemble_solution_reports_progress(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test progress events follow the assembly phases."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    events = []
+    
+    # Act
+    await assembler.assemble_solution("Test request", progress=events.append)
+    
+    # Assert
+    assert [event["event"] for event in events] == [
+        "intent_analyzed",
+        "cell_acquired",
+        "cells_verified",
+        "cell_activated",
+        "solution_ready"
+    ]
+    assert events[0]["capabilities"] == ["test_capability"]
+    assert assembler.estimate_assembly_time_ms() == events[-1]["assembly_time_ms"]
+
+@pytest.mark.asyncio
+async def test_assemble_solution_registers_solution_while_assembling(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test a solution is visible under its ID before assembly completes."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    statuses_during_activation = []
+    
+    async def activate_cell_mock(cell):
+        statuses_during_activation.append(assembler.active_solutions["job-1"].status)
+        return True
+    
+    mock_cell_runtime.activate_cell = activate_cell_mock
+    
+    # Act
+    solution = await assembler.assemble_solution("Test request", solution_id="job-1")
+    
+    # Assert
+    assert solution.id == "job-1"
+    assert solution.status == "active"
+    assert statuses_during_activation == ["assembling"]
+
+@pytest.mark.asyncio
+async def test_assemble_solution_records_phase_latency(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test each assembly phase records a latency sample."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail
+    )
+    assembler.telemetry.reset()
+    
+    # Act
+    await assembler.assemble_solution("Test request")
+    status = await assembler.get_status()
+    
+    # Assert
+    for phase in (
+        "assembler.assemble_solution",
+        "assembler.intent_analysis",
+        "quantum_trail.generate_signature",
+        "quantum_trail.find_similar_configurations",
+        "assembler.acquire_cell",
+        "provider.request_cell",
+        "assembler.verify_cells",
+        "assembler.activate_cell",
+        "quantum_trail.record_assembly"
+    ):
+        assert status["phase_latency"][phase]["count"] == 1
+        assert status["phase_latency"][phase]["p99_ms"] is not None
+
+@pytest.mark.asyncio
+async def test_assemble_solution_records_nested_trace_spans(
+    mock_intent_interpreter,
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test assembly phases are traced as child spans of one trace."""
+    # Arrange
+    assembler = make_assembler(
+        mock_intent_interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail,
+        config={"tracing_enabled": True}
+    )
+    assembler.telemetry.reset()
+    
+    # Act
+    try:
+        await assembler.assemble_solution("Test request")
+        spans = {span["name"]: span for span in assembler.telemetry.get_spans()}
+    finally:
+        assembler.telemetry.configure(tracing_enabled=False)
+    
+    # Assert
+    root = spans["assembler.assemble_solution"]
+    assert root["parent_id"] is None
+    assert spans["assembler.plan"]["parent_id"] == root["span_id"]
+    assert spans["assembler.intent_analysis"]["parent_id"] == spans["assembler.plan"]["span_id"]
+    assert spans["provider.request_cell"]["trace_id"] == root["trace_id"]
+
 @pytest.mark.asyncio
 async def test_release_solution_successful(
     mock_solution,
@@ -307,6 +989,120 @@ async def test_select_provider_for_capability():
     # Assert
     assert provider in assembler.provider_urls
 
+@pytest.mark.asyncio
+async def test_select_provider_prefers_fast_reliable_provider():
+    """Test that provider selection follows observed latency and errors."""
+    # Arrange
+    assembler = CellAssembler(
+        user_id="test_user",
+        provider_urls=["slow-provider", "flaky-provider", "fast-provider"]
+    )
+    scoreboard = assembler.provider_scoreboard
+    
+    for _ in range(10):
+        scoreboard.record_result("slow-provider", "test_capability", 800)
+        scoreboard.record_result("flaky-provider", "test_capability", 50, error=True)
+        scoreboard.record_result("fast-provider", "test_capability", 100)
+    
+    # Act
+    provider = assembler._select_provider_for_capability("test_capability")
+    
+    # Assert
+    assert provider == "fast-provider"
+    assert scoreboard.hedge_delay_ms("fast-provider", "test_capability") == 100
+
+@pytest.mark.asyncio
+async def test_hedged_request_uses_faster_provider():
+    """Test that a slow provider request is hedged and the loser cancelled."""
+    # Arrange
+    assembler = CellAssembler(
+        user_id="test_user",
+        provider_urls=["slow-provider", "fast-provider"],
+        config={"default_hedge_delay_ms": 50}
+    )
+    cancelled = []
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        try:
+            await asyncio.sleep(10 if provider_url == "slow-provider" else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(provider_url)
+            raise
+        return Cell(id=f"cell-{provider_url}", capability=capability, provider=provider_url)
+    
+    assembler._request_cell_from_provider = request_cell_mock
+    assembler._select_provider_for_capability = lambda capability: "slow-provider"
+    
+    # Act
+    cell = await assembler._acquire_cell_for_capability("test_capability", "test-signature", {})
+    
+    # Assert
+    assert cell.provider == "fast-provider"
+    assert cancelled == ["slow-provider"]
+
+@pytest.mark.asyncio
+async def test_hedged_request_records_no_latency_for_cancelled_provider():
+    """Test that the cancelled hedge leaves the provider's latency stats alone."""
+    # Arrange
+    assembler = CellAssembler(
+        user_id="test_user",
+        provider_urls=["slow-provider", "fast-provider"],
+        config={"default_hedge_delay_ms": 50}
+    )
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        await asyncio.sleep(10 if provider_url == "slow-provider" else 0.01)
+        return Cell(capability=capability, provider=provider_url)
+    
+    assembler._request_cell_from_provider = request_cell_mock
+    assembler._select_provider_for_capability = lambda capability: "slow-provider"
+    
+    # Act
+    await assembler._acquire_cell_for_capability("test_capability", "test-signature", {})
+    
+    # Assert
+    stats = assembler.provider_scoreboard.get_stats()
+    assert "slow-provider" not in stats
+    assert stats["fast-provider"]["requests"] == 1
+
+@pytest.mark.asyncio
+async def test_hedged_request_releases_cell_of_second_winner(mock_cell_runtime):
+    """Test that when both hedged requests succeed, the unused cell is released."""
+    # Arrange
+    assembler = CellAssembler(
+        user_id="test_user",
+        provider_urls=["first-provider", "second-provider"],
+        config={"default_hedge_delay_ms": 10}
+    )
+    assembler.cell_runtime = mock_cell_runtime
+    gate = asyncio.Event()
+    requested = []
+    released = []
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        requested.append(provider_url)
+        if len(requested) == 2:
+            gate.set()
+        # Both providers answer together once the hedge was sent
+        await gate.wait()
+        return Cell(capability=capability, provider=provider_url)
+    
+    async def release_cell_mock(cell):
+        released.append(cell)
+        return True
+    
+    mock_cell_runtime.release_cell = release_cell_mock
+    assembler._request_cell_from_provider = request_cell_mock
+    assembler._select_provider_for_capability = lambda capability: "first-provider"
+    
+    # Act
+    cell = await assembler._acquire_cell_for_capability("test_capability", "test-signature", {})
+    
+    # Assert
+    assert requested == ["first-provider", "second-provider"]
+    assert len(released) == 1
+    assert released[0] is not cell
+
 @pytest.mark.asyncio
 async def test_select_best_configuration(mock_cell_configuration):
     """Test selection of the best configuration from alternatives."""
@@ -373,6 +1169,35 @@ async def test_request_cells_by_capabilities(mock_repository_manager):
     assert cells["cell-capability1"].capability == "capability1"
     assert cells["cell-capability2"].capability == "capability2"
 
+@pytest.mark.asyncio
+async def test_request_cells_by_capabilities_cancels_on_failure(mock_cell_runtime):
+    """Test that a failed required capability cancels in-flight requests."""
+    # Arrange
+    assembler = CellAssembler(user_id="test_user", provider_urls=["provider1"])
+    assembler.cell_runtime = mock_cell_runtime
+    cancelled = []
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        if capability == "failing":
+            raise CellRequestError("Provider unavailable")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(capability)
+            raise
+    
+    assembler._request_cell_from_provider = request_cell_mock
+    
+    # Act & Assert
+    with pytest.raises(CellRequestError):
+        await assembler._request_cells_by_capabilities(
+            ["slow", "failing"],
+            "test-signature",
+            {}
+        )
+    
+    assert cancelled == ["slow"]
+
 @pytest.mark.asyncio
 async def test_get_status():
     """Test getting assembler status."""
@@ -433,6 +1258,114 @@ async def test_caching_behavior():
     # Check newer cell replaced older one
     assert cached_cell.id == "newer-cell"
 
+@pytest.mark.asyncio
+async def test_cell_cache_limits_and_context_buckets(mock_cell_runtime):
+    """Test warm pool memory limits, eviction and context compatibility."""
+    # Arrange
+    assembler = CellAssembler(
+        user_id="test_user",
+        config={"max_cell_cache_size_mb": 25, "max_cached_cells_per_capability": 2}
+    )
+    assembler.cell_runtime = mock_cell_runtime
+    mobile_context = {"device_info": {"platform": "mobile"}}
+    
+    cells = [
+        Cell(
+            id=f"pooled-{i}",
+            capability="pool-capability",
+            provider="test-provider",
+            context=mobile_context,
+            resource_usage={"memory_mb": 10}
+        )
+        for i in range(3)
+    ]
+    
+    # Act
+    for cell in cells:
+        assembler._add_to_cache(cell)
+    await assembler._release_task
+    
+    # Assert - the per-capability limit evicted and released the oldest cell
+    assert len(assembler.cell_cache) == 2
+    assert assembler.cell_cache.memory_mb == 20
+    assert cells[0].status == "released"
+    
+    # Cells are only reused for compatible contexts
+    assert assembler._get_from_cache("pool-capability", {"device_info": {"platform": "linux"}}) is None
+    assert assembler._get_from_cache("pool-capability", mobile_context).id == "pooled-2"
+    assert assembler._get_from_cache("pool-capability", mobile_context).id == "pooled-1"
+    assert assembler._get_from_cache("pool-capability", mobile_context) is None
+
+def test_lfu_pool_keeps_hits_of_a_refilled_bucket():
+    """Test a bucket emptied by a hit keeps its frequency when it is refilled."""
+    # Arrange
+    pool = WarmCellPool(max_cells=2, eviction_policy="lfu")
+    pool.add(Cell(id="editor-1", capability="editor"))
+    pool.acquire("editor")
+    
+    # Act
+    pool.add(Cell(id="viewer-1", capability="viewer"))
+    pool.add(Cell(id="editor-2", capability="editor"))
+    evicted = pool.add(Cell(id="player-1", capability="player"))
+    
+    # Assert
+    assert [cell.id for cell in evicted] == ["viewer-1"]
+
+def test_pool_bounds_hit_counts_of_emptied_buckets():
+    """Test hit counts are only kept for as many emptied buckets as the pool holds cells."""
+    # Arrange
+    pool = WarmCellPool(max_cells=2, eviction_policy="lfu")
+    
+    # Act
+    for i in range(10):
+        pool.add(Cell(id=f"cell-{i}", capability="editor"), compatibility_key=i)
+        pool.acquire("editor", compatibility_key=i)
+    
+    # Assert
+    assert len(pool) == 0
+    assert list(pool._idle_hits) == [("editor", 8), ("editor", 9)] and not pool._bucket_hits
+
+@pytest.mark.asyncio
+async def test_release_solution_keeps_core_cells_warm(
+    mock_security_manager,
+    mock_cell_runtime,
+    mock_quantum_trail
+):
+    """Test released cells of core capabilities go to the warm pool."""
+    # Arrange
+    interpreter = make_intent_interpreter({"browse files": (["file_system"], {})})
+    assembler = make_assembler(interpreter, mock_security_manager, mock_cell_runtime, mock_quantum_trail)
+    solution = await assembler.assemble_solution("browse files")
+    cell = solution.get_cells_by_capability("file_system")[0]
+    
+    # Act
+    released = await assembler.release_solution(solution.id)
+    
+    # Assert
+    assert released is True
+    assert assembler._get_from_cache("file_system", cell.context) is cell
+
+@pytest.mark.asyncio
+async def test_failed_acquisition_returns_pooled_cells(mock_cell_runtime):
+    """Test warm cells taken by a failed assembly go back to the pool."""
+    # Arrange
+    assembler = CellAssembler(user_id="test_user", provider_urls=["provider1"])
+    assembler.cell_runtime = mock_cell_runtime
+    pooled = Cell(id="pooled", capability="pool-capability", provider="provider1")
+    assembler._add_to_cache(pooled)
+    
+    async def request_cell_mock(provider_url, capability, quantum_signature, context=None):
+        raise CellRequestError("Provider unavailable")
+    
+    assembler._request_cell_from_provider = request_cell_mock
+    
+    # Act
+    with pytest.raises(CellRequestError):
+        await assembler._request_cells_by_capabilities(["pool-capability", "failing"], "test-signature", {})
+    
+    # Assert
+    assert assembler._get_from_cache("pool-capability", {}) is pooled
+
 @pytest.mark.asyncio
 async def test_request_specific_cell():
     """Test requesting a specific cell type and version."""
@@ -0,0 +1,1139 @@
+"""
+Unit tests for the CellExecutor component.
+
+These tests verify that the CellExecutor runs cells and delivers messages
+between connected cells.
+"""
+
+import os
+import time
+import pickle
+import pytest
+import asyncio
+import threading
+import tracemalloc
+from types import SimpleNamespace
+
+from qcc.assembler.runtime import SharedPayload, StateSnapshot
+from qcc.assembler.runtime.snapshots import SnapshotStore
+from qcc.assembler.runtime.executor import CellExecutor
+from qcc.assembler.runtime.message_bus import CellInbox
+from qcc.assembler.runtime.accounting import ResourceAccountant
+from qcc.common.exceptions import PayloadOwnershipError, ExecutionCancelledError
+
+
+PLACEMENT_CELL_CODE = """
+import os
+import threading
+
+class PlacementCell:
+    def initialize(self, cell_id, **kwargs):
+        return {'status': 'success', 'capabilities': [{'name': 'where'}]}
+
+    def where(self, n=0):
+        return {'status': 'success', 'pid': os.getpid(), 'thread': threading.get_ident(), 'total': sum(range(n))}
+"""
+
+DEADLINE_CELL_CODE = """
+import time
+
+class DeadlineCell:
+    def initialize(self, cell_id, **kwargs):
+        self.cell_id = cell_id
+        self.stopped = False
+        return {'status': 'success', 'capabilities': []}
+
+    def quick(self):
+        return {'status': 'success'}
+
+    def identify(self):
+        return {'status': 'success', 'cell_id': self.cell_id}
+
+    def cooperative(self, cancellation_token):
+        while not cancellation_token.wait(0.005):
+            pass
+        cancellation_token.raise_if_cancelled()
+
+    def runaway(self):
+        try:
+            while True:
+                pass
+        finally:
+            self.stopped = True
+
+    def lingering(self):
+        finish = time.monotonic() + 0.2
+        while time.monotonic() < finish:
+            pass
+        self.finished = True
+"""
+
+
+STATEFUL_CELL_CODE = """
+from qcc.assembler.runtime import SharedPayload
+
+class StatefulCell:
+    def initialize(self, cell_id, **kwargs):
+        self.cache = {f'media_{i}': {'title': 'Track', 'tags': ['a', 'b']} for i in range(500)}
+        self.frames = SharedPayload(bytearray(FRAMES_SIZE))
+        self.position = 0
+        self.restored = None
+        return {'status': 'success', 'capabilities': []}
+
+    def seek(self, position):
+        self.position = position
+        return {'status': 'success'}
+
+    def suspend(self):
+        state = {'cache': self.cache, 'frames': self.frames, 'position': self.position}
+        return {'status': 'success', 'state': 'suspended', 'saved_state': state}
+
+    def resume(self, saved_state=None):
+        self.restored = saved_state
+        if saved_state:
+            self.cache = saved_state['cache']
+            self.frames = saved_state['frames']
+            self.position = saved_state['position']
+        return {'status': 'success', 'state': 'active'}
+"""
+
+
+HOG_CELL_CODE = PLACEMENT_CELL_CODE.replace("class PlacementCell", "class HogCell") + """
+    def hoard(self):
+        self.data = [bytes(1024 * 1024) for _ in range(8)]
+        return {'status': 'success', 'total': sum(range(50000))}
+"""
+
+LOOKUP_CELL_CODE = """
+import asyncio
+
+class LookupCell:
+    def initialize(self, cell_id, **kwargs):
+        self.lookups = 0
+        self.version = 0
+        return {'status': 'success', 'capabilities': []}
+
+    async def lookup(self, path):
+        self.lookups += 1
+        await asyncio.sleep(0.05)
+        return {'status': 'success', 'path': path, 'version': self.version}
+
+    def update(self):
+        self.version += 1
+        return {'status': 'success'}
+"""
+
+LOOKUP_MANIFEST = {'capabilities': [
+    {'name': 'lookup', 'coalesce': {'cache_ttl_ms': 1000}},
+    {'name': 'update'}
+]}
+
+BATCH_CELL_CODE = """
+import threading
+
+class BatchCell:
+    def initialize(self, cell_id, **kwargs):
+        self.threads = set()
+        self.batches = []
+        return {'status': 'success', 'capabilities': []}
+
+    def square(self, x):
+        self.threads.add(threading.get_ident())
+        if x < 0:
+            raise ValueError('negative')
+        return {'status': 'success', 'value': x * x}
+
+    async def double(self, x):
+        return {'status': 'success', 'value': 2 * x}
+
+    async def double_batch(self, batch):
+        self.batches.append(len(batch))
+        return [{'status': 'success', 'value': 2 * call['x']} for call in batch]
+"""
+
+# Suspends and resumes the way the shipped application cells do
+DOCUMENTS_CELL_CODE = """
+class DocumentsCell:
+    def initialize(self, cell_id, **kwargs):
+        self.documents = {}
+        return {'status': 'success', 'capabilities': []}
+
+    def write(self, name, text):
+        self.documents[name] = text
+        return {'status': 'success'}
+
+    def read(self, name):
+        return {'status': 'success', 'text': self.documents.get(name)}
+
+    async def suspend(self):
+        return {'status': 'success', 'state': 'suspended', 'saved_state': {'documents': self.documents}}
+
+    async def resume(self, parameters):
+        if 'saved_state' in parameters:
+            self.documents = parameters['saved_state']['documents']
+        return {'status': 'success', 'state': 'active'}
+"""
+
+
+def stateful_cell_code(frames_size=256 * 1024):
+    """Get the StatefulCell code with frames of frames_size bytes."""
+    return STATEFUL_CELL_CODE.replace("FRAMES_SIZE", str(frames_size))
+
+
+def make_executor(*cell_ids, runtime=None):
+    """Create an executor with the runtime settings and bare, already active cells."""
+    executor = CellExecutor({'cells': {'runtime': runtime or {}}})
+    for cell_id in cell_ids:
+        executor.active_cells[cell_id] = object()
+        executor.cell_resources[cell_id] = {
+            'memory_mb': 0,
+            'cpu_percent': 0,
+            'start_time': time.time(),
+            'last_active': time.time(),
+            'capabilities_executed': 0,
+            'status': 'active'
+        }
+    return executor
+
+
+async def start_cell(executor, cell_id, code, **attributes):
+    """Initialize and activate a cell from code; attributes are set on the Cell."""
+    await executor.initialize_cell(SimpleNamespace(id=cell_id, code=code, **attributes))
+    executor.cell_resources[cell_id]['status'] = 'active'
+    return executor.active_cells[cell_id]
+
+
+def write_cell_module(tmp_path, monkeypatch, name, code):
+    """Write code to an importable module and return its file."""
+    module_file = tmp_path / f"{name}.py"
+    module_file.write_text(code)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return module_file
+
+
+
+async def connect_and_send(executor, sender_ids, receiver_id, contents):
+    """Connect each sender to the receiver and send it the sender's contents in order."""
+    for sender_id in sender_ids:
+        await executor.connect_cells(sender_id, receiver_id)
+    for sender_id, content in contents:
+        await executor.send_message(sender_id, receiver_id, {"content": content})
+
+
+@pytest.mark.asyncio
+async def test_receive_message_from_sender_skips_other_senders():
+    """Test receiving from one sender leaves earlier messages of others queued."""
+    # Arrange
+    executor = make_executor("a", "b", "c")
+    await connect_and_send(executor, ("a", "b"), "c", [("a", "a1"), ("b", "b1")])
+
+    # Act
+    from_b = await executor.receive_message("c", sender_id="b")
+    from_any = await executor.receive_message("c")
+
+    # Assert
+    assert from_b["content"] == {"content": "b1"}
+    assert from_any["content"] == {"content": "a1"}
+
+
+@pytest.mark.asyncio
+async def test_receive_message_keeps_order_per_sender():
+    """Test a cell receives each sender's messages in the order they were sent."""
+    # Arrange
+    executor = make_executor("a", "c")
+    await connect_and_send(executor, ("a",), "c", [("a", "a1"), ("a", "a2")])
+
+    # Act
+    received = [await executor.receive_message("c", timeout=0.01) for _ in range(2)]
+
+    # Assert
+    assert [message["content"]["content"] for message in received] == ["a1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_receive_message_times_out_on_empty_inbox():
+    """Test receiving from an empty inbox gives None once the timeout passes."""
+    # Arrange
+    executor = make_executor("a", "c")
+    await executor.connect_cells("a", "c")
+
+    # Act
+    received = await executor.receive_message("c", timeout=0.01)
+
+    # Assert
+    assert received is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_receivers_each_get_one_message():
+    """Test messages sent to waiting receivers are delivered once each."""
+    # Arrange
+    executor = make_executor("a", "b", "c")
+    await connect_and_send(executor, ("a", "b"), "c", [])
+    waiters = [asyncio.ensure_future(executor.receive_message("c", timeout=1)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    # Act
+    await executor.send_message("a", "c", {"content": "a3"})
+    await executor.send_message("b", "c", {"content": "b2"})
+    received = await asyncio.gather(*waiters)
+
+    # Assert
+    assert sorted(message["content"]["content"] for message in received) == ["a3", "b2"]
+
+
+@pytest.mark.asyncio
+async def test_released_cell_channels_are_removed():
+    """Test releasing a cell closes its channels and forgets its inbox peer."""
+    # Arrange
+    executor = make_executor("a", "b", "c")
+    await connect_and_send(executor, ("a", "b"), "c", [])
+
+    # Act
+    await executor.release_cell("a")
+
+    # Assert
+    assert set(executor.communication_channels) == {("b", "c"), ("c", "b")}
+    assert executor.message_bus.peers("c") == {"b"}
+
+
+@pytest.mark.asyncio
+async def test_inbox_compacts_tokens_of_messages_received_by_sender():
+    """Test receiving from one sender does not grow the arrival queue, and keeps the fan-in order."""
+    # Arrange
+    inbox = CellInbox("c")
+    inbox.open("a")
+    inbox.open("b")
+    await inbox.put("b", {"content": "b1"})
+
+    # Act
+    for n in range(1000):
+        await inbox.put("a", {"content": n})
+        await inbox.get(sender_id="a")
+    await inbox.put("a", {"content": "a-last"})
+    arrivals = len(inbox._arrivals)
+    remaining = [(await inbox.get())["content"] for _ in range(2)]
+
+    # Assert
+    assert arrivals <= 2 * 2 + 64
+    assert remaining == ["b1", "a-last"]
+
+
+@pytest.mark.asyncio
+async def test_send_message_transfers_shared_payload_without_copying():
+    """Test a shared payload moves to the receiver by reference."""
+    # Arrange
+    executor = make_executor("a", "b")
+    await executor.connect_cells("a", "b")
+    buffer = bytearray(b"x" * 1024)
+    payload = SharedPayload(buffer, owner="a")
+
+    # Act
+    await executor.send_message("a", "b", {"rows": payload, "count": 2})
+    received = (await executor.receive_message("b"))["content"]["rows"]
+    received.writable_view()[0] = ord("y")
+
+    # Assert
+    assert received.owner == "b"
+    assert received.data is buffer
+    assert buffer[0] == ord("y")
+
+
+@pytest.mark.asyncio
+async def test_sender_loses_access_to_sent_shared_payload():
+    """Test the sender can neither read nor send a payload it handed over."""
+    # Arrange
+    executor = make_executor("a", "b")
+    await executor.connect_cells("a", "b")
+    payload = SharedPayload(bytearray(b"rows"), owner="a")
+    await executor.send_message("a", "b", payload)
+    received = (await executor.receive_message("b"))["content"]
+
+    # Act / Assert
+    assert payload.released
+    with pytest.raises(PayloadOwnershipError):
+        payload.view()
+    with pytest.raises(PayloadOwnershipError):
+        await executor.send_message("a", "b", received)
+
+
+def test_shared_payload_pickles_out_of_band():
+    """Test a shared payload survives pickling for a worker process."""
+    # Arrange
+    payload = SharedPayload(bytearray(b"x" * 1024), owner="b", content_type="text/csv")
+
+    # Act
+    restored = pickle.loads(pickle.dumps(payload, protocol=5))
+
+    # Assert
+    assert restored.to_bytes() == b"x" * 1024
+    assert restored.content_type == "text/csv"
+
+
+@pytest.mark.asyncio
+async def test_dropped_message_leaves_shared_payload_with_sender():
+    """Test a payload in a message the channel drops still belongs to the sender."""
+    # Arrange
+    executor = make_executor("a", "b")
+    await executor.connect_cells("a", "b", max_depth=1, overflow_policy="drop_newest")
+    await executor.send_message("a", "b", {"n": 0})
+    payload = SharedPayload(bytearray(b"rows"), owner="a")
+
+    # Act
+    sent = await executor.send_message("a", "b", {"rows": payload})
+
+    # Assert
+    assert not sent
+    assert not payload.released
+    assert payload.to_bytes() == b"rows"
+
+
+@pytest.mark.asyncio
+async def test_timed_out_message_leaves_shared_payload_with_sender():
+    """Test a payload in a message that waited in vain for space can be sent again."""
+    # Arrange
+    executor = make_executor("a", "b")
+    executor.channel_block_timeout_ms = 10
+    await executor.connect_cells("a", "b", max_depth=1, overflow_policy="block")
+    await executor.send_message("a", "b", {"n": 0})
+    payload = SharedPayload(bytearray(b"rows"), owner="a")
+    with pytest.raises(Exception, match="full"):
+        await executor.send_message("a", "b", payload)
+    await executor.receive_message("b")
+
+    # Act
+    sent = await executor.send_message("a", "b", payload)
+    received = (await executor.receive_message("b"))["content"]
+
+    # Assert
+    assert sent
+    assert payload.released
+    assert received.owner == "b" and received.to_bytes() == b"rows"
+
+
+async def fill_channel(executor, policy, messages, max_depth=2):
+    """Send messages from a to b over a bounded channel and return whether each was queued."""
+    await executor.connect_cells("a", "b", max_depth=max_depth, overflow_policy=policy)
+    return [await executor.send_message("a", "b", message) for message in messages]
+
+
+async def drain(executor, count):
+    """Receive count messages from a to b and return their contents."""
+    return [(await executor.receive_message("b", sender_id="a"))["content"] for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_full_drop_oldest_channel_discards_its_oldest_message():
+    """Test a drop_oldest channel makes room for a new message."""
+    # Arrange
+    executor = make_executor("a", "b")
+
+    # Act
+    sent = await fill_channel(executor, "drop_oldest", [{"n": n} for n in range(3)])
+    received = await drain(executor, 2)
+    incoming = (await executor.get_cell_status("b"))["channels"]["incoming"]
+
+    # Assert
+    assert sent == [True, True, True]
+    assert received == [{"n": 1}, {"n": 2}]
+    assert incoming["a"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_drop_newest_channel_rejects_new_message():
+    """Test a drop_newest channel refuses messages while full."""
+    # Arrange
+    executor = make_executor("a", "b")
+
+    # Act
+    sent = await fill_channel(executor, "drop_newest", [{"n": n} for n in range(3)])
+    received = await drain(executor, 2)
+    incoming = (await executor.get_cell_status("b"))["channels"]["incoming"]
+
+    # Assert
+    assert sent == [True, True, False]
+    assert received == [{"n": 0}, {"n": 1}]
+    assert incoming["a"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_coalesce_channel_replaces_message_with_same_key():
+    """Test a coalesce channel overwrites the queued message with the new one's key."""
+    # Arrange
+    executor = make_executor("a", "b")
+    messages = [{"key": key, "n": n} for key, n in (("x", 0), ("y", 1), ("x", 2))]
+
+    # Act
+    sent = await fill_channel(executor, "coalesce", messages)
+    received = await drain(executor, 2)
+    incoming = (await executor.get_cell_status("b"))["channels"]["incoming"]
+
+    # Assert
+    assert all(sent)
+    assert [message["n"] for message in received] == [2, 1]
+    assert incoming["a"]["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_block_channel_fails_send_after_timeout():
+    """Test a blocked send gives up once the channel stays full past its timeout."""
+    # Arrange
+    executor = make_executor("a", "b")
+    executor.channel_block_timeout_ms = 10
+    await fill_channel(executor, "block", [{"n": 0}], max_depth=1)
+
+    # Act / Assert
+    with pytest.raises(Exception, match="full"):
+        await executor.send_message("a", "b", {"n": 1})
+    assert executor.message_bus.pending("b", "a") == 1
+
+
+@pytest.mark.asyncio
+async def test_full_block_channel_resumes_send_once_space_frees():
+    """Test a blocked send completes when the receiver takes a message."""
+    # Arrange
+    executor = make_executor("a", "b")
+    executor.channel_block_timeout_ms = 1000
+    await fill_channel(executor, "block", [{"n": 0}], max_depth=1)
+    blocked = asyncio.ensure_future(executor.send_message("a", "b", {"n": 1}))
+    await asyncio.sleep(0)
+
+    # Act
+    first = await drain(executor, 1)
+    sent = await blocked
+    incoming = (await executor.get_cell_status("b"))["channels"]["incoming"]
+
+    # Assert
+    assert first == [{"n": 0}] and sent
+    assert incoming["a"]["blocked_sends"] == 1 and incoming["a"]["depth"] == 1
+
+
+@pytest.mark.asyncio
+async def test_channel_status_reports_depth_and_wait_metrics():
+    """Test channel statistics on both ends of a connection."""
+    # Arrange
+    executor = make_executor("a", "b")
+    await fill_channel(executor, "drop_oldest", [{"n": n} for n in range(3)])
+    await asyncio.sleep(0.001)
+
+    # Act
+    await drain(executor, 2)
+    incoming = (await executor.get_cell_status("b"))["channels"]["incoming"]
+    outgoing = (await executor.get_cell_status("a"))["channels"]["outgoing"]
+
+    # Assert
+    assert incoming["a"]["high_watermark"] == 2 and incoming["a"]["delivered"] == 2
+    assert incoming["a"]["max_wait_ms"] >= incoming["a"]["avg_wait_ms"] > 0
+    assert outgoing["b"]["policy"] == "drop_oldest"
+
+
+@pytest.mark.asyncio
+async def test_process_backend_runs_cell_in_worker_process():
+    """Test a cell declaring the process backend runs in its own worker process."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "worker", PLACEMENT_CELL_CODE, manifest={"execution": {"backend": "process"}})
+
+    # Act
+    result = await executor.execute_capability("worker", "where", {"n": 1000})
+    status = await executor.get_cell_status("worker")
+    await executor.release_cell("worker")
+
+    # Assert
+    assert result["pid"] == status["execution"]["pid"] != os.getpid()
+    assert result["total"] == sum(range(1000))
+    assert status["execution"]["backend"] == "process"
+    assert "worker" not in executor.cell_processes
+
+
+@pytest.mark.asyncio
+async def test_thread_backend_runs_cell_in_thread_pool():
+    """Test a cell declaring the thread backend runs off the event loop thread."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "worker", PLACEMENT_CELL_CODE, manifest={"execution": {"backend": "thread"}})
+
+    # Act
+    result = await executor.execute_capability("worker", "where")
+
+    # Assert
+    assert result["pid"] == os.getpid()
+    assert result["thread"] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_loop_backend_runs_cell_on_event_loop():
+    """Test a cell declaring the loop backend runs on the event loop thread."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "worker", PLACEMENT_CELL_CODE, manifest={"execution": {"backend": "loop"}})
+
+    # Act
+    result = await executor.execute_capability("worker", "where")
+
+    # Assert
+    assert result["thread"] == threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_cell_classes_load_once_per_source(tmp_path, monkeypatch):
+    """Test repeated instantiation reuses the class resolved for a module or code."""
+    # Arrange
+    write_cell_module(tmp_path, monkeypatch, "placement_cell_module", PLACEMENT_CELL_CODE)
+    executor = make_executor()
+    executor.max_concurrent_cells = 10
+
+    # Act
+    for index in range(3):
+        await executor.initialize_cell(SimpleNamespace(id=f"module-{index}", module_path="placement_cell_module"))
+        await executor.initialize_cell(SimpleNamespace(id=f"code-{index}", code=PLACEMENT_CELL_CODE))
+
+    # Assert
+    assert executor.class_cache.get_stats() == {"hits": 4, "misses": 2, "reloads": 0, "entries": 2}
+    assert type(executor.active_cells["module-0"]) is type(executor.active_cells["module-2"])
+    assert type(executor.active_cells["code-0"]) is type(executor.active_cells["code-2"])
+
+
+@pytest.mark.asyncio
+async def test_changed_cell_module_is_reloaded(tmp_path, monkeypatch):
+    """Test a cell module is imported again once its source changes."""
+    # Arrange
+    module_file = write_cell_module(tmp_path, monkeypatch, "changing_cell_module", PLACEMENT_CELL_CODE)
+    executor = make_executor()
+    await executor.initialize_cell(SimpleNamespace(id="module-0", module_path="changing_cell_module"))
+    module_file.write_text(PLACEMENT_CELL_CODE + "\nVERSION = 2\n")
+
+    # Act
+    await executor.initialize_cell(SimpleNamespace(id="module-changed", module_path="changing_cell_module"))
+
+    # Assert
+    assert executor.class_cache.get_stats()["reloads"] == 1
+    assert type(executor.active_cells["module-changed"]) is not type(executor.active_cells["module-0"])
+
+
+@pytest.mark.asyncio
+async def test_resource_limits_enforced_against_the_cell_using_them():
+    """Test memory and CPU are attributed per cell so only the hog is suspended."""
+    # Arrange
+    executor = make_executor(runtime={
+        'trace_cell_allocations': True,
+        'resource_monitoring_interval_ms': 10,
+        'allocation_scan_interval_ms': 0
+    })
+    for cell_id, code in (("hog", HOG_CELL_CODE), ("idle", PLACEMENT_CELL_CODE)):
+        await start_cell(executor, cell_id, code, resource_limits={'memory_mb': 5})
+
+    # Act
+    await executor.start()
+    await executor.execute_capability("hog", "hoard", {})
+    await executor.execute_capability("idle", "where", {})
+    await asyncio.sleep(0.1)
+    hog, idle = [await executor.get_cell_status(cell_id) for cell_id in ("hog", "idle")]
+    await executor.stop()
+
+    # Assert
+    assert hog["status"] == "suspended" and idle["status"] == "active"
+    assert hog["resources"]["memory_source"] == idle["resources"]["memory_source"] == "traced"
+    assert hog["resources"]["memory_mb"] > 5 > idle["resources"]["memory_mb"]
+    assert hog["resources"]["cpu_seconds"] > idle["resources"]["cpu_seconds"]
+
+
+def test_allocation_tracing_is_opt_in():
+    """Test in-process cells are only traced when trace_cell_allocations is set."""
+    # Arrange
+    settings = [
+        {},
+        {'max_memory_per_cell_mb': 64},
+        {'max_memory_per_cell_mb': 64, 'trace_cell_allocations': True}
+    ]
+
+    # Act
+    traced = [make_executor(runtime=runtime).accountant.trace_allocations for runtime in settings]
+
+    # Assert
+    assert traced == [False, False, True]
+
+
+def test_traced_memory_is_charged_to_the_innermost_cell_file():
+    """Test an allocation is charged to the cell source file closest to it on the stack."""
+    # Arrange
+    inner = compile("def allocate():\n    return [bytes(1024 * 1024) for _ in range(4)]\n", "<cell inner>", "exec")
+    outer = compile("def call(allocate):\n    return allocate()\n", "<cell outer>", "exec")
+    inner_namespace, outer_namespace = {}, {}
+    exec(inner, inner_namespace)
+    exec(outer, outer_namespace)
+    tracemalloc.start(4)
+    try:
+        data = outer_namespace["call"](inner_namespace["allocate"])
+
+        # Act
+        traced = ResourceAccountant._traced_bytes({"<cell inner>", "<cell outer>"})
+    finally:
+        tracemalloc.stop()
+
+    # Assert
+    assert len(data) == 4
+    assert traced["<cell inner>"] >= 4 * 1024 * 1024
+    assert traced.get("<cell outer>", 0) < 64 * 1024
+
+
+@pytest.mark.asyncio
+async def test_capability_timeout_adapts_to_observed_latency():
+    """Test a capability's timeout shrinks toward its latency once enough calls were seen."""
+    # Arrange
+    executor = make_executor(runtime={'execution_timeout_ms': 300, 'timeout_min_samples': 5, 'min_timeout_ms': 20})
+    await start_cell(executor, "worker", DEADLINE_CELL_CODE)
+    type_key = executor.cell_environments["worker"]["type_key"]
+
+    # Act
+    for _ in range(5):
+        await executor.execute_capability("worker", "quick")
+
+    # Assert
+    assert executor.timeouts.timeout_ms(type_key, "quick") == 20
+    assert executor.timeouts.timeout_ms(type_key, "runaway") == 300
+
+
+@pytest.mark.asyncio
+async def test_caller_deadline_stops_cooperative_callee():
+    """Test a cell-to-cell call times out at the caller's deadline, not the callee's timeout."""
+    # Arrange
+    executor = make_executor(runtime={'execution_timeout_ms': 300, 'cancellation_grace_ms': 20})
+    for cell_id in ("caller", "worker"):
+        await start_cell(executor, cell_id, DEADLINE_CELL_CODE)
+    started = time.monotonic()
+
+    # Act
+    with pytest.raises(Exception, match="timed out"):
+        await executor.call_cell_capability("caller", "worker", "cooperative", timeout=0.05)
+
+    # Assert
+    assert time.monotonic() - started < 0.2
+
+
+@pytest.mark.asyncio
+async def test_runaway_method_on_loop_backend_is_interrupted():
+    """Test a sync method ignoring its cancellation token is stopped after the grace period."""
+    # Arrange
+    executor = make_executor(runtime={
+        'execution_timeout_ms': 50,
+        'cancellation_grace_ms': 20,
+        'force_cancellation_interrupts': True
+    })
+    cell = await start_cell(executor, "worker", DEADLINE_CELL_CODE)
+
+    # Act
+    with pytest.raises(ExecutionCancelledError):
+        await executor.execute_capability("worker", "runaway")
+    await asyncio.sleep(0.1)
+
+    # Assert
+    assert cell.stopped
+
+
+@pytest.mark.asyncio
+async def test_runaway_method_on_thread_backend_is_interrupted():
+    """Test the cancellation token reaches methods a thread-backend cell runs in the pool."""
+    # Arrange
+    executor = make_executor(runtime={
+        'execution_timeout_ms': 50,
+        'cancellation_grace_ms': 20,
+        'force_cancellation_interrupts': True
+    })
+    cell = await start_cell(executor, "worker", DEADLINE_CELL_CODE, manifest={"execution": {"backend": "thread"}})
+
+    # Act
+    with pytest.raises(ExecutionCancelledError):
+        await executor.execute_capability("worker", "runaway")
+    await asyncio.sleep(0.1)
+
+    # Assert
+    assert cell.instance.stopped
+
+
+@pytest.mark.asyncio
+async def test_method_ignoring_cancellation_runs_on_without_forced_interrupts():
+    """Test a sync method past its deadline is left to finish unless forced interrupts are enabled."""
+    # Arrange
+    executor = make_executor(runtime={'execution_timeout_ms': 50, 'cancellation_grace_ms': 20})
+    cell = await start_cell(executor, "worker", DEADLINE_CELL_CODE, manifest={"execution": {"backend": "thread"}})
+
+    # Act
+    with pytest.raises(ExecutionCancelledError):
+        await executor.execute_capability("worker", "lingering")
+    await asyncio.sleep(0.3)
+
+    # Assert
+    assert cell.instance.finished
+
+
+@pytest.mark.asyncio
+async def test_runaway_method_on_process_backend_restarts_the_worker():
+    """Test a process cell's worker stuck in a cancelled call is replaced by a fresh one."""
+    # Arrange
+    executor = make_executor(runtime={'execution_timeout_ms': 200, 'cancellation_grace_ms': 20})
+    await start_cell(executor, "worker", DEADLINE_CELL_CODE, manifest={"execution": {"backend": "process"}})
+    stuck_pid = executor.cell_processes["worker"].pid
+
+    # Act
+    with pytest.raises(ExecutionCancelledError):
+        await executor.execute_capability("worker", "runaway")
+    await asyncio.sleep(0.05)
+    result = await executor.execute_capability("worker", "quick")
+    status = await executor.get_cell_status("worker")
+    await executor.release_cell("worker")
+
+    # Assert
+    assert result == {'status': 'success'}
+    assert status["execution"]["pid"] not in (None, stuck_pid)
+
+
+@pytest.mark.asyncio
+async def test_restarted_process_worker_initializes_the_cell_again():
+    """Test a cell in a replaced worker is initialized again before serving calls."""
+    # Arrange
+    executor = make_executor(runtime={'execution_timeout_ms': 200, 'cancellation_grace_ms': 20})
+    await start_cell(executor, "worker", DEADLINE_CELL_CODE, manifest={"execution": {"backend": "process"}})
+
+    # Act
+    with pytest.raises(ExecutionCancelledError):
+        await executor.execute_capability("worker", "runaway")
+    await asyncio.sleep(0.05)
+    result = await executor.execute_capability("worker", "identify")
+    status = await executor.get_cell_status("worker")
+    await executor.release_cell("worker")
+
+    # Assert
+    assert result == {'status': 'success', 'cell_id': 'worker'}
+    assert status["status"] == "active"
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_execution():
+    """Test concurrent calls with the same arguments join a single execution."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "lookup", LOOKUP_CELL_CODE, manifest=LOOKUP_MANIFEST)
+
+    # Act
+    results = await asyncio.gather(*[
+        executor.execute_capability("lookup", "lookup", {'path': '/a'}) for _ in range(5)
+    ])
+    status = await executor.get_cell_status("lookup")
+
+    # Assert
+    assert cell.lookups == 1
+    assert all(result['path'] == '/a' for result in results)
+    assert status['coalescing'] == {'executed': 1, 'joined': 4, 'cached': 0}
+    assert status['capabilities_executed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_result_is_reused_as_an_independent_copy():
+    """Test a repeated call is served from the cache, unaffected by changes to earlier results."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "lookup", LOOKUP_CELL_CODE, manifest=LOOKUP_MANIFEST)
+    first = await executor.execute_capability("lookup", "lookup", {'path': '/a'})
+    first['path'] = 'changed'
+
+    # Act
+    cached = await executor.execute_capability("lookup", "lookup", {'path': '/a'})
+
+    # Assert
+    assert cell.lookups == 1
+    assert cached['path'] == '/a'
+    assert (await executor.get_cell_status("lookup"))['coalescing']['cached'] == 1
+
+
+@pytest.mark.asyncio
+async def test_calls_with_different_arguments_execute_separately():
+    """Test calls are only coalesced with calls passing the same arguments."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "lookup", LOOKUP_CELL_CODE, manifest=LOOKUP_MANIFEST)
+
+    # Act
+    results = await asyncio.gather(
+        executor.execute_capability("lookup", "lookup", {'path': '/a'}),
+        executor.execute_capability("lookup", "lookup", {'path': '/b'})
+    )
+
+    # Assert
+    assert cell.lookups == 2
+    assert [result['path'] for result in results] == ['/a', '/b']
+
+
+@pytest.mark.asyncio
+async def test_uncoalesced_call_invalidates_cached_results():
+    """Test a call to another capability drops results it may have changed."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "lookup", LOOKUP_CELL_CODE, manifest=LOOKUP_MANIFEST)
+    cached = await executor.execute_capability("lookup", "lookup", {'path': '/a'})
+
+    # Act
+    await executor.execute_capability("lookup", "update")
+    refreshed = await executor.execute_capability("lookup", "lookup", {'path': '/a'})
+
+    # Assert
+    assert cell.lookups == 2
+    assert cached['version'] == 0 and refreshed['version'] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_of_plain_method_runs_as_one_job():
+    """Test a capability without a batch method handles a whole batch in one job."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "batch", BATCH_CELL_CODE)
+
+    # Act
+    results = await executor.execute_capability_batch("batch", "square", [{'x': x} for x in range(1, 4)])
+    status = await executor.get_cell_status("batch")
+
+    # Assert
+    assert [result['value'] for result in results] == [1, 4, 9]
+    assert len(cell.threads) == 1
+    assert status['capabilities_executed'] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failed_calls_in_place():
+    """Test a failing call of a batch yields an error result without failing the others."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "batch", BATCH_CELL_CODE)
+
+    # Act
+    results = await executor.execute_capability_batch("batch", "square", [{'x': 1}, {'x': -1}, {'x': 3}])
+
+    # Assert
+    assert [result.get('value') for result in results] == [1, None, 9]
+    assert results[1] == {'status': 'error', 'error': 'negative'}
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_native_batch_method():
+    """Test a capability with a batch method receives the whole batch at once."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "batch", BATCH_CELL_CODE)
+
+    # Act
+    results = await executor.execute_capability_batch("batch", "double", [{'x': x} for x in range(50)])
+
+    # Assert
+    assert [result['value'] for result in results] == [2 * x for x in range(50)]
+    assert cell.batches == [50]
+
+
+@pytest.mark.asyncio
+async def test_streamed_batch_stops_when_consumer_closes_it():
+    """Test closing a batch stream early skips the calls not yet made."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "batch", BATCH_CELL_CODE)
+    streamed = []
+
+    # Act
+    stream = executor.stream_capability_batch("batch", "square", [{'x': x} for x in range(100)])
+    async for result in stream:
+        streamed.append(result['value'])
+        if len(streamed) == 2:
+            break
+    await stream.aclose()
+    status = await executor.get_cell_status("batch")
+
+    # Assert
+    assert streamed == [0, 1]
+    assert status['capabilities_executed'] == 2
+
+
+@pytest.mark.asyncio
+async def test_suspend_returns_saved_state_and_compact_snapshot(tmp_path):
+    """Test suspension keeps saved_state a dict and adds a compressed, spilled snapshot."""
+    # Arrange
+    executor = make_executor(runtime={
+        'snapshot_spill_threshold_bytes': 64 * 1024,
+        'snapshot_spill_dir': str(tmp_path)
+    })
+    cell = await start_cell(executor, "player", stateful_cell_code())
+
+    # Act
+    result = await executor.suspend_cell("player")
+    stats = result['snapshot'].get_stats()
+
+    # Assert
+    assert isinstance(result['saved_state'], dict) and result['saved_state']['cache'] is cell.cache
+    assert stats['spilled_bytes'] >= 256 * 1024
+    assert stats['memory_bytes'] < stats['state_bytes'] - 256 * 1024
+    assert executor.cell_resources["player"]['status'] == 'suspended'
+    await executor.release_cell("player")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_suspended_cell_is_dropped_and_rebuilt_from_its_snapshot(tmp_path):
+    """Test a suspended cell's instance is dropped and rebuilt with its state on resume."""
+    # Arrange
+    executor = make_executor(runtime={
+        'snapshot_spill_threshold_bytes': 64 * 1024,
+        'snapshot_spill_dir': str(tmp_path)
+    })
+    cell = await start_cell(executor, "player", stateful_cell_code())
+    await executor.execute_capability("player", "seek", {'position': 42})
+
+    # Act
+    await executor.suspend_cell("player")
+    dropped = executor.active_cells["player"]
+    await executor.resume_cell("player")
+    rebuilt = executor.active_cells["player"]
+    seeked = await executor.execute_capability("player", "seek", {'position': 7})
+
+    # Assert
+    assert dropped is None and rebuilt is not cell
+    assert rebuilt.restored['position'] == 42 and rebuilt.restored['cache'] == cell.cache
+    assert rebuilt.restored['frames'].to_bytes() == bytes(256 * 1024)
+    assert seeked['status'] == 'success' and rebuilt.position == 7
+    assert (await executor.get_cell_status("player"))['snapshot'] is None
+    assert list(tmp_path.iterdir()) == []
+    await executor.release_cell("player")
+
+
+@pytest.mark.asyncio
+async def test_cell_resumes_from_returned_snapshot():
+    """Test resume_cell accepts the snapshot a suspension returned."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "player", stateful_cell_code(1024))
+    await executor.execute_capability("player", "seek", {'position': 3})
+    snapshot = (await executor.suspend_cell("player"))['snapshot']
+    copy = StateSnapshot.from_bytes(snapshot.to_bytes())
+
+    # Act
+    await executor.resume_cell("player", copy)
+
+    # Assert
+    assert executor.active_cells["player"].restored['position'] == 3
+    await executor.release_cell("player")
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_state_suspends_cell_without_snapshot():
+    """Test a cell whose state cannot be pickled is suspended live with its plain state."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "player", stateful_cell_code(1024))
+    cell.cache = {'lock': threading.Lock()}
+
+    # Act
+    result = await executor.suspend_cell("player")
+    status = executor.cell_resources["player"]['status']
+    await executor.resume_cell("player")
+
+    # Assert
+    assert status == 'suspended' and 'snapshot' not in result
+    assert result['saved_state']['cache'] is cell.cache
+    assert executor.active_cells["player"] is cell and cell.restored is None
+    await executor.release_cell("player")
+
+
+@pytest.mark.asyncio
+async def test_cell_resuming_from_parameters_is_rebuilt_with_its_saved_state():
+    """Test a cell taking resume parameters, like the shipped cells, gets its state back after being dropped."""
+    # Arrange
+    executor = make_executor()
+    cell = await start_cell(executor, "editor", DOCUMENTS_CELL_CODE)
+    await executor.execute_capability("editor", "write", {'name': 'notes', 'text': 'draft'})
+
+    # Act
+    await executor.suspend_cell("editor")
+    dropped = executor.active_cells["editor"]
+    await executor.resume_cell("editor")
+    read = await executor.execute_capability("editor", "read", {'name': 'notes'})
+
+    # Assert
+    assert dropped is None and executor.active_cells["editor"] is not cell
+    assert read == {'status': 'success', 'text': 'draft'}
+    await executor.release_cell("editor")
+
+
+@pytest.mark.asyncio
+async def test_process_cell_resuming_from_parameters_is_rebuilt_with_its_saved_state():
+    """Test a process cell taking resume parameters gets its state back in a new worker."""
+    # Arrange
+    executor = make_executor()
+    await start_cell(executor, "editor", DOCUMENTS_CELL_CODE, manifest={"execution": {"backend": "process"}})
+    await executor.execute_capability("editor", "write", {'name': 'notes', 'text': 'draft'})
+
+    # Act
+    await executor.suspend_cell("editor")
+    dropped = executor.active_cells["editor"]
+    await executor.resume_cell("editor")
+    read = await executor.execute_capability("editor", "read", {'name': 'notes'})
+
+    # Assert
+    assert dropped is None
+    assert read == {'status': 'success', 'text': 'draft'}
+    await executor.release_cell("editor")
+
+
+@pytest.mark.asyncio
+async def test_cell_whose_resume_takes_no_state_is_suspended_live():
+    """Test a cell whose resume method cannot take saved state keeps its instance."""
+    # Arrange
+    code = DOCUMENTS_CELL_CODE.replace(
+        "    async def resume(self, parameters):\n"
+        "        if 'saved_state' in parameters:\n"
+        "            self.documents = parameters['saved_state']['documents']\n",
+        "    async def resume(self):\n"
+    )
+    executor = make_executor()
+    cell = await start_cell(executor, "editor", code)
+    await executor.execute_capability("editor", "write", {'name': 'notes', 'text': 'draft'})
+
+    # Act
+    result = await executor.suspend_cell("editor")
+    await executor.resume_cell("editor")
+    read = await executor.execute_capability("editor", "read", {'name': 'notes'})
+
+    # Assert
+    assert 'snapshot' not in result
+    assert executor.active_cells["editor"] is cell
+    assert read == {'status': 'success', 'text': 'draft'}
+    await executor.release_cell("editor")
+
+def test_snapshot_shares_entries_unchanged_since_previous_snapshot():
+    """Test a cell's next snapshot reuses the entries that did not change."""
+    # Arrange
+    store = SnapshotStore()
+    frames = SharedPayload(bytearray(1024))
+    first = store.save("player", {'frames': frames, 'position': 0})
+
+    # Act
+    second = store.save("player", {'frames': frames, 'position': 42})
+
+    # Assert
+    assert second.reused == 1 and second.segments['frames'] is first.segments['frames']
+    assert second.restore()['position'] == 42
+
+
+@pytest.mark.asyncio
+async def test_idle_cell_is_suspended_and_resumed_on_its_next_call():
+    """Test idle suspension and the transparent resume of the next capability call."""
+    # Arrange
+    executor = make_executor(runtime={'idle_suspend_ms': 0, 'idle_suspend_memory_percent': 0})
+    await start_cell(executor, "player", stateful_cell_code(1024))
+    await executor.execute_capability("player", "seek", {'position': 5})
+
+    # Act
+    await executor._suspend_idle_cells()
+    idle_status = executor.cell_resources["player"]['status']
+    await executor.execute_capability("player", "seek", {'position': 7})
+
+    # Assert
+    cell = executor.active_cells["player"]
+    assert idle_status == 'suspended'
+    assert cell.restored['position'] == 5 and cell.position == 7
+    await executor.release_cell("player")
@@ -0,0 +1,240 @@
+"""
+Unit tests for the IntentInterpreter component.
+
+These tests verify that the IntentInterpreter normalizes requests and maps
+them to the capabilities and connections a solution needs.
+"""
+
+import os
+import copy
+import json
+import asyncio
+import importlib
+import pytest
+
+from qcc.assembler.intent import (
+    IntentInterpreter, IntentMatcher, AbbreviationExpander, ConnectionIndex, PatternRegistry
+)
+from qcc.assembler.intent import patterns
+from qcc.assembler.intent.patterns import intentPatterns, connectionRules
+
+
+def test_intent_matcher_agrees_with_full_scan():
+    """Test the keyword-gated matcher finds exactly the patterns a full scan finds."""
+    # Arrange
+    matcher = IntentMatcher(intentPatterns)
+    requests = [
+        "create a document and show the user interface",
+        "play a video then check the weather forecast",
+        "how do i navigate to website",
+        "figure out average and visualize data",
+        "nothing relevant here"
+    ]
+
+    # Act & Assert
+    for request in requests:
+        expected = [
+            name for name, pattern in matcher.patterns.items()
+            if pattern.search(request)
+        ]
+        assert matcher.match(request) == expected
+
+
+def test_abbreviation_expansion_is_single_pass():
+    """Test abbreviations are expanded only as whole words."""
+    # Arrange
+    expander = AbbreviationExpander({"doc": "document", "ui": "user interface"})
+
+    # Act
+    result = expander.expand("open doc in the ui, not docs or guide")
+
+    # Assert
+    assert result == "open document in the user interface, not docs or guide"
+
+
+@pytest.mark.asyncio
+async def test_analyze_uses_compiled_matcher():
+    """Test intent analysis on a normalized request."""
+    # Arrange
+    interpreter = IntentInterpreter()
+
+    # Act
+    analysis = await interpreter.analyze("  Create a DOC   and show the UI ")
+
+    # Assert
+    assert analysis["normalized_request"] == "create a document and show the user interface"
+    assert list(analysis["required_capabilities"]) == ["text_generation", "ui_rendering", "file_system"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_memoizes_frozen_results():
+    """Test repeated analyses are served read-only from the LRU cache."""
+    # Arrange
+    interpreter = IntentInterpreter(cache_size=2)
+    mobile = {"device_info": {"platform": "mobile", "memory_gb": 1}}
+
+    # Act
+    first = await interpreter.analyze("show the weather", mobile)
+    second = await interpreter.analyze("Show  the WEATHER", mobile)
+    desktop = await interpreter.analyze("show the weather", {"device_info": {"platform": "desktop"}})
+    await interpreter.analyze("play a video", mobile)
+    evicted = await interpreter.analyze("show the weather", mobile)
+
+    # Assert
+    assert second["capability_details"] is first["capability_details"]
+    assert second["original_request"] == "Show  the WEATHER"
+    assert desktop["capability_details"] != first["capability_details"]
+    assert evicted is not first
+    with pytest.raises(TypeError):
+        first["required_capabilities"] = []
+    with pytest.raises(TypeError):
+        first["suggested_connections"]["ui_rendering"] = []
+    assert isinstance(copy.deepcopy(first)["required_capabilities"], list)
+
+    stats = interpreter.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_matches_single_analysis():
+    """Test batch analysis agrees with analyze() and computes duplicates once."""
+    # Arrange
+    interpreter = IntentInterpreter()
+    reference = IntentInterpreter(cache_size=0)
+    requests = [
+        "create a doc and show the ui",
+        "Create a DOC and show the UI",
+        "play a video then check the weather",
+        "nothing relevant here"
+    ]
+    contexts = [None, None, {"device_info": {"platform": "mobile"}}, None]
+
+    # Act
+    results = await interpreter.analyze_batch(requests, contexts)
+    approximate = await interpreter.analyze_batch(requests, contexts, approximate=True)
+
+    # Assert
+    for request, context, result in zip(requests, contexts, results):
+        expected = await reference.analyze(request, context)
+        assert result["original_request"] == request
+        assert result["capability_details"] == expected["capability_details"]
+        assert result["suggested_connections"] == expected["suggested_connections"]
+    assert results[1]["capability_details"] is results[0]["capability_details"]
+    assert [result["required_capabilities"] for result in approximate] == [
+        result["required_capabilities"] for result in results
+    ]
+    assert interpreter.get_cache_stats()["misses"] == 3
+    with pytest.raises(ValueError):
+        await interpreter.analyze_batch(requests, contexts[:1])
+
+
+def test_connection_index_intersects_rules():
+    """Test connection suggestions come from the adjacency index in request order."""
+    # Arrange
+    index = ConnectionIndex(connectionRules, cache_size=1)
+    capabilities = ["file_system", "ui_rendering", "text_generation", "weather"]
+
+    # Act
+    first = index.suggest(capabilities)
+    second = index.suggest(capabilities)
+    second["ui_rendering"].append("weather")
+
+    # Assert
+    assert first == {
+        "file_system": [],
+        "ui_rendering": ["file_system", "text_generation"],
+        "text_generation": ["file_system"],
+        "weather": []
+    }
+    assert index.suggest(capabilities) == first
+
+
+@pytest.mark.asyncio
+async def test_reload_patterns_rebuilds_connection_index(monkeypatch):
+    """Test reloading the pattern tables recompiles connections and drops cached analyses."""
+    # Arrange
+    interpreter = IntentInterpreter()
+    await interpreter.analyze("show the weather")
+    monkeypatch.setattr(patterns, "connectionRules", {"ui_rendering": ["weather"]})
+    monkeypatch.setattr(importlib, "reload", lambda module: module)
+
+    # Act
+    interpreter.reload_patterns()
+    analysis = await interpreter.analyze("show the weather")
+
+    # Assert
+    assert list(analysis["suggested_connections"]["ui_rendering"]) == ["weather"]
+    assert interpreter.get_cache_stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pattern_registry_hot_swaps_versioned_snapshots(tmp_path):
+    """Test pattern files reload into a new snapshot that tags analyses."""
+    # Arrange
+    pattern_file = tmp_path / "patterns.json"
+    pattern_file.write_text(json.dumps({"intent_patterns": {"weather": r"\b(weather)\b"}}))
+    registry = PatternRegistry(str(tmp_path))
+    interpreter = IntentInterpreter(registry=registry)
+    before = await interpreter.analyze("show the forecast")
+
+    # Act
+    pattern_file.write_text(json.dumps({"intent_patterns": {"weather": r"\b(weather|forecast)\b"}}))
+    changed = registry.has_changed()
+    snapshot = await registry.reload_async()
+    after = await interpreter.analyze("show the forecast")
+
+    # Assert
+    assert changed
+    assert before["pattern_version"] == 1
+    assert after["pattern_version"] == snapshot.version == 2
+    assert "weather" not in before["required_capabilities"]
+    assert "weather" in after["required_capabilities"]
+    assert not registry.has_changed()
+    assert interpreter.get_cache_stats()["hits"] == 0
+
+
+def test_pattern_registry_survives_stat_errors(tmp_path, monkeypatch):
+    """Test a pattern file failing to stat counts as a change instead of raising."""
+    # Arrange
+    (tmp_path / "patterns.json").write_text(json.dumps({"intent_patterns": {}}))
+    registry = PatternRegistry(str(tmp_path))
+    stat = os.stat
+
+    def failing_stat(path, *args, **kwargs):
+        if str(path).endswith(".json"):
+            raise PermissionError(13, "Permission denied", path)
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", failing_stat)
+
+    # Act
+    changed = registry.has_changed()
+
+    # Assert
+    assert changed
+
+
+@pytest.mark.asyncio
+async def test_pattern_registry_watcher_keeps_running_after_errors(tmp_path, monkeypatch):
+    """Test the watcher logs a failed change check and keeps polling."""
+    # Arrange
+    registry = PatternRegistry(str(tmp_path))
+    checks = []
+
+    def failing_has_changed():
+        checks.append(True)
+        raise OSError("Pattern directory unavailable")
+
+    monkeypatch.setattr(registry, "has_changed", failing_has_changed)
+
+    # Act
+    registry.start_watching(interval_seconds=0.01)
+    await asyncio.sleep(0.1)
+    running = not registry._watch_task.done()
+    await registry.stop_watching()
+
+    # Assert
+    assert running
+    assert len(checks) > 1